@@ -89,7 +89,7 @@ function get_projects_spent_hours(account) {
             var params = [];
             var query =
                 "SELECT p.name AS entity_name, SUM(a.unit_amount) AS total, s.name AS stage_name " +
-                "FROM account_analytic_line_app a " +
+                "FROM " + DBCommon.timesheetHoursSource() + " a " +
                 "LEFT JOIN project_project_app p ON p.odoo_record_id = a.project_id AND p.account_id = a.account_id " +
                 "LEFT JOIN project_project_stage_app s ON s.odoo_record_id = p.stage AND s.account_id = p.account_id ";
 
@@ -138,7 +138,7 @@ function get_tasks_spent_hours(account) {
             var params = [];
             var query =
                 "SELECT t.name AS entity_name, SUM(a.unit_amount) AS total " +
-                "FROM account_analytic_line_app a " +
+                "FROM " + DBCommon.timesheetHoursSource() + " a " +
                 "LEFT JOIN project_task_app t ON t.id = a.task_id ";
 
             if (account !== -1 && account !== undefined && account !== null) {
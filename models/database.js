@@ -230,3 +230,27 @@ function rowToObject(row) {
 
     return obj;
 }
+
+/**
+ * SQL source of timesheet hours for totals over the whole history.
+ *
+ * Local lines only go back to the timesheet sync window; the hours before it
+ * are summed per week on the server (account_analytic_line_summary, see
+ * src/timesheet_summary.py). This unions the local lines from the window
+ * start on (plus lines not on the server yet) with those summary rows, so
+ * every hour is counted once. Without a stored window start all local lines
+ * are used. Deleted lines are left out.
+ *
+ * @returns {string} - Parenthesised subquery for a FROM clause, with the
+ *     columns account_id, project_id, task_id, user_id, record_date, unit_amount
+ */
+function timesheetHoursSource() {
+    return "(SELECT l.account_id, l.project_id, l.task_id, l.user_id, l.record_date, l.unit_amount " +
+           "FROM account_analytic_line_app l " +
+           "LEFT JOIN account_analytic_line_summary_state w ON w.account_id = l.account_id AND w.granularity = 'week' " +
+           "WHERE (l.status IS NULL OR l.status != 'deleted') " +
+           "AND (w.covered_before IS NULL OR l.record_date >= w.covered_before OR COALESCE(l.odoo_record_id, 0) = 0) " +
+           "UNION ALL " +
+           "SELECT account_id, NULLIF(project_id, 0), NULLIF(task_id, 0), NULLIF(user_id, 0), period_start, unit_amount " +
+           "FROM account_analytic_line_summary WHERE granularity = 'week')";
+}
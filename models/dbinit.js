@@ -219,6 +219,37 @@ function initializeDatabase() {
                                   'record_date datetime','user_id INTEGER' ,'status TEXT DEFAULT ""', 'timer_type TEXT DEFAULT "manual"', 'has_draft INTEGER DEFAULT 0', 'odoo_record_id INTEGER']
                                  );
 
+    // Hours before the timesheet sync window, summed on the server per week
+    // (written by src/timesheet_summary.py, same DDL as src/schema_manager.py)
+    DBCommon.createOrUpdateTable("account_analytic_line_summary",
+                                 'CREATE TABLE IF NOT EXISTS account_analytic_line_summary (\
+            account_id INTEGER NOT NULL,\
+            granularity TEXT NOT NULL,\
+            period_start TEXT NOT NULL,\
+            project_id INTEGER NOT NULL DEFAULT 0,\
+            task_id INTEGER NOT NULL DEFAULT 0,\
+            user_id INTEGER NOT NULL DEFAULT 0,\
+            unit_amount REAL NOT NULL DEFAULT 0,\
+            line_count INTEGER NOT NULL DEFAULT 0,\
+            synced_at TEXT,\
+            UNIQUE (account_id, granularity, period_start, project_id, task_id, user_id)\
+        )',
+                                 ['account_id INTEGER', 'granularity TEXT', 'period_start TEXT', 'project_id INTEGER DEFAULT 0',
+                                  'task_id INTEGER DEFAULT 0', 'user_id INTEGER DEFAULT 0', 'unit_amount REAL DEFAULT 0',
+                                  'line_count INTEGER DEFAULT 0', 'synced_at TEXT']
+                                 );
+
+    DBCommon.createOrUpdateTable("account_analytic_line_summary_state",
+                                 'CREATE TABLE IF NOT EXISTS account_analytic_line_summary_state (\
+            account_id INTEGER NOT NULL,\
+            granularity TEXT NOT NULL,\
+            covered_before TEXT,\
+            synced_at TEXT,\
+            PRIMARY KEY (account_id, granularity)\
+        )',
+                                 ['account_id INTEGER', 'granularity TEXT', 'covered_before TEXT', 'synced_at TEXT']
+                                 );
+
     DBCommon.createOrUpdateTable("mail_activity_type_app",
                                  'CREATE TABLE IF NOT EXISTS mail_activity_type_app (\
             id INTEGER PRIMARY KEY AUTOINCREMENT,\
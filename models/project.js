@@ -521,7 +521,7 @@ function getAttachmentsForProject(odooRecordId, accountId) {
 
         db.transaction(function (tx) {
             var query = `
-                SELECT name, mimetype, account_id, odoo_record_id
+                SELECT name, mimetype, account_id, odoo_record_id, checksum
                 FROM ir_attachment_app
                 WHERE res_model = 'project.project'
                   AND res_id = ?
@@ -540,6 +540,7 @@ function getAttachmentsForProject(odooRecordId, accountId) {
                     mimetype: row.mimetype,
                     account_id: row.account_id,
                     odoo_record_id: row.odoo_record_id,
+                    checksum: row.checksum || "",
                     url: "",        // placeholder for file path if added later
                     size: 0,        // unknown at this stage
                     created: ""     // optional, to be filled if available later
@@ -1214,7 +1215,7 @@ function getProjectSpentHoursList(is_work_state, accountId) {
             result = tx.executeSql(
                 "SELECT aal.project_id, aal.account_id, COALESCE(u.name, 'Unknown') AS account_name, " +
                 "COALESCE(p.name, 'Unknown') AS project_name, SUM(aal.unit_amount) AS total_spent " +
-                "FROM account_analytic_line_app aal " +
+                "FROM " + DBCommon.timesheetHoursSource() + " aal " +
                 "LEFT JOIN users u ON aal.account_id = u.id " +
                 "LEFT JOIN project_project_app p ON p.odoo_record_id = aal.project_id AND p.account_id = aal.account_id " +
                 "WHERE " + (is_work_state ? "aal.account_id != 0 " : "aal.account_id = 0 ") +
@@ -1248,7 +1249,7 @@ function getProjectSpentHoursList(is_work_state, accountId) {
 
             result = tx.executeSql(
                 "SELECT aal.project_id, COALESCE(p.name, 'Unknown') AS project_name, SUM(aal.unit_amount) AS total_spent " +
-                "FROM account_analytic_line_app aal " +
+                "FROM " + DBCommon.timesheetHoursSource() + " aal " +
                 "LEFT JOIN project_project_app p ON p.odoo_record_id = aal.project_id AND p.account_id = aal.account_id " +
                 "WHERE aal.account_id = ? " +
                 "GROUP BY aal.project_id, p.name " +
@@ -1308,8 +1309,7 @@ function getDashboardProjectTaskSummary(accountId) {
                 "AND (t.status IS NULL OR t.status != 'deleted') " +
                 "LEFT JOIN ( " +
                 "SELECT account_id, task_id, SUM(unit_amount) AS total_hours " +
-                "FROM account_analytic_line_app " +
-                "WHERE status IS NULL OR status != 'deleted' " +
+                "FROM " + DBCommon.timesheetHoursSource() + " " +
                 "GROUP BY account_id, task_id " +
                 ") ts ON ts.account_id = t.account_id AND ts.task_id = t.odoo_record_id " +
                 accountWhere +
@@ -282,7 +282,7 @@ function getAttachmentsForTask(odooRecordId, accountId) {
 
         db.transaction(function (tx) {
             var query = `
-                SELECT name, mimetype, account_id, odoo_record_id
+                SELECT name, mimetype, account_id, odoo_record_id, checksum
                 FROM ir_attachment_app
                 WHERE res_model = 'project.task'
                   AND res_id = ?
@@ -301,6 +301,7 @@ function getAttachmentsForTask(odooRecordId, accountId) {
                     mimetype: row.mimetype,
                     account_id: row.account_id,
                     odoo_record_id: row.odoo_record_id,
+                    checksum: row.checksum || "",
                     url: "",    // no file path stored locally
                     size: 0,    // placeholder
                     created: "" // optional field
@@ -839,8 +840,8 @@ function getTasksForAccount(accountId) {
                 // Calculate total hours spent from timesheet entries
                 var timeQuery = `
                     SELECT SUM(unit_amount) as total_hours 
-                    FROM account_analytic_line_app 
-                    WHERE task_id = ? AND account_id = ? AND (status IS NULL OR status != 'deleted')
+                    FROM ${DBCommon.timesheetHoursSource()}
+                    WHERE task_id = ? AND account_id = ?
                 `;
                 var timeResult = tx.executeSql(timeQuery, [task.odoo_record_id, accountId]);
                 if (timeResult.rows.length > 0 && timeResult.rows.item(0).total_hours !== null) {
@@ -1133,7 +1134,7 @@ function getAllTasksForAccount(accountId) {
                 // --- Calculate total spent hours ---
                 var timeQuery = `
                     SELECT SUM(unit_amount) AS total_hours
-                    FROM account_analytic_line_app
+                    FROM ${DBCommon.timesheetHoursSource()}
                     WHERE task_id = ? AND account_id = ?
                 `;
                 var timeResult = tx.executeSql(timeQuery, [task.odoo_record_id, accountId]);
@@ -1245,7 +1246,7 @@ function getAllTasksForAccountPaginated(accountId, limit, offset, dateFilter) {
                 task.color_pallet = inheritedColor;
 
                 // Calculate total spent hours
-                var timeQuery = "SELECT SUM(unit_amount) AS total_hours FROM account_analytic_line_app WHERE task_id = ? AND account_id = ?";
+                var timeQuery = "SELECT SUM(unit_amount) AS total_hours FROM " + DBCommon.timesheetHoursSource() + " WHERE task_id = ? AND account_id = ?";
                 var timeResult = tx.executeSql(timeQuery, [task.odoo_record_id, accountId]);
                 task.spent_hours = (timeResult.rows.length > 0 && timeResult.rows.item(0).total_hours !== null)
                     ? timeResult.rows.item(0).total_hours : 0;
@@ -1348,7 +1349,7 @@ function getAllTasksPaginated(limit, offset, dateFilter) {
                 task.color_pallet = inheritedColor;
 
                 // Step 3: Calculate total hours spent
-                var timeQuery = "SELECT SUM(unit_amount) as total_hours FROM account_analytic_line_app WHERE task_id = ? AND account_id = ?";
+                var timeQuery = "SELECT SUM(unit_amount) as total_hours FROM " + DBCommon.timesheetHoursSource() + " WHERE task_id = ? AND account_id = ?";
                 var timeResult = tx.executeSql(timeQuery, [task.odoo_record_id, task.account_id]);
                 if (timeResult.rows.length > 0 && timeResult.rows.item(0).total_hours !== null) {
                     task.spent_hours = timeResult.rows.item(0).total_hours;
@@ -1470,7 +1471,7 @@ function getTasksByParentIdPaginated(parentId, accountId, limit, offset, dateFil
                 task.color_pallet = inheritedColor;
 
                 // Total hours
-                var timeQuery = "SELECT SUM(unit_amount) as total_hours FROM account_analytic_line_app WHERE task_id = ? AND account_id = ?";
+                var timeQuery = "SELECT SUM(unit_amount) as total_hours FROM " + DBCommon.timesheetHoursSource() + " WHERE task_id = ? AND account_id = ?";
                 var timeResult = tx.executeSql(timeQuery, [task.odoo_record_id, task.account_id]);
                 if (timeResult.rows.length > 0 && timeResult.rows.item(0).total_hours !== null) {
                     task.spent_hours = timeResult.rows.item(0).total_hours;
@@ -1525,7 +1526,7 @@ function getAllTasks() {
                 task.color_pallet = inheritedColor;
 
                 // Step 3: Calculate total hours spent from timesheet entries
-                var timeQuery = "SELECT SUM(unit_amount) as total_hours FROM account_analytic_line_app WHERE task_id = ? AND account_id = ?";
+                var timeQuery = "SELECT SUM(unit_amount) as total_hours FROM " + DBCommon.timesheetHoursSource() + " WHERE task_id = ? AND account_id = ?";
                 var timeResult = tx.executeSql(timeQuery, [task.odoo_record_id, task.account_id]);  // or task.task_account_id
                 if (timeResult.rows.length > 0 && timeResult.rows.item(0).total_hours !== null) {
                     task.spent_hours = timeResult.rows.item(0).total_hours;
@@ -1817,7 +1818,7 @@ function getFilteredTasksPaginated(filterType, searchQuery, accountId, limit, of
                 task.color_pallet = inheritedColor;
 
                 // Calculate spent hours
-                var timeQuery = "SELECT SUM(unit_amount) as total_hours FROM account_analytic_line_app WHERE task_id = ? AND account_id = ?";
+                var timeQuery = "SELECT SUM(unit_amount) as total_hours FROM " + DBCommon.timesheetHoursSource() + " WHERE task_id = ? AND account_id = ?";
                 var timeResult = tx.executeSql(timeQuery, [task.odoo_record_id, task.account_id]);
                 task.spent_hours = (timeResult.rows.length > 0 && timeResult.rows.item(0).total_hours !== null)
                     ? timeResult.rows.item(0).total_hours : 0;
@@ -2236,7 +2237,7 @@ function getTasksByAssigneesPaginated(assigneeIds, accountId, filterType, search
                     }
                     task.color_pallet = inheritedColor;
 
-                    var timeQuery = "SELECT COALESCE(SUM(unit_amount), 0) as total_hours FROM account_analytic_line_app WHERE task_id = ? AND account_id = ? AND (status != 'deleted' OR status IS NULL)";
+                    var timeQuery = "SELECT COALESCE(SUM(unit_amount), 0) as total_hours FROM " + DBCommon.timesheetHoursSource() + " WHERE task_id = ? AND account_id = ?";
                     var timeResult = tx.executeSql(timeQuery, [task.odoo_record_id, task.account_id]);
                     task.spent_hours = (timeResult.rows.length > 0 && timeResult.rows.item(0).total_hours !== null)
                         ? timeResult.rows.item(0).total_hours : 0;
@@ -2413,7 +2414,7 @@ function getTasksByAssigneesPaginated(assigneeIds, accountId, filterType, search
                     }
                     task.color_pallet = inheritedColor;
 
-                    var timeQuery = "SELECT COALESCE(SUM(unit_amount), 0) as total_hours FROM account_analytic_line_app WHERE task_id = ? AND account_id = ? AND (status != 'deleted' OR status IS NULL)";
+                    var timeQuery = "SELECT COALESCE(SUM(unit_amount), 0) as total_hours FROM " + DBCommon.timesheetHoursSource() + " WHERE task_id = ? AND account_id = ?";
                     var timeResult = tx.executeSql(timeQuery, [task.odoo_record_id, task.account_id]);
                     task.spent_hours = (timeResult.rows.length > 0 && timeResult.rows.item(0).total_hours !== null)
                         ? timeResult.rows.item(0).total_hours : 0;
@@ -2953,8 +2954,8 @@ function getTasksForProject(projectOdooRecordId, accountId) {
                 // Calculate spent hours for this task
                 var spentHoursQuery = `
                     SELECT COALESCE(SUM(unit_amount), 0) as spent_hours 
-                    FROM account_analytic_line_app 
-                    WHERE task_id = ? AND account_id = ? AND (status != 'deleted' OR status IS NULL)
+                    FROM ${DBCommon.timesheetHoursSource()}
+                    WHERE task_id = ? AND account_id = ?
                 `;
                 var spentResult = tx.executeSql(spentHoursQuery, [row.odoo_record_id, accountId]);
                 var spentHours = spentResult.rows.length > 0 ? spentResult.rows.item(0).spent_hours : 0;
@@ -3040,7 +3041,7 @@ function getTasksForProjectPaginated(projectOdooRecordId, accountId, limit, offs
 
                 for (var i = 0; i < count; i++) {
                     var row = result.rows.item(i);
-                    var spentQuery = "SELECT COALESCE(SUM(unit_amount), 0) as spent_hours FROM account_analytic_line_app WHERE task_id = ? AND account_id = ? AND (status != 'deleted' OR status IS NULL)";
+                    var spentQuery = "SELECT COALESCE(SUM(unit_amount), 0) as spent_hours FROM " + DBCommon.timesheetHoursSource() + " WHERE task_id = ? AND account_id = ?";
                     var spentResult = tx.executeSql(spentQuery, [row.odoo_record_id, accountId]);
                     var spentHours = spentResult.rows.length > 0 ? spentResult.rows.item(0).spent_hours : 0;
 
@@ -3144,7 +3145,7 @@ function getTasksForProjectPaginated(projectOdooRecordId, accountId, limit, offs
                     if (!inheritedColor && task.project_id) inheritedColor = resolveProjectColor(task.project_id, projectColorMap, tx);
                     task.color_pallet = inheritedColor;
 
-                    var timeQuery = "SELECT COALESCE(SUM(unit_amount), 0) as total_hours FROM account_analytic_line_app WHERE task_id = ? AND account_id = ? AND (status != 'deleted' OR status IS NULL)";
+                    var timeQuery = "SELECT COALESCE(SUM(unit_amount), 0) as total_hours FROM " + DBCommon.timesheetHoursSource() + " WHERE task_id = ? AND account_id = ?";
                     var timeResult = tx.executeSql(timeQuery, [task.odoo_record_id, task.account_id]);
                     task.spent_hours = (timeResult.rows.length > 0 && timeResult.rows.item(0).total_hours !== null) ? timeResult.rows.item(0).total_hours : 0;
                 }
@@ -3855,7 +3856,7 @@ function getTasksByPersonalStagePaginated(personalStageOdooRecordId, assigneeIds
                 task.color_pallet = inheritedColor;
 
                 // Calculate spent hours
-                var timeQuery = "SELECT COALESCE(SUM(unit_amount), 0) as total_hours FROM account_analytic_line_app WHERE task_id = ? AND account_id = ? AND (status != 'deleted' OR status IS NULL)";
+                var timeQuery = "SELECT COALESCE(SUM(unit_amount), 0) as total_hours FROM " + DBCommon.timesheetHoursSource() + " WHERE task_id = ? AND account_id = ?";
                 var timeResult = tx.executeSql(timeQuery, [task.odoo_record_id, task.account_id]);
                 task.spent_hours = (timeResult.rows.length > 0 && timeResult.rows.item(0).total_hours !== null)
                     ? timeResult.rows.item(0).total_hours : 0;
@@ -14,61 +14,118 @@ from datetime import datetime
 # Database path for storing notifications
 DB_DIR = Path.home() / ".local" / "share" / "ubtms" / "Databases"
 
-def get_db_path():
-    """Get the path to the app database."""
+# QML LocalStorage names its files md5(<database name>).sqlite
+APP_DB_NAME = "myDatabase"
+
+# Remembers the resolved database and whether its schema is set up, so a
+# push only opens the database and runs one INSERT
+STATE_FILE = Path.home() / ".local" / "share" / "ubtms" / "push-helper.state.json"
+
+# Bump when ensure_schema() changes
+SCHEMA_VERSION = 1
+
+def load_state():
+    try:
+        with open(STATE_FILE, "r") as f:
+            state = json.load(f)
+        return state if isinstance(state, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+def save_state(state):
+    try:
+        tmp = STATE_FILE.with_name(STATE_FILE.name + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump(state, f)
+        tmp.replace(STATE_FILE)
+    except OSError:
+        pass
+
+def find_db_path():
+    """Scan for the app database (slow path, result is cached in the state file)."""
+    import hashlib
+    app_db = DB_DIR / (hashlib.md5(APP_DB_NAME.encode()).hexdigest() + ".sqlite")
+    if app_db.exists():
+        return str(app_db)
     if DB_DIR.exists():
         db_files = list(DB_DIR.glob("*.sqlite"))
         if db_files:
             return str(max(db_files, key=lambda p: p.stat().st_mtime))
     return str(Path.home() / ".local" / "share" / "ubtms" / "timemanagement.db")
 
+def get_db_path(state=None):
+    """Get the path to the app database."""
+    state = load_state() if state is None else state
+    cached = state.get("db_path")
+    if cached and Path(cached).exists():
+        return cached
+    return find_db_path()
+
+def ensure_schema(cursor):
+    """Create the notification table and its dedup index if needed."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS notification (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            account_id INTEGER,
+            timestamp TEXT DEFAULT (datetime('now')),
+            message TEXT NOT NULL,
+            type TEXT CHECK(type IN ('Activity', 'Task', 'Project', 'ProjectUpdate', 'Timesheet', 'Sync')),
+            payload TEXT NOT NULL,
+            read_status INTEGER DEFAULT 0,
+            panel_invoked INTEGER DEFAULT 0
+        )
+    """)
+
+    # Upgrade path for existing databases created before panel_invoked existed.
+    cursor.execute("PRAGMA table_info(notification)")
+    columns = {row[1] for row in cursor.fetchall()}
+    if "panel_invoked" not in columns:
+        cursor.execute("ALTER TABLE notification ADD COLUMN panel_invoked INTEGER DEFAULT 0")
+
+    # Not unique: other writers may already have stored duplicates
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_notification_unread_dedup
+        ON notification (type, message) WHERE read_status = 0
+    """)
+
+def insert_notification(cursor, notif_type, message, payload):
+    """
+    Insert unless an unread notification with the same type+message exists.
+    Returns True if a row was inserted.
+    """
+    # Insert notification (account_id = 0 for push notifications)
+    cursor.execute("""
+        INSERT INTO notification (account_id, timestamp, message, type, payload, read_status, panel_invoked)
+        SELECT ?, ?, ?, ?, ?, 0, 1
+        WHERE NOT EXISTS (
+            SELECT 1 FROM notification WHERE type = ? AND message = ? AND read_status = 0
+        )
+    """, (0, datetime.utcnow().isoformat() + "Z", message, notif_type, json.dumps(payload),
+          notif_type, message))
+    return cursor.rowcount > 0
+
 def store_notification(notif_type, message, payload):
     """Store notification in database for in-app display."""
     try:
-        db_path = get_db_path()
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
-        # Ensure table exists
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS notification (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                account_id INTEGER,
-                timestamp TEXT DEFAULT (datetime('now')),
-                message TEXT NOT NULL,
-                type TEXT CHECK(type IN ('Activity', 'Task', 'Project', 'ProjectUpdate', 'Timesheet', 'Sync')),
-                payload TEXT NOT NULL,
-                read_status INTEGER DEFAULT 0,
-                panel_invoked INTEGER DEFAULT 0
-            )
-        """)
-
-        # Upgrade path for existing databases created before panel_invoked existed.
-        cursor.execute("PRAGMA table_info(notification)")
-        columns = {row[1] for row in cursor.fetchall()}
-        if "panel_invoked" not in columns:
-            cursor.execute("ALTER TABLE notification ADD COLUMN panel_invoked INTEGER DEFAULT 0")
-        
-        # Check for duplicate unread notification with same type+message
-        cursor.execute("""
-            SELECT COUNT(*) FROM notification 
-            WHERE message = ? AND type = ? AND read_status = 0
-        """, (message, notif_type))
-        count = cursor.fetchone()[0]
-        
-        if count > 0:
-            # Duplicate unread notification exists, skip
+        state = load_state()
+        db_path = get_db_path(state)
+        conn = sqlite3.connect(db_path, timeout=2.0)
+        try:
+            cursor = conn.cursor()
+            ready = state.get("db_path") == db_path and state.get("schema_version") == SCHEMA_VERSION
+            if ready:
+                try:
+                    insert_notification(cursor, notif_type, message, payload)
+                except sqlite3.OperationalError:
+                    # Table dropped or database recreated since the marker was written
+                    ready = False
+            if not ready:
+                ensure_schema(cursor)
+                insert_notification(cursor, notif_type, message, payload)
+                save_state({"db_path": db_path, "schema_version": SCHEMA_VERSION})
+            conn.commit()
+        finally:
             conn.close()
-            return
-        
-        # Insert notification (account_id = 0 for push notifications)
-        cursor.execute("""
-            INSERT INTO notification (account_id, timestamp, message, type, payload, read_status, panel_invoked)
-            VALUES (?, ?, ?, ?, ?, 0, 1)
-        """, (0, datetime.utcnow().isoformat() + "Z", message, notif_type, json.dumps(payload)))
-        
-        conn.commit()
-        conn.close()
     except Exception:
         pass  # Silent failure - notification display is more important
 
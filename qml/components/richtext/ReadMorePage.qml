@@ -430,6 +430,10 @@ Page {
 
     Component.onCompleted: {
         checkVoiceInputEnabled();
+        // Load the voice model now so recording starts without delay
+        if (isVoiceInputEnabled && !isReadOnly && !useRichText) {
+            backend_bridge.call("backend.preload_voice_recognition", [])
+        }
         // Initialize tracking to avoid false external-change detection
         _lastKnownHolder = Global.description_temporary_holder || "";
         
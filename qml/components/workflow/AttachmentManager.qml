@@ -452,6 +452,15 @@ Item {
             attachmentManager._statusMessage = data.payload;
             attachmentManager._notify(data.payload, 2500);
             break;
+        case "ondemand_download_progress":
+            if (data.payload && data.payload.total > 0) {
+                var pct = Math.min(100, Math.floor(data.payload.received * 100 / data.payload.total));
+                attachmentManager._statusMessage = i18n.dtr("ubtms", "Downloading...") + " " + pct + "%";
+            } else if (data.payload) {
+                attachmentManager._statusMessage = i18n.dtr("ubtms", "Downloading...") + " "
+                        + Math.round(data.payload.received / 1024) + " KB";
+            }
+            break;
         case "ondemand_upload_completed":
             if (data.payload === true) {
                 attachmentManager._notify(i18n.dtr("ubtms", "Attachment has been processed"), 3000);
@@ -743,6 +752,14 @@ Item {
         var fname = (rec.name && rec.name.length) ? rec.name : "attachment";
         var mime = rec.mimetype || "application/octet-stream";
 
+        // Cached copies (keyed by content checksum) are returned without network access
+        var checksum = (rec._raw && rec._raw.checksum) ? String(rec._raw.checksum) : "";
+        if (/^[0-9a-f]{40}$/.test(checksum)) {
+            _downloadToFile(rec, fname, mime);
+            return;
+        }
+
+        // Without a usable checksum the cache cannot help; reuse an earlier export by name
         python.call("backend.get_existing_attachment_path", [fname, mime], function (existingPath) {
             if (existingPath && existingPath.length) {
                 console.log("Local copy found; opening");
@@ -761,60 +778,54 @@ Item {
                 return;
             }
             console.log("Local copy not found; downloading…");
+            _downloadToFile(rec, fname, mime);
+        });
+    }
 
-            _busy = true;
-            python.call("backend.resolve_qml_db_path", ["ubtms"], function (path) {
-                if (!path) {
-                    _busy = false;
-                    attachmentManager._notify("DB not found.", 2500);
-                    return;
-                }
-
-                python.call("backend.attachment_ondemand_download",
-                    [path, rec.account_id || attachmentManager.account_id, rec.odoo_record_id],
-                    function (res) {
-                        _busy = false;
+    function _downloadToFile(rec, fname, mime) {
+        _statusMessage = "";
+        _busy = true;
+        python.call("backend.resolve_qml_db_path", ["ubtms"], function (path) {
+            if (!path) {
+                _busy = false;
+                attachmentManager._notify("DB not found.", 2500);
+                return;
+            }
 
-                        if (!res) {
-                            attachmentManager._notify("No response from ondemand_download", 2500);
-                            return;
-                        }
+            python.call("backend.attachment_download_to_file",
+                [path, rec.account_id || attachmentManager.account_id, rec.odoo_record_id],
+                function (res) {
+                    _busy = false;
+                    _statusMessage = "";
 
-                        if (res.success === false) {
-                            attachmentManager._notify(res.error || "Attachment could not be downloaded", 3500);
-                            return;
-                        }
+                    if (!res) {
+                        attachmentManager._notify("No response from download", 2500);
+                        return;
+                    }
 
-                        if (res.type === "binary" && res.data) {
-                            var dlName = (res.name && res.name.length) ? res.name : fname;
-                            var dlMime = res.mimetype || mime;
+                    if (res.success === false) {
+                        attachmentManager._notify(res.error || "Attachment could not be downloaded", 3500);
+                        return;
+                    }
 
-                            python.call("backend.ensure_export_file_from_base64",
-                                        [dlName, res.data, dlMime],
-                                        function (resultPath) {
-                                if (!resultPath || !resultPath.length) {
-                                    attachmentManager._notify("Failed to prepare file", 2500);
-                                    return;
-                                }
-                                var rec2 = {
-                                    name: dlName,
-                                    url: (resultPath.indexOf("file://") === 0) ? resultPath : ("file://" + resultPath),
-                                    mimetype: dlMime,
-                                    size: rec.size,
-                                    created: rec.created,
-                                    account_id: rec.account_id || attachmentManager.account_id,
-                                    odoo_record_id: rec.odoo_record_id,
-                                    _raw: rec._raw
-                                };
-                                openFileSmart(rec2);
-                            });
-                        } else if (res.type === "url" && res.url) {
-                            Qt.openUrlExternally(res.url);
-                        } else {
-                            attachmentManager._notify("Attachment has no usable data", 2500);
-                        }
-                    });
-            });
+                    if (res.type === "binary" && res.path) {
+                        var rec2 = {
+                            name: (res.name && res.name.length) ? res.name : fname,
+                            url: (res.path.indexOf("file://") === 0) ? res.path : ("file://" + res.path),
+                            mimetype: res.mimetype || mime,
+                            size: rec.size,
+                            created: rec.created,
+                            account_id: rec.account_id || attachmentManager.account_id,
+                            odoo_record_id: rec.odoo_record_id,
+                            _raw: rec._raw
+                        };
+                        openFileSmart(rec2);
+                    } else if (res.type === "url" && res.url) {
+                        Qt.openUrlExternally(res.url);
+                    } else {
+                        attachmentManager._notify("Attachment has no usable data", 2500);
+                    }
+                });
         });
     }
 
@@ -7,6 +7,8 @@ Page {
     title: i18n.dtr("ubtms", "Sync Log")
     property var syncLogs: []
     property var recordid: -1
+    // Latest profiled sync run of this account (backend.get_sync_performance)
+    property var lastRun: null
 
     header: PageHeader {
         id: pageHeader
@@ -52,13 +54,87 @@ Page {
         if (syncLogs.length === 0) {
             console.log("SyncLog.qml: No ERROR/WARNING logs found for account_id:", recordid);
         }
+
+        loadSyncPerformance();
+    }
+
+    function loadSyncPerformance() {
+        mainView.backend_bridge.call("backend.resolve_qml_db_path", ["ubtms"], function (path) {
+            if (path === "") {
+                return;
+            }
+            mainView.backend_bridge.call("backend.get_sync_performance", [path, recordid, 1], function (runs) {
+                lastRun = (runs && runs.length > 0) ? runs[0] : null;
+            });
+        });
+    }
+
+    function formatSeconds(ms) {
+        return (Number(ms || 0) / 1000).toFixed(1) + " s";
+    }
+
+    // Slowest steps of the run, with network and parse time to tell a slow server from a slow device
+    function slowestPhases(run, count) {
+        var lines = [];
+        var phases = run ? run.phases : [];
+        for (var i = 0; i < phases.length && lines.length < count; i++) {
+            var p = phases[i];
+            lines.push((p.model ? p.model + " " : "") + p.phase + ": " + formatSeconds(p.wall_ms) +
+                       " (" + i18n.dtr("ubtms", "network") + " " + formatSeconds(p.network_ms) +
+                       ", " + i18n.dtr("ubtms", "parse") + " " + formatSeconds(p.parse_ms) +
+                       ", " + (p.rows || 0) + " " + i18n.dtr("ubtms", "rows") + ")");
+        }
+        return lines.join("\n");
+    }
+
+    Rectangle {
+        id: performancePanel
+        anchors.top: pageHeader.bottom
+        anchors.left: parent.left
+        anchors.right: parent.right
+        anchors.margins: units.gu(1)
+        height: lastRun ? performanceColumn.height + units.gu(2) : 0
+        visible: lastRun !== null
+        color: theme.name === "Ubuntu.Components.Themes.SuruDark" ? "#1a1a1a" : "#f8f8f8"
+        border.color: theme.name === "Ubuntu.Components.Themes.SuruDark" ? "#444" : "#ddd"
+        border.width: 1
+        radius: units.gu(0.5)
+
+        Column {
+            id: performanceColumn
+            width: parent.width - units.gu(2)
+            anchors.horizontalCenter: parent.horizontalCenter
+            anchors.top: parent.top
+            anchors.topMargin: units.gu(1)
+            spacing: units.gu(0.5)
+
+            Text {
+                width: parent.width
+                text: lastRun ? i18n.dtr("ubtms", "Last sync") + ": " + formatSeconds(lastRun.total_ms) +
+                                " (" + lastRun.source + ", " + (lastRun.direction || "both") + ")" : ""
+                font.pixelSize: units.gu(1.6)
+                font.bold: true
+                color: theme.name === "Ubuntu.Components.Themes.SuruDark" ? "#e0e0e0" : "#333"
+                wrapMode: Text.Wrap
+            }
+
+            Text {
+                width: parent.width
+                text: slowestPhases(lastRun, 3)
+                font.pixelSize: units.gu(1.3)
+                color: theme.name === "Ubuntu.Components.Themes.SuruDark" ? "#b0b0b0" : "#666"
+                wrapMode: Text.Wrap
+            }
+        }
     }
 
     ListView {
         id: logListView
-        anchors.fill: parent
+        anchors.top: performancePanel.visible ? performancePanel.bottom : pageHeader.bottom
+        anchors.left: parent.left
+        anchors.right: parent.right
+        anchors.bottom: parent.bottom
         anchors.margins: units.gu(1)
-        anchors.topMargin: pageHeader.height + units.gu(1)
         clip: true
         spacing: units.gu(1)
 
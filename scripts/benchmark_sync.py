@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# MIT License
+#
+# Copyright (c) 2025 CIT-Services
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Offline sync benchmark.
+
+Starts scripts/fake_odoo_server.py in-process (or targets one given with
+--server-url), builds a throwaway SQLite database with the app tables and
+times the real sync code paths:
+
+    from_cold      sync_all_from_odoo into an empty database
+    from_warm      sync_all_from_odoo again with nothing changed
+    to_odoo        sync_all_to_odoo after marking a share of rows 'updated'
+    assignments    assignment snapshot + detect_new_assignments (the daemon's
+                   notification detection) around a download sync
+
+The schema migrations the daemon runs at startup are applied to the
+database; --no-sync-indexes drops the sync indexes (sync_indexes.py) they
+create. --explain prints the EXPLAIN QUERY PLAN of the sync lookups
+afterwards and exits non-zero if one of them scans a whole table.
+
+Each scenario reports wall time, records/s and the per-phase breakdown from
+sync_metrics. Peak RSS of the process is printed at the end; run the server
+separately with --server-url to keep its dataset out of that number.
+
+Usage:
+    python3 scripts/benchmark_sync.py --records 2000 --latency-ms 50
+    python3 scripts/benchmark_sync.py --records 10000 --json results.json
+    python3 scripts/benchmark_sync.py --latency-ms 50 --async-fetch 4
+    python3 scripts/benchmark_sync.py --records 200 --explain
+"""
+
+import argparse
+import json
+import logging
+import os
+import resource
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).parent.resolve()
+SRC_DIR = SCRIPTS_DIR.parent / "src"
+sys.path.insert(0, str(SRC_DIR))
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from fake_odoo_server import FakeOdooServer, FAKE_DB, FAKE_LOGIN, FAKE_UID  # noqa: E402
+from odoo_client import OdooClient  # noqa: E402
+from sync_from_odoo import sync_all_from_odoo, sync_all_from_odoo_concurrent  # noqa: E402
+from sync_to_odoo import sync_all_to_odoo  # noqa: E402
+from field_mapping import registry  # noqa: E402
+from sync_metrics import profile_sync, get_sync_metrics  # noqa: E402
+from common import get_current_assignments_snapshot, detect_new_assignments  # noqa: E402
+from sync_indexes import drop_sync_indexes, explain_query_plan, PENDING_STATUS_SQL  # noqa: E402
+from schema_manager import ensure_schema  # noqa: E402
+
+MODEL_TABLES = {
+    "project.project": "project_project_app",
+    "project.task": "project_task_app",
+    "account.analytic.line": "account_analytic_line_app",
+    "mail.activity.type": "mail_activity_type_app",
+    "mail.activity": "mail_activity_app",
+    "res.users": "res_users_app",
+    "ir.model": "ir_model_app",
+    "project.update": "project_update_app",
+    "project.task.type": "project_task_type_app",
+    "project.project.stage": "project_project_stage_app",
+    "ir.attachment": "ir_attachment_app",
+}
+
+# Bookkeeping columns the QML side adds to every synced table (models/dbinit.js)
+STANDARD_COLUMNS = ("account_id", "odoo_record_id", "status", "has_draft", "last_modified", "favorites")
+
+ACCOUNT_ID = 1
+
+
+def create_benchmark_db(db_path):
+    """Create the synced tables from field_config.json plus the bookkeeping columns."""
+    conn = sqlite3.connect(db_path)
+    for model, table in MODEL_TABLES.items():
+        mapped = registry.get(model).sqlite_columns
+        columns = list(dict.fromkeys(mapped + STANDARD_COLUMNS))
+        column_sql = ", ".join(
+            f"{c} INTEGER DEFAULT 0" if c == "has_draft" else f"{c} TEXT DEFAULT ''" if c == "status" else c
+            for c in columns
+        )
+        conn.execute(
+            f"CREATE TABLE {table} (id INTEGER PRIMARY KEY AUTOINCREMENT, {column_sql}, "
+            f"UNIQUE (odoo_record_id, account_id))"
+        )
+    conn.execute(
+        "CREATE TABLE notification (id INTEGER PRIMARY KEY AUTOINCREMENT, account_id INTEGER, "
+        "timestamp TEXT DEFAULT (datetime('now')), message TEXT NOT NULL, type TEXT, "
+        "payload TEXT NOT NULL, read_status INTEGER DEFAULT 0, panel_invoked INTEGER DEFAULT 0)"
+    )
+    conn.execute("CREATE TABLE app_settings (key TEXT PRIMARY KEY, value TEXT)")
+    conn.commit()
+    conn.close()
+
+
+def count_rows(db_path):
+    conn = sqlite3.connect(db_path)
+    total = sum(conn.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0] for t in MODEL_TABLES.values())
+    conn.close()
+    return total
+
+
+def mark_updated(db_path, share):
+    """Flag a share of timesheets and tasks as locally modified for the upload benchmark."""
+    conn = sqlite3.connect(db_path)
+    touched = 0
+    for table in ("account_analytic_line_app", "project_task_app"):
+        total = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        limit = int(total * share)
+        cur = conn.execute(
+            f"UPDATE {table} SET status = 'updated', name = name || ' (edited)', "
+            f"last_modified = '2099-01-01 00:00:00' "
+            f"WHERE id IN (SELECT id FROM {table} ORDER BY id LIMIT ?)",
+            (limit,),
+        )
+        touched += cur.rowcount
+    conn.commit()
+    conn.close()
+    return touched
+
+
+# Lookups the sync engines run per table; none of them may scan the table
+SYNC_LOOKUPS = (
+    ("record state", "SELECT last_modified, status, has_draft FROM {table} "
+                     "WHERE odoo_record_id = ? AND account_id = ?", (1, ACCOUNT_ID)),
+    ("orphan scan", "SELECT id, odoo_record_id, status, has_draft FROM {table} "
+                    "WHERE account_id = ? AND odoo_record_id IS NOT NULL", (ACCOUNT_ID,)),
+    ("pending rows", "SELECT * FROM {table} "
+                     "WHERE account_id = ? AND " + PENDING_STATUS_SQL, (ACCOUNT_ID,)),
+    ("drafts", "SELECT * FROM {table} WHERE account_id = ? AND has_draft = 1", (ACCOUNT_ID,)),
+)
+
+
+def explain_sync_lookups(db_path, tables=("project_task_app", "account_analytic_line_app")):
+    """Print the query plans of SYNC_LOOKUPS. Returns the number of full table scans."""
+    scans = 0
+    for table in tables:
+        print(f"\n{table}")
+        for label, sql, values in SYNC_LOOKUPS:
+            plan = explain_query_plan(db_path, sql.format(table=table), values)
+            full_scan = any(step.startswith("SCAN") and "INDEX" not in step for step in plan)
+            scans += full_scan
+            print(f"  {'!!' if full_scan else 'ok'} {label:<14} {' | '.join(plan)}")
+    return scans
+
+
+def run_scenario(name, db_path, func, rows):
+    start = time.perf_counter()
+    with profile_sync(db_path, ACCOUNT_ID, f"bench:{name}"):
+        func()
+    wall = time.perf_counter() - start
+    run = get_sync_metrics(db_path, ACCOUNT_ID, 1)[0]
+    return {
+        "scenario": name,
+        "wall_s": round(wall, 3),
+        "rows": rows() if callable(rows) else rows,
+        "rows_per_s": round((rows() if callable(rows) else rows) / wall, 1) if wall else None,
+        "phases": run["phases"],
+    }
+
+
+def print_result(result, top=6):
+    print(f"\n== {result['scenario']}: {result['wall_s']:.2f}s, {result['rows']} rows, "
+          f"{result['rows_per_s']} rows/s")
+    by_phase = {}
+    for p in result["phases"]:
+        agg = by_phase.setdefault(p["phase"], [0.0, 0.0, 0.0, 0, 0])
+        agg[0] += p["wall_ms"]
+        agg[1] += p["network_ms"]
+        agg[2] += p["parse_ms"]
+        agg[3] += p["bytes_in"]
+        agg[4] += p["rows"]
+    for phase_name, (wall, net, parse, nbytes, rows) in sorted(by_phase.items(), key=lambda kv: -kv[1][0])[:top]:
+        print(f"   {phase_name:<14} {wall:9.1f} ms  net {net:8.1f} ms  parse {parse:8.1f} ms  "
+              f"{nbytes / 1024:9.1f} KiB  {rows:7d} rows")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sync against a fake Odoo server")
+    parser.add_argument("--records", type=int, default=1000, help="project.task records (others scale)")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="artificial latency per request")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="probability of a simulated Fault")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--update-share", type=float, default=0.05, help="share of rows pushed in to_odoo")
+    parser.add_argument("--server-url", help="use an already running fake_odoo_server.py")
+    parser.add_argument("--db", help="keep the benchmark database at this path")
+    parser.add_argument("--json", help="write results to this JSON file")
+    parser.add_argument("--verbose", action="store_true", help="keep INFO sync logging")
+    parser.add_argument("--async-fetch", type=int, default=0, metavar="N",
+                        help="download models concurrently with N requests in flight")
+    parser.add_argument("--no-sync-indexes", action="store_true",
+                        help="drop the sync indexes the schema migrations create")
+    parser.add_argument("--explain", action="store_true",
+                        help="print query plans of the sync lookups, fail on full table scans")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        logging.getLogger("odoo_sync").setLevel(logging.WARNING)
+
+    server = None
+    if args.server_url:
+        url = args.server_url
+    else:
+        print(f"Generating dataset ({args.records} tasks)...")
+        server = FakeOdooServer(args.records, args.latency_ms / 1000.0, args.error_rate, args.seed).start()
+        url = server.url
+
+    tmpdir = None
+    if args.db:
+        db_path = args.db
+        if os.path.exists(db_path):
+            os.remove(db_path)
+    else:
+        tmpdir = tempfile.TemporaryDirectory(prefix="ubtms-bench-")
+        db_path = os.path.join(tmpdir.name, "bench.sqlite")
+    create_benchmark_db(db_path)
+    # Same migrations as the daemon at startup
+    ensure_schema(db_path)
+    if args.no_sync_indexes:
+        drop_sync_indexes(db_path)
+
+    results = []
+    exit_code = 0
+    try:
+        client = OdooClient(url, FAKE_DB, FAKE_LOGIN, "bench")
+        db_rows = lambda: count_rows(db_path)  # noqa: E731
+
+        def download():
+            if args.async_fetch:
+                sync_all_from_odoo_concurrent(client, ACCOUNT_ID, db_path, account_name="bench",
+                                              max_concurrency=args.async_fetch)
+            else:
+                sync_all_from_odoo(client, ACCOUNT_ID, db_path, account_name="bench")
+
+        results.append(run_scenario("from_cold", db_path, download, db_rows))
+        results.append(run_scenario("from_warm", db_path, download, db_rows))
+
+        touched = mark_updated(db_path, args.update_share)
+        results.append(run_scenario(
+            "to_odoo", db_path,
+            lambda: sync_all_to_odoo(client, ACCOUNT_ID, db_path), touched))
+
+        def assignments():
+            snapshot = get_current_assignments_snapshot(db_path, ACCOUNT_ID, FAKE_UID)
+            download()
+            new = detect_new_assignments(db_path, ACCOUNT_ID, FAKE_UID, snapshot)
+            assignments.found = sum(len(v) for v in new.values())
+        assignments.found = 0
+        results.append(run_scenario("assignments", db_path, assignments, db_rows))
+
+        for result in results:
+            print_result(result)
+
+        peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+        summary = {
+            "records": args.records,
+            "latency_ms": args.latency_ms,
+            "error_rate": args.error_rate,
+            "async_fetch": args.async_fetch,
+            "peak_rss_mb": round(peak_rss_mb, 1),
+            "server_in_process": server is not None,
+            "server_stats": server.stats if server else None,
+            "results": results,
+        }
+        print(f"\nPeak RSS: {peak_rss_mb:.1f} MiB"
+              + (" (includes in-process fake server)" if server else ""))
+        if server:
+            print(f"Server: {server.stats['requests']} requests, "
+                  f"{server.stats['bytes_out'] / 1024:.1f} KiB sent, {server.stats['errors']} simulated errors")
+        if args.json:
+            with open(args.json, "w") as f:
+                json.dump(summary, f, indent=2)
+            print(f"Results written to {args.json}")
+        if args.explain and explain_sync_lookups(db_path):
+            print("\nFull table scans found in sync lookups")
+            exit_code = 1
+    finally:
+        if server:
+            server.stop()
+        if tmpdir:
+            tmpdir.cleanup()
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,691 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# MIT License
+#
+# Copyright (c) 2025 CIT-Services
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Minimal in-process fake Odoo server for offline sync benchmarks.
+
+Serves /xmlrpc/2/common, /xmlrpc/2/object and /jsonrpc with synthetic data
+for every model in models_to_sync, plus /web/session/authenticate and
+/web/content/<id> for attachment downloads. Only the subset of the ORM API used by
+the sync engines is implemented (fields_get, search, search_read, read,
+search_count, create, write, unlink, action_done) with a small domain
+evaluator.
+
+Development tool only; it is not shipped with the app.
+
+Usage:
+    python3 scripts/fake_odoo_server.py --records 5000 --latency-ms 80
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import os
+import random
+import socket
+import threading
+import time
+import xmlrpc.client
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FAKE_DB = "bench"
+FAKE_LOGIN = "admin"
+FAKE_UID = 2
+SERVER_VERSION = "17.0"
+
+# Odoo field types of everything referenced by src/field_config.json
+MODEL_FIELDS = {
+    "project.project": {
+        "name": "char", "parent_id": ("many2one", "project.project"),
+        "date_start": "date", "date": "date", "allocated_hours": "float",
+        "remaining_hours": "float", "description": "html", "color": "integer",
+        "last_update_status": "selection",
+        "stage_id": ("many2one", "project.project.stage"),
+        "write_date": "datetime", "is_favorite": "boolean",
+        "user_id": ("many2one", "res.users"), "create_uid": ("many2one", "res.users"),
+    },
+    "project.task": {
+        "name": "char", "project_id": ("many2one", "project.project"),
+        "display_project_id": ("many2one", "project.project"),
+        "parent_id": ("many2one", "project.task"),
+        "planned_date_start": "datetime", "planned_date_end": "datetime",
+        "date_deadline": "date", "planned_hours": "float",
+        "stage_id": ("many2one", "project.task.type"),
+        "personal_stage_type_id": ("many2one", "project.task.type"),
+        "priority": "selection", "description": "html", "write_date": "datetime",
+        "user_ids": ("many2many", "res.users"), "create_uid": ("many2one", "res.users"),
+    },
+    "account.analytic.line": {
+        "project_id": ("many2one", "project.project"), "user_id": ("many2one", "res.users"),
+        "task_id": ("many2one", "project.task"), "name": "char", "date": "date",
+        "unit_amount": "float", "write_date": "datetime",
+    },
+    "mail.activity.type": {"name": "char"},
+    "mail.activity": {
+        "activity_type_id": ("many2one", "mail.activity.type"), "summary": "char",
+        "date_deadline": "date", "user_id": ("many2one", "res.users"),
+        "create_uid": ("many2one", "res.users"), "note": "html", "write_date": "datetime",
+        "res_id": "many2one_reference", "res_model": "char",
+        "res_model_id": ("many2one", "ir.model"), "state": "selection",
+    },
+    "res.users": {
+        "name": "char", "share": "boolean", "active": "boolean", "login": "char",
+        "job_title": "char", "mobile_phone": "char", "work_email": "char",
+        "company_id": ("many2one", "res.company"), "avatar_128": "binary",
+    },
+    "ir.model": {"name": "char", "model": "char"},
+    "ir.attachment": {
+        "name": "char", "description": "text", "res_model": "char",
+        "res_id": "many2one_reference", "file_size": "integer", "mimetype": "char",
+        "store_fname": "char", "checksum": "char", "access_token": "char", "url": "char",
+        "image_width": "integer", "image_height": "integer", "write_date": "datetime",
+        "type": "selection", "datas": "binary",
+    },
+    "project.update": {
+        "name": "char", "status": "selection", "progress": "integer",
+        "user_id": ("many2one", "res.users"), "description": "html", "date": "date",
+        "project_id": ("many2one", "project.project"),
+        "create_uid": ("many2one", "res.users"), "write_date": "datetime",
+    },
+    "project.task.type": {
+        "name": "char", "description": "text", "sequence": "integer", "fold": "boolean",
+        "legend_blocked": "char", "legend_done": "char", "legend_normal": "char",
+        "auto_validation_kanban_state": "boolean", "create_date": "datetime",
+        "write_date": "datetime", "__last_update": "datetime",
+        "project_ids": ("many2many", "project.project"), "user_id": ("many2one", "res.users"),
+    },
+    "project.project.stage": {
+        "name": "char", "sequence": "integer", "fold": "boolean",
+        "mail_template_id": ("many2one", "mail.template"),
+        "sms_template_id": ("many2one", "sms.template"), "active": "boolean",
+        "create_date": "datetime", "write_date": "datetime", "__last_update": "datetime",
+    },
+}
+
+SELECTIONS = {
+    "last_update_status": ["on_track", "at_risk", "off_track", "on_hold", "to_define"],
+    "priority": ["0", "1"],
+    "state": ["overdue", "today", "planned"],
+    "status": ["on_track", "at_risk", "off_track", "on_hold"],
+    "type": ["binary"],
+}
+
+# Record count per model relative to --records (the project.task count)
+MODEL_RATIOS = {
+    "project.project": 0.1,
+    "project.task": 1.0,
+    "account.analytic.line": 2.0,
+    "mail.activity": 0.5,
+    "project.update": 0.05,
+    "ir.attachment": 0.25,
+}
+FIXED_COUNTS = {
+    "mail.activity.type": 10,
+    "project.task.type": 8,
+    "project.project.stage": 5,
+    "res.company": 1,
+    "mail.template": 3,
+    "sms.template": 3,
+}
+
+LOREM = (
+    "Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod "
+    "tempor incididunt ut labore et dolore magna aliqua. "
+)
+
+BASE_DATE = datetime(2025, 1, 1)
+
+
+def _fmt_dt(dt):
+    return dt.strftime("%Y-%m-%d %H:%M:%S")
+
+
+class FakeOdooDataset:
+    """Synthetic, deterministic record store keyed by model and id."""
+
+    def __init__(self, records=1000, seed=1, text_size=200, attachment_size=2048):
+        self.rng = random.Random(seed)
+        self.text_size = text_size
+        self.attachment_size = attachment_size
+        self.lock = threading.RLock()
+        self.counts = dict(FIXED_COUNTS)
+        for model, ratio in MODEL_RATIOS.items():
+            self.counts[model] = max(1, int(records * ratio))
+        self.counts["res.users"] = max(5, records // 50)
+        self.counts["ir.model"] = len(MODEL_FIELDS)
+        self.models = {model: {} for model in MODEL_FIELDS}
+        self.blobs = {}
+        for model in MODEL_FIELDS:
+            for rec_id in range(1, self.counts[model] + 1):
+                self.models[model][rec_id] = self._generate(model, rec_id)
+        self.next_ids = {model: self.counts[model] + 1 for model in MODEL_FIELDS}
+
+    def _display_name(self, model, rec_id):
+        return f"{model.split('.')[-1].title()} {rec_id}"
+
+    def _m2o(self, target, allow_empty=False):
+        if allow_empty and self.rng.random() < 0.3:
+            return False
+        count = self.counts.get(target, 1)
+        target_id = self.rng.randint(1, count)
+        return [target_id, self._display_name(target, target_id)]
+
+    def _generate(self, model, rec_id):
+        rng = self.rng
+        rec = {"id": rec_id, "display_name": self._display_name(model, rec_id)}
+        for field, ftype in MODEL_FIELDS[model].items():
+            target = None
+            if isinstance(ftype, tuple):
+                ftype, target = ftype
+            if field == "write_date":
+                value = _fmt_dt(BASE_DATE + timedelta(minutes=rec_id))
+            elif ftype == "many2one":
+                value = self._m2o(target, allow_empty=field in ("parent_id", "personal_stage_type_id", "display_project_id"))
+            elif ftype == "many2many":
+                count = self.counts.get(target, 1)
+                value = sorted({rng.randint(1, count) for _ in range(rng.randint(1, 3))})
+            elif ftype == "boolean":
+                value = field in ("active",) or rng.random() < 0.2
+            elif ftype == "integer":
+                value = rng.randint(0, 100)
+            elif ftype == "float":
+                value = round(rng.uniform(0, 40), 2)
+            elif ftype == "date":
+                value = (BASE_DATE + timedelta(days=rng.randint(0, 365))).strftime("%Y-%m-%d")
+            elif ftype == "datetime":
+                value = _fmt_dt(BASE_DATE + timedelta(hours=rng.randint(0, 8760)))
+            elif ftype == "selection":
+                value = rng.choice(SELECTIONS.get(field, ["draft"]))
+            elif ftype == "html":
+                value = "<p>" + (LOREM * (self.text_size // len(LOREM) + 1))[: self.text_size] + "</p>"
+            elif ftype == "text":
+                value = LOREM[: rng.randint(0, len(LOREM))]
+            elif ftype == "binary":
+                value = False
+            elif ftype == "many2one_reference":
+                value = 0
+            else:
+                value = f"{self._display_name(model, rec_id)} {field}"
+            rec[field] = value
+
+        if model == "res.users":
+            rec["login"] = FAKE_LOGIN if rec_id == FAKE_UID else f"user{rec_id}@example.com"
+            rec["share"] = False
+        elif model == "ir.model":
+            technical = sorted(MODEL_FIELDS)[rec_id - 1]
+            rec["model"] = technical
+            rec["name"] = technical.replace(".", " ").title()
+        elif model == "mail.activity":
+            rec["res_model"] = "project.task"
+            rec["res_model_id"] = [sorted(MODEL_FIELDS).index("project.task") + 1, "Project Task"]
+            rec["res_id"] = rng.randint(1, self.counts["project.task"])
+        elif model == "ir.attachment":
+            data = self._blob(rec_id)
+            rec.update({
+                "res_model": "project.task",
+                "res_id": rng.randint(1, self.counts["project.task"]),
+                "name": f"file_{rec_id}.bin",
+                "mimetype": "application/octet-stream",
+                "type": "binary",
+                "url": False,
+                "file_size": len(data),
+                "checksum": hashlib.sha1(data).hexdigest(),
+                "store_fname": f"ab/{rec_id:08x}",
+                "access_token": False,
+            })
+        return rec
+
+    def _blob(self, rec_id):
+        seed = hashlib.sha256(str(rec_id).encode()).digest()
+        blob = (seed * (self.attachment_size // len(seed) + 1))[: self.attachment_size]
+        self.blobs[rec_id] = blob
+        return blob
+
+    # -- domain evaluation -------------------------------------------------
+
+    @staticmethod
+    def _norm(value):
+        if isinstance(value, list) and len(value) == 2 and isinstance(value[1], str):
+            return value[0]
+        return value
+
+    def _leaf(self, rec, leaf):
+        field, op, expected = leaf
+        value = self._norm(rec.get(field, False))
+        if isinstance(value, list):  # x2many
+            if op in ("in", "="):
+                expected_set = set(expected if isinstance(expected, (list, tuple)) else [expected])
+                return bool(expected_set.intersection(value))
+            if op in ("not in", "!="):
+                expected_set = set(expected if isinstance(expected, (list, tuple)) else [expected])
+                return not expected_set.intersection(value)
+            return False
+        if op == "=":
+            return value == expected
+        if op == "!=":
+            return value != expected
+        if op == "in":
+            return value in expected
+        if op == "not in":
+            return value not in expected
+        if op in ("like", "ilike"):
+            return isinstance(value, str) and str(expected).lower() in value.lower()
+        if value is False or value is None:
+            return False
+        if op == ">":
+            return value > expected
+        if op == ">=":
+            return value >= expected
+        if op == "<":
+            return value < expected
+        if op == "<=":
+            return value <= expected
+        raise ValueError(f"Unsupported operator {op!r}")
+
+    def _match(self, rec, domain):
+        if not domain:
+            return True
+        stack = []
+        for token in reversed(domain):
+            if token == "&":
+                stack.append(stack.pop() and stack.pop())
+            elif token == "|":
+                a, b = stack.pop(), stack.pop()
+                stack.append(a or b)
+            elif token == "!":
+                stack.append(not stack.pop())
+            else:
+                stack.append(self._leaf(rec, token))
+        return all(stack)
+
+    def search_ids(self, model, domain, offset=0, limit=None, order=None):
+        with self.lock:
+            records = [r for r in self.models[model].values() if self._match(r, domain)]
+        if order:
+            key, _, direction = order.strip().partition(" ")
+            records.sort(key=lambda r: (r.get(key) is False, r.get(key)), reverse=direction.lower() == "desc")
+        else:
+            records.sort(key=lambda r: r["id"])
+        ids = [r["id"] for r in records]
+        return ids[offset: offset + limit if limit else None]
+
+    def read(self, model, ids, fields=None):
+        out = []
+        with self.lock:
+            for rec_id in ids:
+                rec = self.models[model].get(rec_id)
+                if rec is None:
+                    continue
+                keys = list(fields) if fields else list(rec.keys())
+                row = {"id": rec_id}
+                for key in keys:
+                    if key == "datas" and model == "ir.attachment":
+                        row[key] = base64.b64encode(self.blobs.get(rec_id, b"")).decode()
+                    else:
+                        row[key] = rec.get(key, False)
+                out.append(row)
+        return out
+
+    def read_group(self, model, domain, fields, groupby, offset=0, limit=None):
+        """Non-lazy read_group supporting many2one and date:day/week groupings."""
+        sums = [f.split(":")[0] for f in fields if f.split(":")[0] not in groupby]
+        groups = {}
+        with self.lock:
+            records = [r for r in self.models[model].values() if self._match(r, domain)]
+        for rec in records:
+            key = []
+            for spec in groupby:
+                field, _, interval = spec.partition(":")
+                value = rec.get(field, False)
+                if interval and value:
+                    day = datetime.strptime(value[:10], "%Y-%m-%d")
+                    if interval == "week":
+                        day -= timedelta(days=day.weekday())
+                    value = day.strftime("%Y-%m-%d")
+                elif isinstance(value, list):
+                    value = tuple(value)
+                key.append(value)
+            group = groups.setdefault(tuple(key), {"__count": 0, **{f: 0.0 for f in sums}})
+            group["__count"] += 1
+            for f in sums:
+                group[f] += rec.get(f) or 0.0
+        out = []
+        for key in sorted(groups, key=lambda k: [(v is False, v if not isinstance(v, tuple) else v[0]) for v in k]):
+            group = dict(groups[key])
+            ranges = {}
+            for spec, value in zip(groupby, key):
+                field, _, interval = spec.partition(":")
+                if interval and value:
+                    start = datetime.strptime(value, "%Y-%m-%d")
+                    end = start + timedelta(days=7 if interval == "week" else 1)
+                    ranges[spec] = {"from": value, "to": end.strftime("%Y-%m-%d")}
+                    group[spec] = start.strftime("W%V %G" if interval == "week" else "%d %b %Y")
+                else:
+                    group[spec] = list(value) if isinstance(value, tuple) else value
+            group["__range"] = ranges
+            out.append(group)
+        return out[offset: offset + limit if limit else None]
+
+    def _stored_value(self, model, field, value):
+        ftype = MODEL_FIELDS[model].get(field)
+        if isinstance(ftype, tuple) and ftype[0] == "many2one" and isinstance(value, int) and value:
+            return [value, self._display_name(ftype[1], value)]
+        if isinstance(ftype, tuple) and ftype[0] == "many2many" and isinstance(value, list):
+            ids = []
+            for command in value:
+                if isinstance(command, (list, tuple)) and command and command[0] == 6:
+                    ids = list(command[2])
+                elif isinstance(command, int):
+                    ids.append(command)
+            return ids
+        return value
+
+    def write(self, model, ids, values):
+        with self.lock:
+            for rec_id in ids:
+                rec = self.models[model].get(rec_id)
+                if rec is None:
+                    raise xmlrpc.client.Fault(2, f"Record {model}({rec_id}) does not exist or has been deleted.")
+                for field, value in values.items():
+                    rec[field] = self._stored_value(model, field, value)
+                rec["write_date"] = _fmt_dt(datetime.utcnow())
+        return True
+
+    def create(self, model, values):
+        with self.lock:
+            rec_id = self.next_ids[model]
+            self.next_ids[model] += 1
+            rec = self._generate(model, rec_id)
+            for field, value in values.items():
+                rec[field] = self._stored_value(model, field, value)
+            rec["write_date"] = _fmt_dt(datetime.utcnow())
+            self.models[model][rec_id] = rec
+            if model == "ir.attachment" and values.get("datas"):
+                blob = base64.b64decode(values["datas"])
+                self.blobs[rec_id] = blob
+                rec["file_size"] = len(blob)
+                rec["checksum"] = hashlib.sha1(blob).hexdigest()
+        return rec_id
+
+    def unlink(self, model, ids):
+        with self.lock:
+            for rec_id in ids:
+                self.models[model].pop(rec_id, None)
+        return True
+
+
+class FakeOdoo:
+    """Dispatches Odoo RPC services against a FakeOdooDataset."""
+
+    def __init__(self, dataset, latency=0.0, error_rate=0.0, seed=1):
+        self.dataset = dataset
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.stats = {"requests": 0, "errors": 0, "bytes_out": 0}
+        self._stats_lock = threading.Lock()
+        self.web_sessions = set()
+
+    def common(self, method, args):
+        if method == "version":
+            return {"server_version": SERVER_VERSION, "server_version_info": [17, 0, 0, "final", 0, ""], "protocol_version": 1}
+        if method in ("authenticate", "login"):
+            db, login = args[0], args[1]
+            return FAKE_UID if db == FAKE_DB and login == FAKE_LOGIN else False
+        raise xmlrpc.client.Fault(1, f"Unknown common method {method}")
+
+    def execute_kw(self, db, uid, password, model, method, args=None, kwargs=None):
+        args = list(args or [])
+        kwargs = dict(kwargs or {})
+        if uid != FAKE_UID:
+            raise xmlrpc.client.Fault(3, "Access Denied")
+        if self.error_rate and self.rng.random() < self.error_rate:
+            with self._stats_lock:
+                self.stats["errors"] += 1
+            raise xmlrpc.client.Fault(1, "Simulated server error")
+        data = self.dataset
+        if model not in data.models:
+            raise xmlrpc.client.Fault(1, f"Object {model} doesn't exist")
+
+        if method == "fields_get":
+            result = {"id": {"type": "integer", "string": "ID"}}
+            for field, ftype in MODEL_FIELDS[model].items():
+                ftype, relation = ftype if isinstance(ftype, tuple) else (ftype, None)
+                result[field] = {"type": ftype, "string": field.replace("_", " ").title()}
+                if relation:
+                    result[field]["relation"] = relation
+            return result
+        if method == "search":
+            domain = args[0] if args else kwargs.get("domain", [])
+            if kwargs.get("count"):
+                return len(data.search_ids(model, domain))
+            return data.search_ids(model, domain, kwargs.get("offset", 0), kwargs.get("limit"), kwargs.get("order"))
+        if method == "search_count":
+            return len(data.search_ids(model, args[0] if args else kwargs.get("domain", [])))
+        if method == "search_read":
+            domain = args[0] if args else kwargs.get("domain", [])
+            ids = data.search_ids(model, domain, kwargs.get("offset", 0), kwargs.get("limit"), kwargs.get("order"))
+            return data.read(model, ids, kwargs.get("fields"))
+        if method == "read_group":
+            domain = args[0] if args else kwargs.get("domain", [])
+            fields = args[1] if len(args) > 1 else kwargs.get("fields", [])
+            groupby = args[2] if len(args) > 2 else kwargs.get("groupby", [])
+            groupby = [groupby] if isinstance(groupby, str) else list(groupby)
+            return data.read_group(model, domain, fields, groupby, kwargs.get("offset", 0), kwargs.get("limit"))
+        if method == "read":
+            return data.read(model, args[0], kwargs.get("fields") or (args[1] if len(args) > 1 else None))
+        if method == "write":
+            return data.write(model, args[0], args[1])
+        if method == "create":
+            values = args[0]
+            if isinstance(values, list):
+                return [data.create(model, v) for v in values]
+            return data.create(model, values)
+        if method == "unlink":
+            return data.unlink(model, args[0])
+        if method == "action_done":
+            return data.write(model, args[0], {"state": "done"})
+        raise xmlrpc.client.Fault(1, f"Method {method} not supported by fake server")
+
+    def dispatch(self, service, method, args):
+        with self._stats_lock:
+            self.stats["requests"] += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if service == "common":
+            return self.common(method, args)
+        if service == "object" and method == "execute_kw":
+            return self.execute_kw(*args)
+        if service == "object" and method == "execute":
+            db, uid, password, model, meth = args[:5]
+            return self.execute_kw(db, uid, password, model, meth, list(args[5:]), {})
+        raise xmlrpc.client.Fault(1, f"Unknown service {service}.{method}")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    fake = None  # set on the subclass created by FakeOdooServer
+
+    def setup(self):
+        super().setup()
+        # Headers and body go out as separate writes; avoid Nagle/delayed-ACK stalls
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def log_message(self, fmt, *args):
+        pass
+
+    def _send(self, status, body, content_type, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+        with self.fake._stats_lock:
+            self.fake.stats["bytes_out"] += len(body)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        payload = self.rfile.read(length)
+        if self.path.startswith("/xmlrpc/2/"):
+            service = self.path.rsplit("/", 1)[-1]
+            try:
+                params, method = xmlrpc.client.loads(payload, use_builtin_types=True)
+                result = self.fake.dispatch(service, method, params)
+                body = xmlrpc.client.dumps((result,), methodresponse=True, allow_none=True)
+            except xmlrpc.client.Fault as fault:
+                body = xmlrpc.client.dumps(fault, methodresponse=True, allow_none=True)
+            except Exception as e:
+                body = xmlrpc.client.dumps(xmlrpc.client.Fault(1, str(e)), methodresponse=True, allow_none=True)
+            self._send(200, body.encode("utf-8"), "text/xml")
+        elif self.path == "/jsonrpc":
+            request = json.loads(payload or b"{}")
+            params = request.get("params", {})
+            response = {"jsonrpc": "2.0", "id": request.get("id")}
+            try:
+                response["result"] = self.fake.dispatch(params.get("service"), params.get("method"), params.get("args", []))
+            except xmlrpc.client.Fault as fault:
+                response["error"] = {"code": 200, "message": fault.faultString, "data": {"name": "odoo.exceptions.UserError"}}
+            self._send(200, json.dumps(response).encode("utf-8"), "application/json")
+        elif self.path == "/web/session/authenticate":
+            params = json.loads(payload or b"{}").get("params", {})
+            response = {"jsonrpc": "2.0", "id": None}
+            headers = {}
+            if params.get("db") == FAKE_DB and params.get("login") == FAKE_LOGIN:
+                session_id = os.urandom(16).hex()
+                self.fake.web_sessions.add(session_id)
+                response["result"] = {"uid": FAKE_UID, "db": FAKE_DB}
+                headers["Set-Cookie"] = f"session_id={session_id}; HttpOnly; Path=/"
+            else:
+                response["error"] = {"code": 200, "message": "Access Denied"}
+            self._send(200, json.dumps(response).encode("utf-8"), "application/json", headers)
+        else:
+            self._send(404, b"Not Found", "text/plain")
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        if not path.startswith("/web/content/"):
+            self._send(404, b"Not Found", "text/plain")
+            return
+        cookie = self.headers.get("Cookie", "")
+        session_id = cookie.split("session_id=", 1)[1].split(";", 1)[0] if "session_id=" in cookie else ""
+        if session_id not in self.fake.web_sessions:
+            self._send(303, b"", "text/html", {"Location": "/web/login"})
+            return
+        try:
+            rec_id = int(path.rsplit("/", 1)[-1])
+        except ValueError:
+            rec_id = 0
+        data = self.fake.dataset
+        with data.lock:
+            rec = data.models["ir.attachment"].get(rec_id)
+            blob = data.blobs.get(rec_id) if rec else None
+        if blob is None:
+            self._send(404, b"Not Found", "text/plain")
+            return
+        with self.fake._stats_lock:
+            self.fake.stats["requests"] += 1
+        self._send(200, blob, rec.get("mimetype") or "application/octet-stream",
+                   {"Content-Disposition": f'attachment; filename="{rec.get("name")}"'})
+
+
+class FakeOdooServer:
+    """
+    Threaded HTTP server wrapping FakeOdoo.
+
+    Args:
+        records (int): Number of project.task records; other models scale from it
+        latency (float): Seconds of artificial latency per request
+        error_rate (float): Probability (0..1) of a simulated Fault per object call
+        seed (int): Random seed for deterministic datasets
+        host (str): Bind address
+        port (int): Bind port, 0 for an ephemeral port
+
+    Example:
+        with FakeOdooServer(records=2000) as server:
+            client = OdooClient(server.url, FAKE_DB, FAKE_LOGIN, "x")
+    """
+
+    def __init__(self, records=1000, latency=0.0, error_rate=0.0, seed=1,
+                 host="127.0.0.1", port=0, text_size=200, attachment_size=2048):
+        self.dataset = FakeOdooDataset(records, seed, text_size, attachment_size)
+        self.fake = FakeOdoo(self.dataset, latency, error_rate, seed)
+        handler = type("FakeOdooHandler", (_Handler,), {"fake": self.fake})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def stats(self):
+        return dict(self.fake.stats)
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a fake Odoo XML-RPC/JSON-RPC server")
+    parser.add_argument("--records", type=int, default=1000, help="project.task records (others scale)")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="artificial latency per request")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="probability of a simulated Fault")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8069)
+    args = parser.parse_args()
+
+    server = FakeOdooServer(args.records, args.latency_ms / 1000.0, args.error_rate,
+                            args.seed, args.host, args.port)
+    counts = ", ".join(f"{m}={c}" for m, c in sorted(server.dataset.counts.items()) if m in MODEL_FIELDS)
+    print(f"Fake Odoo listening on {server.url} (db={FAKE_DB}, login={FAKE_LOGIN}, any password)")
+    print(f"Records: {counts}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,396 @@
+# -*- coding: utf-8 -*-
+# MIT License
+#
+# Copyright (c) 2025 CIT-Services
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+asyncio counterpart of OdooClient.
+
+AsyncOdooClient speaks XML-RPC over a small HTTP/1.1 keep-alive connection
+pool built on asyncio streams (no extra dependencies). Requests to one host
+are bounded by a semaphore, so many calls can be in flight from a single
+thread without opening a connection per request.
+
+Authentication shares odoo_client's uid cache: a client created for an
+account that OdooClient already logged into does not authenticate again.
+
+fetch_models_concurrently() is the async version of the from-Odoo fetch
+phase. It runs fields_get and search_read for several models at once, and
+sync_from_odoo.sync_all_from_odoo() then upserts the prefetched records
+as usual.
+"""
+
+import asyncio
+import hashlib
+import logging
+import ssl
+import time
+import xmlrpc.client
+from urllib.parse import urlparse
+
+import odoo_client
+from odoo_client import DEFAULT_TIMEOUT, _is_access_denied
+from sync_metrics import record_transfer
+
+log = logging.getLogger("odoo_sync")
+
+# Concurrent requests per host
+DEFAULT_MAX_CONCURRENCY = 4
+
+# Records per read() call in iter_search_read()
+DEFAULT_PAGE_SIZE = 500
+
+
+class _PooledConnection:
+    __slots__ = ("reader", "writer")
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    def close(self):
+        try:
+            self.writer.close()
+        except Exception:
+            pass
+
+
+class AsyncHTTPPool:
+    """
+    Minimal HTTP/1.1 client with keep-alive connections to a single host.
+
+    Args:
+        url (str): Base URL (scheme, host and port are used)
+        max_connections (int): Upper bound on concurrent requests/connections
+        timeout (float): Seconds allowed for one request, including connect
+    """
+
+    def __init__(self, url, max_connections=DEFAULT_MAX_CONCURRENCY, timeout=DEFAULT_TIMEOUT):
+        parsed = urlparse(url)
+        self.https = parsed.scheme != "http"
+        self.host = parsed.hostname
+        self.port = parsed.port or (443 if self.https else 80)
+        self.host_header = parsed.netloc
+        self.timeout = timeout
+        self._ssl = ssl.create_default_context() if self.https else None
+        self._idle = []
+        self._semaphore = asyncio.Semaphore(max_connections)
+
+    async def _connect(self):
+        reader, writer = await asyncio.open_connection(
+            self.host, self.port, ssl=self._ssl,
+            server_hostname=self.host if self.https else None,
+        )
+        return _PooledConnection(reader, writer)
+
+    async def _read_response(self, reader):
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("Connection closed by server")
+        parts = status_line.decode("latin-1").split(" ", 2)
+        version, status = parts[0], int(parts[1])
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b";", 1)[0].strip(), 16)
+                if size == 0:
+                    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readline()
+            body = b"".join(chunks)
+            reusable = True
+        elif "content-length" in headers:
+            body = await reader.readexactly(int(headers["content-length"]))
+            reusable = True
+        else:
+            body = await reader.read()
+            reusable = False
+
+        if version == "HTTP/1.0" or headers.get("connection", "").lower() == "close":
+            reusable = False
+        return status, headers, body, reusable
+
+    async def _roundtrip(self, conn, method, path, body, headers):
+        head = [f"{method} {path} HTTP/1.1", f"Host: {self.host_header}",
+                f"Content-Length: {len(body)}", "Connection: keep-alive", "Accept-Encoding: identity"]
+        head += [f"{name}: {value}" for name, value in headers.items()]
+        conn.writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+        await conn.writer.drain()
+        return await self._read_response(conn.reader)
+
+    async def request(self, method, path, body=b"", headers=None):
+        """
+        Send one request, reusing an idle connection when possible.
+
+        Returns:
+            tuple: (status, headers dict with lower-case names, body bytes)
+        """
+        headers = headers or {}
+        async with self._semaphore:
+            conn = self._idle.pop() if self._idle else None
+            reused = conn is not None
+            try:
+                if conn is None:
+                    conn = await asyncio.wait_for(self._connect(), self.timeout)
+                try:
+                    status, resp_headers, data, reusable = await asyncio.wait_for(
+                        self._roundtrip(conn, method, path, body, headers), self.timeout
+                    )
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    if not reused:
+                        raise
+                    # The server dropped an idle keep-alive connection; retry on a fresh one
+                    conn.close()
+                    conn = await asyncio.wait_for(self._connect(), self.timeout)
+                    status, resp_headers, data, reusable = await asyncio.wait_for(
+                        self._roundtrip(conn, method, path, body, headers), self.timeout
+                    )
+            except BaseException:
+                if conn is not None:
+                    conn.close()
+                raise
+            if reusable:
+                self._idle.append(conn)
+            else:
+                conn.close()
+            return status, resp_headers, data
+
+    async def close(self):
+        idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+            try:
+                await conn.writer.wait_closed()
+            except Exception:
+                pass
+
+
+class AsyncOdooClient:
+    """
+    asyncio client for the Odoo XML-RPC API.
+
+    Args:
+        url (str): Base URL of the Odoo instance
+        db (str): Database name
+        username (str): Login
+        password (str): Password or API key
+        max_concurrency (int): Requests in flight at once for this client
+
+    Example:
+        async with AsyncOdooClient(url, db, user, key) as client:
+            tasks = await client.search_read("project.task", [], ["name"])
+    """
+
+    def __init__(self, url, db, username, password, max_concurrency=DEFAULT_MAX_CONCURRENCY,
+                 timeout=DEFAULT_TIMEOUT):
+        self.url = (url or "").strip().rstrip("/")
+        if "://" not in self.url:
+            self.url = f"https://{self.url}"
+        self.db = db
+        self.username = username
+        self.password = password
+        self.uid = None
+        self._session_key = (
+            self.url, db, username,
+            hashlib.sha256((password or "").encode("utf-8")).hexdigest(),
+        )
+        session = odoo_client._session_cache.get(self._session_key)
+        if session is not None:
+            self.url = session["url"]
+            self.uid = session["uid"]
+        self._pool = AsyncHTTPPool(self.url, max_concurrency, timeout)
+        # Servers behind a reverse proxy may live under a sub-path (https://host/odoo)
+        self._base_path = urlparse(self.url).path.rstrip("/")
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def _rpc(self, service, method, params):
+        body = xmlrpc.client.dumps(tuple(params), method, allow_none=True).encode("utf-8")
+        start = time.perf_counter()
+        status, _, data = await self._pool.request(
+            "POST", f"{self._base_path}/xmlrpc/2/{service}", body, {"Content-Type": "text/xml"}
+        )
+        network = time.perf_counter() - start
+        if status != 200:
+            raise xmlrpc.client.ProtocolError(f"{self.url}/xmlrpc/2/{service}", status, "", {})
+        start = time.perf_counter()
+        try:
+            result = xmlrpc.client.loads(data)[0][0]
+        finally:
+            record_transfer(bytes_in=len(data), bytes_out=len(body), network=network,
+                            parse=time.perf_counter() - start)
+        return result
+
+    async def connect(self):
+        """Authenticate unless a cached uid is available. Returns the uid."""
+        if self.uid is None:
+            await self.reauthenticate()
+        return self.uid
+
+    async def reauthenticate(self):
+        """Log in again and refresh the shared uid cache."""
+        with odoo_client._session_lock:
+            odoo_client._session_cache.pop(self._session_key, None)
+        uid = await self._rpc("common", "authenticate", (self.db, self.username, self.password, {}))
+        if not uid:
+            raise ConnectionError(
+                f"Login failed: authentication failed for user '{self.username}' on database '{self.db}'"
+            )
+        self.uid = uid
+        with odoo_client._session_lock:
+            odoo_client._session_cache[self._session_key] = {"uid": uid, "url": self.url, "version": None}
+        return uid
+
+    async def call(self, model, method, args=None, kwargs=None):
+        """
+        Call a model method, re-authenticating once on AccessDenied.
+
+        Returns:
+            Any: The method's result
+        """
+        await self.connect()
+        params = [self.db, self.uid, self.password, model, method, args or [], kwargs or {}]
+        try:
+            return await self._rpc("object", "execute_kw", params)
+        except xmlrpc.client.Fault as fault:
+            if not _is_access_denied(fault):
+                raise
+            params[1] = await self.reauthenticate()
+            return await self._rpc("object", "execute_kw", params)
+
+    async def fields_get(self, model):
+        """Return {field: type} for a model, like sync_from_odoo.get_model_field_info."""
+        fields = await self.call(model, "fields_get", [], {"attributes": ["string", "type"]})
+        return {name: attrs.get("type") for name, attrs in fields.items()}
+
+    async def search_read(self, model, domain=None, fields=None, offset=0, limit=None, order=None):
+        kwargs = {"fields": fields or []}
+        if offset:
+            kwargs["offset"] = offset
+        if limit:
+            kwargs["limit"] = limit
+        if order:
+            kwargs["order"] = order
+        return await self.call(model, "search_read", [domain or []], kwargs)
+
+    async def iter_search_read(self, model, domain=None, fields=None, page_size=DEFAULT_PAGE_SIZE):
+        """
+        Yield records page by page.
+
+        Ids are searched first; pages are then read concurrently (bounded by
+        the pool) and yielded in id order.
+        """
+        ids = await self.call(model, "search", [domain or []], {"order": "id"})
+        pages = [ids[i:i + page_size] for i in range(0, len(ids), page_size)]
+        reads = [asyncio.ensure_future(self.call(model, "read", [page], {"fields": fields or []}))
+                 for page in pages]
+        try:
+            for future in reads:
+                for record in await future:
+                    yield record
+        finally:
+            for future in reads:
+                future.cancel()
+
+    async def close(self):
+        await self._pool.close()
+
+
+async def fetch_models_concurrently(client, model_names, config_path="field_config.json"):
+    """
+    Async from-Odoo fetch phase: fields_get + search_read for many models at once.
+
+    Applies the same field validation and sync_domains.json scoping as
+    sync_model(). Models with a built-in scope (sync_from_odoo.MODEL_SCOPES)
+    depend on rows upserted earlier in the run and are left out.
+
+    Args:
+        client (AsyncOdooClient): Connected client
+        model_names (iterable): Odoo models to fetch
+        config_path (str): Path to the field configuration JSON file
+
+    Returns:
+        dict: model -> (field_info, records); models whose fetch failed are
+              omitted so the caller can fall back to a regular sync_model()
+    """
+    from sync_domains import ScopeContext, resolve_sync_domain
+    from sync_from_odoo import MODEL_SCOPES, prepare_field_mapping
+
+    await client.connect()
+    users = await client.call("res.users", "read", [[client.uid]], {"fields": ["partner_id"]})
+    partner = users[0].get("partner_id") if users else False
+    context = ScopeContext(client, partner_id=partner[0] if partner else False)
+
+    async def fetch_one(model):
+        field_info = await client.fields_get(model)
+        field_map = prepare_field_mapping(None, model, config_path, field_info)
+        fields = list(field_map.keys())
+        if not fields:
+            return model, None
+        if "id" not in fields:
+            fields.append("id")
+        if "write_date" in field_info and "write_date" not in fields:
+            fields.append("write_date")
+        domain = resolve_sync_domain(client, model, field_info, context) or []
+        records = await client.search_read(model, domain, fields)
+        return model, (field_info, records)
+
+    models = [m for m in model_names if m not in MODEL_SCOPES]
+    results = await asyncio.gather(*(fetch_one(m) for m in models), return_exceptions=True)
+
+    prefetched = {}
+    for model, outcome in zip(models, results):
+        if isinstance(outcome, BaseException):
+            log.warning(f"[FETCH] Concurrent fetch of '{model}' failed, will fetch it sequentially: {outcome}")
+            continue
+        if outcome[1] is not None:
+            prefetched[model] = outcome[1]
+    return prefetched
+
+
+def prefetch_models(url, db, username, password, model_names, config_path="field_config.json",
+                    max_concurrency=DEFAULT_MAX_CONCURRENCY):
+    """
+    Blocking wrapper around fetch_models_concurrently() for sync callers.
+
+    Runs a private event loop on the calling thread (e.g. a daemon sync
+    thread), so it must not be called from a running loop.
+    """
+    async def run():
+        async with AsyncOdooClient(url, db, username, password, max_concurrency) as client:
+            return await fetch_models_concurrently(client, model_names, config_path)
+
+    return asyncio.run(run())
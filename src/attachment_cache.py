@@ -0,0 +1,236 @@
+# -*- coding: utf-8 -*-
+# MIT License
+#
+# Copyright (c) 2025 CIT-Services
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Content-addressed cache for downloaded attachments.
+
+Files are stored under ~/.local/share/ubtms/cache/attachments/<ab>/<checksum>/
+keyed by the SHA1 ``checksum`` Odoo computes for every ir.attachment (and
+which is synced into ir_attachment_app). The original file name is kept
+inside the checksum directory so opened files still have a sensible name and
+extension. Two attachments with the same content share one file, whatever
+their names.
+
+The index lives in the attachment_cache_index table. The QML-owned
+dl_cache_app table is not used: it holds base64 inline and is purged at
+every app start. When the cache grows past the configured budget
+(app setting "attachment_cache_size_mb") the least recently opened entries
+are removed.
+"""
+
+import logging
+import os
+import re
+import shutil
+import threading
+import time
+from pathlib import Path
+
+from common import safe_sql_execute
+from config import get_setting
+from schema_manager import ensure_schema
+
+log = logging.getLogger("odoo_sync")
+
+CACHE_ROOT = Path.home() / ".local/share" / "ubtms" / "cache" / "attachments"
+
+# Used when the app setting is missing or invalid
+DEFAULT_BUDGET_MB = 500
+
+_SHA1_RE = re.compile(r"^[0-9a-f]{40}$")
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def _safe_file_name(name):
+    name = (name or "attachment").strip().replace("/", "_").replace("\\", "_")
+    return name.lstrip(".") or "attachment"
+
+
+class AttachmentCache:
+    """
+    Size-bounded, checksum-keyed attachment store.
+
+    Args:
+        db_path (str): App SQLite database holding the index
+        root (Path): Cache directory, defaults to CACHE_ROOT
+    """
+
+    def __init__(self, db_path, root=None):
+        self.db_path = db_path
+        self.root = Path(root or CACHE_ROOT)
+        ensure_schema(db_path)
+
+    @staticmethod
+    def is_valid_checksum(checksum):
+        return bool(checksum) and bool(_SHA1_RE.match(str(checksum)))
+
+    def budget_bytes(self):
+        try:
+            mb = float(get_setting(self.db_path, "attachment_cache_size_mb", str(DEFAULT_BUDGET_MB)))
+        except (TypeError, ValueError):
+            mb = DEFAULT_BUDGET_MB
+        return int(max(mb, 0) * 1024 * 1024)
+
+    def _bump(self, name, amount=1):
+        safe_sql_execute(
+            self.db_path,
+            "INSERT INTO attachment_cache_stats (name, value) VALUES (?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+            (name, amount),
+        )
+
+    def path_for(self, checksum, name):
+        """Return the path a download with this checksum should be written to."""
+        return self.root / checksum[:2] / checksum / _safe_file_name(name)
+
+    def lookup(self, checksum):
+        """
+        Return the cached file path for a checksum and mark it as used.
+
+        Returns:
+            str: Absolute path, or None on a miss (also when the file vanished)
+        """
+        if not self.is_valid_checksum(checksum):
+            return None
+        rows = safe_sql_execute(
+            self.db_path,
+            "SELECT path, size FROM attachment_cache_index WHERE checksum = ?",
+            (checksum,),
+            fetch=True,
+            commit=False,
+        )
+        if rows:
+            path, size = rows[0]
+            try:
+                if os.path.getsize(path) == size:
+                    safe_sql_execute(
+                        self.db_path,
+                        "UPDATE attachment_cache_index SET last_access = ?, hits = hits + 1 WHERE checksum = ?",
+                        (time.time(), checksum),
+                    )
+                    self._bump("hits")
+                    self._bump("bytes_saved", size)
+                    return path
+            except OSError:
+                pass
+            # Removed or truncated behind our back
+            self._remove(checksum, path)
+        self._bump("misses")
+        return None
+
+    def add(self, checksum, path, mimetype=""):
+        """
+        Register a file that was written to path_for(checksum, ...) and
+        evict older entries if the budget is exceeded.
+        """
+        if not self.is_valid_checksum(checksum):
+            return
+        size = os.path.getsize(path)
+        now = time.time()
+        safe_sql_execute(
+            self.db_path,
+            "INSERT OR REPLACE INTO attachment_cache_index "
+            "(checksum, path, size, mimetype, created_at, last_access, hits) VALUES (?, ?, ?, ?, ?, ?, 0)",
+            (checksum, str(path), size, mimetype or "", now, now),
+        )
+        self.evict(keep=checksum)
+
+    def _remove(self, checksum, path):
+        safe_sql_execute(self.db_path, "DELETE FROM attachment_cache_index WHERE checksum = ?", (checksum,))
+        shutil.rmtree(Path(path).parent, ignore_errors=True)
+
+    def evict(self, budget=None, keep=None):
+        """
+        Remove least recently used entries until the cache fits the budget.
+
+        Args:
+            budget (int): Bytes to fit in, defaults to the app setting
+            keep (str): Checksum never to evict (the entry just added)
+
+        Returns:
+            int: Number of entries removed
+        """
+        budget = self.budget_bytes() if budget is None else budget
+        rows = safe_sql_execute(
+            self.db_path,
+            "SELECT checksum, path, size FROM attachment_cache_index ORDER BY last_access ASC",
+            fetch=True,
+            commit=False,
+        ) or []
+        total = sum(size for _, _, size in rows)
+        removed = 0
+        for checksum, path, size in rows:
+            if total <= budget:
+                break
+            if checksum == keep:
+                continue
+            self._remove(checksum, path)
+            total -= size
+            removed += 1
+        if removed:
+            self._bump("evictions", removed)
+            log.info(f"[ATTACHMENT] Evicted {removed} cached attachment(s), cache now {total // 1024} KiB")
+        return removed
+
+    def stats(self):
+        """Return entry count, bytes used, budget and hit/miss counters."""
+        count, used = safe_sql_execute(
+            self.db_path,
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM attachment_cache_index",
+            fetch=True,
+            commit=False,
+        )[0]
+        counters = dict(safe_sql_execute(
+            self.db_path,
+            "SELECT name, value FROM attachment_cache_stats",
+            fetch=True,
+            commit=False,
+        ) or [])
+        hits, misses = counters.get("hits", 0), counters.get("misses", 0)
+        return {
+            "entries": count,
+            "bytes": used,
+            "budget_bytes": self.budget_bytes(),
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / (hits + misses), 3) if hits + misses else 0.0,
+            "evictions": counters.get("evictions", 0),
+            "bytes_saved": counters.get("bytes_saved", 0),
+        }
+
+    def clear(self):
+        """Remove every cached file, the index and the counters."""
+        safe_sql_execute(self.db_path, "DELETE FROM attachment_cache_index")
+        safe_sql_execute(self.db_path, "DELETE FROM attachment_cache_stats")
+        shutil.rmtree(self.root, ignore_errors=True)
+
+
+def get_attachment_cache(db_path):
+    """Return the shared AttachmentCache for a database."""
+    with _caches_lock:
+        cache = _caches.get(db_path)
+        if cache is None:
+            cache = _caches[db_path] = AttachmentCache(db_path)
+        return cache
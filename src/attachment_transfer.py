@@ -0,0 +1,574 @@
+# -*- coding: utf-8 -*-
+# MIT License
+#
+# Copyright (c) 2025 CIT-Services
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Streaming transfer of ir.attachment content.
+
+OdooClient.ondemanddownload() returns the whole attachment as one base64
+string inside an XML-RPC response, which costs several times the file size
+in memory. The helpers here write the content to disk in fixed size chunks
+instead:
+
+1. GET /web/content/<id> with a web session, when the credentials can open
+   one (API keys usually cannot).
+2. Otherwise a raw XML-RPC ``read`` of ``datas`` whose response is parsed
+   with expat as it arrives, base64-decoding the field incrementally.
+
+Either way the bytes go to a temporary file next to the destination, are
+checked against the attachment's SHA1 ``checksum`` and only then renamed
+into place, so a half-written file is never visible under the real name.
+
+Uploads go the other way: stream_upload_attachment() base64-encodes the file
+while writing the XML-RPC ``create`` request to the socket.
+"""
+
+import base64
+import hashlib
+import http.client
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import xmlrpc.client
+from urllib.parse import urlparse
+from xml.parsers import expat
+
+from odoo_client import _is_access_denied
+from sync_metrics import record_transfer
+
+log = logging.getLogger("odoo_sync")
+
+# Bytes read from the socket per iteration
+CHUNK_SIZE = 64 * 1024
+
+# Minimum seconds between two progress callbacks
+PROGRESS_INTERVAL = 0.25
+
+# Web session ids per (url, db, login); False when the server refused a session
+_web_sessions = {}
+_web_sessions_lock = threading.Lock()
+
+
+class ChecksumMismatchError(ValueError):
+    """Raised when downloaded content does not match ir.attachment.checksum."""
+
+
+class Base64StreamDecoder:
+    """
+    Incremental base64 decoder.
+
+    Input may be split anywhere and may contain whitespace (XML-RPC wraps
+    base64 lines); only complete 4-character groups are decoded per feed().
+    """
+
+    def __init__(self):
+        self._pending = b""
+
+    def feed(self, data):
+        if isinstance(data, str):
+            data = data.encode("ascii")
+        data = self._pending + b"".join(data.split())
+        usable = len(data) - (len(data) % 4)
+        self._pending = data[usable:]
+        return base64.b64decode(data[:usable]) if usable else b""
+
+    def finish(self):
+        if self._pending:
+            raise ValueError("Truncated base64 data")
+        return b""
+
+
+class _FileSink:
+    """
+    Temporary file next to the destination that hashes what it receives.
+
+    Args:
+        dest_path (str): Final file path
+        total (int): Expected size in bytes for progress reporting, or 0
+        progress (callable): Called as progress(received, total), throttled
+    """
+
+    def __init__(self, dest_path, total=0, progress=None):
+        self.dest_path = str(dest_path)
+        self.total = total or 0
+        self.progress = progress
+        self.received = 0
+        self.sha1 = hashlib.sha1()
+        self._last_progress = 0.0
+        directory = os.path.dirname(self.dest_path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, self.tmp_path = tempfile.mkstemp(prefix=".dl-", suffix=".part", dir=directory)
+        self._file = os.fdopen(fd, "wb")
+
+    def write(self, data):
+        if not data:
+            return
+        self._file.write(data)
+        self.sha1.update(data)
+        self.received += len(data)
+        now = time.monotonic()
+        if self.progress and now - self._last_progress >= PROGRESS_INTERVAL:
+            self._last_progress = now
+            self.progress(self.received, self.total)
+
+    def reset(self):
+        """Drop anything written so far (used before switching transfer method)."""
+        self._file.seek(0)
+        self._file.truncate()
+        self.sha1 = hashlib.sha1()
+        self.received = 0
+
+    def commit(self, expected_checksum=None):
+        """
+        Verify the checksum and atomically move the file into place.
+
+        Returns:
+            str: SHA1 hex digest of the content
+
+        Raises:
+            ChecksumMismatchError: if expected_checksum is given and differs
+        """
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        digest = self.sha1.hexdigest()
+        if expected_checksum and digest != expected_checksum:
+            self.abort()
+            raise ChecksumMismatchError(
+                f"Checksum mismatch: expected {expected_checksum}, got {digest}"
+            )
+        os.replace(self.tmp_path, self.dest_path)
+        if self.progress:
+            self.progress(self.received, self.total or self.received)
+        return digest
+
+    def abort(self):
+        try:
+            self._file.close()
+        except Exception:
+            pass
+        try:
+            os.unlink(self.tmp_path)
+        except FileNotFoundError:
+            pass
+
+
+class _DatasResponseParser:
+    """
+    Streams the ``datas`` member of an XML-RPC ``read`` response into a sink.
+
+    Everything else in the response is ignored. Faults are buffered (they are
+    small) and re-raised as xmlrpc.client.Fault by close(). Odoo returns
+    ``datas`` as False (``<boolean>0</boolean>``) for an attachment without
+    content; that value is not decoded and ``found`` stays False.
+    """
+
+    def __init__(self, sink):
+        self.sink = sink
+        self.found = False
+        self._decoders = []
+        self._name_parts = None
+        self._member_name = None
+        self._capturing = False
+        self._raw = []  # kept until we know this is not a fault
+        self._parser = expat.ParserCreate()
+        self._parser.StartElementHandler = self._start
+        self._parser.EndElementHandler = self._end
+        self._parser.CharacterDataHandler = self._chars
+        self._parser.buffer_text = False
+
+    def _start(self, tag, attrs):
+        if tag == "params":
+            self._raw = None
+        elif tag == "name":
+            self._name_parts = []
+        elif tag == "value" and self._member_name == "datas" and not self._capturing:
+            self._capturing = True
+            self._decoders = [Base64StreamDecoder()]
+        elif tag == "base64" and self._capturing:
+            # Binary marshalled as <base64>: one more layer of encoding
+            self._decoders.insert(0, Base64StreamDecoder())
+        elif tag in ("boolean", "nil") and self._capturing:
+            # No content: there is nothing to decode
+            self._capturing = False
+            self._member_name = None
+
+    def _end(self, tag):
+        if tag == "name" and self._name_parts is not None:
+            self._member_name = "".join(self._name_parts)
+            self._name_parts = None
+        elif tag == "value" and self._capturing:
+            self._capturing = False
+            self._member_name = None
+            data = b""
+            for decoder in self._decoders:
+                data = decoder.feed(data) + decoder.finish()
+            self.sink.write(data)
+        elif tag == "member":
+            self._member_name = None
+
+    def _chars(self, text):
+        if self._name_parts is not None:
+            self._name_parts.append(text)
+        elif self._capturing and text.strip():
+            self.found = True
+            data = text
+            for decoder in self._decoders:
+                data = decoder.feed(data)
+            self.sink.write(data)
+
+    def feed(self, chunk):
+        if self._raw is not None:
+            self._raw.append(chunk)
+        self._parser.Parse(chunk, False)
+
+    def close(self):
+        self._parser.Parse(b"", True)
+        if self._raw is not None:
+            # No <params>: a fault (or garbage); let xmlrpc.client raise it
+            xmlrpc.client.loads(b"".join(self._raw))
+
+
+def _connection(client):
+    """Open an http.client connection using the client's XML-RPC transport settings."""
+    transport = client._create_transport()
+    return transport.make_connection(urlparse(client.url).netloc)
+
+
+def _server_path(client, path):
+    """Prefix a request path with the base path of the server URL (e.g. https://host/odoo)."""
+    return urlparse(client.url).path.rstrip("/") + path
+
+
+def _web_session_key(client):
+    return (client.url, client.db, client.username)
+
+
+def _open_web_session(client):
+    """
+    Authenticate a web session for /web/content.
+
+    Returns:
+        str: session_id cookie value, or None when the server refuses
+    """
+    key = _web_session_key(client)
+    with _web_sessions_lock:
+        if key in _web_sessions:
+            return _web_sessions[key] or None
+
+    session_id = None
+    body = json.dumps({
+        "jsonrpc": "2.0",
+        "method": "call",
+        "params": {"db": client.db, "login": client.username, "password": client.password},
+    }).encode("utf-8")
+    conn = _connection(client)
+    try:
+        conn.request("POST", _server_path(client, "/web/session/authenticate"), body, {"Content-Type": "application/json"})
+        response = conn.getresponse()
+        payload = json.loads(response.read() or b"{}")
+        if response.status == 200 and (payload.get("result") or {}).get("uid"):
+            for header, value in response.getheaders():
+                if header.lower() == "set-cookie" and value.startswith("session_id="):
+                    session_id = value.split(";", 1)[0].split("=", 1)[1]
+                    break
+    except Exception as e:
+        log.debug(f"[ATTACHMENT] Web session not available: {e}")
+    finally:
+        conn.close()
+
+    with _web_sessions_lock:
+        _web_sessions[key] = session_id or False
+    return session_id
+
+
+def _forget_web_session(client):
+    with _web_sessions_lock:
+        _web_sessions.pop(_web_session_key(client), None)
+
+
+def _download_via_web(client, record_id, sink):
+    """Stream /web/content/<id> into sink. Returns False if the route is unusable."""
+    session_id = _open_web_session(client)
+    if not session_id:
+        return False
+
+    conn = _connection(client)
+    try:
+        conn.request("GET", _server_path(client, f"/web/content/{int(record_id)}?download=true"),
+                     headers={"Cookie": f"session_id={session_id}"})
+        response = conn.getresponse()
+        if response.status != 200:
+            # Expired session redirects to /web/login; retry the login next time
+            response.read()
+            if response.status in (301, 302, 303, 307, 308, 401, 403):
+                _forget_web_session(client)
+            log.debug(f"[ATTACHMENT] /web/content/{record_id} returned {response.status}")
+            return False
+        received = 0
+        while True:
+            chunk = response.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            received += len(chunk)
+            sink.write(chunk)
+        record_transfer(bytes_in=received)
+        return True
+    finally:
+        conn.close()
+
+
+def _download_via_xmlrpc(client, record_id, sink):
+    """Stream the ``datas`` field of a raw XML-RPC read into sink."""
+    request_body = xmlrpc.client.dumps(
+        (client.db, client.uid, client.password, "ir.attachment", "read",
+         [[int(record_id)]], {"fields": ["datas"], "context": {"bin_size": False}}),
+        "execute_kw",
+        allow_none=True,
+    ).encode("utf-8")
+
+    parser = _DatasResponseParser(sink)
+    conn = _connection(client)
+    try:
+        conn.request("POST", _server_path(client, "/xmlrpc/2/object"), request_body, {"Content-Type": "text/xml"})
+        response = conn.getresponse()
+        if response.status != 200:
+            raise xmlrpc.client.ProtocolError(
+                client.url + "/xmlrpc/2/object", response.status, response.reason, response.getheaders()
+            )
+        received = 0
+        while True:
+            chunk = response.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            received += len(chunk)
+            parser.feed(chunk)
+        parser.close()
+        record_transfer(bytes_in=received, bytes_out=len(request_body))
+    finally:
+        conn.close()
+
+    if not parser.found:
+        raise ValueError(f"Attachment {record_id} has no binary data")
+
+
+def stream_download_attachment(client, record_id, dest_path, expected_checksum=None,
+                               expected_size=0, progress=None, use_web=True):
+    """
+    Download a binary ir.attachment straight to a file.
+
+    Args:
+        client (OdooClient): Authenticated client
+        record_id (int): ir.attachment id on the server
+        dest_path (str): Final file path; replaced atomically on success
+        expected_checksum (str): SHA1 from ir_attachment_app.checksum, if known
+        expected_size (int): file_size for progress reporting, if known
+        progress (callable): progress(received_bytes, total_bytes)
+        use_web (bool): Try /web/content before the XML-RPC fallback
+
+    Returns:
+        dict: {"path": str, "size": int, "checksum": str, "method": "web"|"xmlrpc"}
+
+    Raises:
+        ChecksumMismatchError: content does not match expected_checksum
+        ValueError: attachment has no binary data
+        xmlrpc.client.Fault / OSError: transport errors
+    """
+    sink = _FileSink(dest_path, expected_size, progress)
+    method = "xmlrpc"
+    try:
+        if use_web:
+            try:
+                if _download_via_web(client, record_id, sink):
+                    method = "web"
+            except (OSError, ValueError) as e:
+                log.debug(f"[ATTACHMENT] /web/content failed for {record_id}, using XML-RPC: {e}")
+            if method != "web":
+                sink.reset()
+        if method == "xmlrpc":
+            try:
+                _download_via_xmlrpc(client, record_id, sink)
+            except xmlrpc.client.Fault as fault:
+                # Cached uid went stale: log in again and retry once
+                if not _is_access_denied(fault):
+                    raise
+                client.reauthenticate()
+                sink.reset()
+                _download_via_xmlrpc(client, record_id, sink)
+        checksum = sink.commit(expected_checksum)
+    except BaseException:
+        sink.abort()
+        raise
+
+    log.info(f"[ATTACHMENT] Downloaded attachment {record_id} ({sink.received} bytes via {method})")
+    return {"path": str(dest_path), "size": sink.received, "checksum": checksum, "method": method}
+
+
+# -- upload ----------------------------------------------------------------
+
+# Largest file attachment_upload accepts, unchanged from before streaming.
+# Streaming bounds memory on the device only: Odoo still parses the whole
+# base64 request (a third larger than the file) in one worker, and proxies
+# in front of it often cap request bodies, so the limit stays at 25 MB.
+MAX_UPLOAD_SIZE = 25 * 1024 * 1024
+
+# Raw bytes per base64 chunk; a multiple of 3 so chunks encode without padding
+UPLOAD_CHUNK_SIZE = 48 * 1024
+
+# Attempts for an upload interrupted by a connection error
+UPLOAD_RETRIES = 3
+
+_DATAS_PLACEHOLDER = "@@ubtms-datas@@"
+
+
+def file_sha1(filepath, chunk_size=CHUNK_SIZE):
+    """Return (size, sha1 hex digest) of a file, reading it in chunks."""
+    sha1 = hashlib.sha1()
+    size = 0
+    with open(filepath, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            sha1.update(chunk)
+            size += len(chunk)
+    return size, sha1.hexdigest()
+
+
+def _upload_once(client, filepath, size, vals, progress):
+    """Send one ir.attachment create whose datas is base64-encoded on the fly."""
+    values = dict(vals, datas=_DATAS_PLACEHOLDER)
+    request = xmlrpc.client.dumps(
+        (client.db, client.uid, client.password, "ir.attachment", "create", [values], {}),
+        "execute_kw",
+        allow_none=True,
+    ).encode("utf-8")
+    prefix, suffix = request.split(_DATAS_PLACEHOLDER.encode("ascii"), 1)
+    encoded_size = 4 * ((size + 2) // 3)
+
+    sent = 0
+    last_progress = 0.0
+    conn = _connection(client)
+    try:
+        conn.putrequest("POST", _server_path(client, "/xmlrpc/2/object"))
+        conn.putheader("Content-Type", "text/xml")
+        conn.putheader("Content-Length", str(len(prefix) + encoded_size + len(suffix)))
+        conn.endheaders()
+        conn.send(prefix)
+        with open(filepath, "rb") as f:
+            while True:
+                chunk = f.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                conn.send(base64.b64encode(chunk))
+                sent += len(chunk)
+                now = time.monotonic()
+                if progress and now - last_progress >= PROGRESS_INTERVAL:
+                    last_progress = now
+                    progress(sent, size)
+        conn.send(suffix)
+        if progress:
+            progress(sent, size)
+
+        response = conn.getresponse()
+        body = response.read()
+        if response.status != 200:
+            raise xmlrpc.client.ProtocolError(
+                client.url + "/xmlrpc/2/object", response.status, response.reason, response.getheaders()
+            )
+    finally:
+        conn.close()
+
+    record_transfer(bytes_in=len(body), bytes_out=len(prefix) + encoded_size + len(suffix))
+    (result,), _ = xmlrpc.client.loads(body)
+    return result[0] if isinstance(result, list) else result
+
+
+def _find_uploaded(client, vals, checksum):
+    """Return the id of an attachment matching vals and checksum, or None."""
+    domain = [
+        ("name", "=", vals.get("name")),
+        ("res_model", "=", vals.get("res_model")),
+        ("res_id", "=", vals.get("res_id")),
+        ("checksum", "=", checksum),
+    ]
+    ids = client.call("ir.attachment", "search", [domain], {"limit": 1, "order": "id desc"})
+    return ids[0] if ids else None
+
+
+def stream_upload_attachment(client, filepath, vals, progress=None, retries=UPLOAD_RETRIES):
+    """
+    Create an ir.attachment from a file without loading it into memory.
+
+    The XML-RPC request body is produced chunk by chunk: the file is read
+    UPLOAD_CHUNK_SIZE bytes at a time and base64-encoded as it is written to
+    the socket, with Content-Length computed up front.
+
+    XML-RPC has no partial upload, so a dropped connection is recovered by
+    first asking the server whether the attachment (same name, record and
+    checksum) was stored anyway, and otherwise sending it again.
+
+    Args:
+        client (OdooClient): Authenticated client
+        filepath (str): File to upload
+        vals (dict): ir.attachment values without ``datas``
+        progress (callable): progress(sent_bytes, total_bytes)
+        retries (int): Attempts after connection errors
+
+    Returns:
+        int: id of the created ir.attachment
+
+    Raises:
+        xmlrpc.client.Fault: the server rejected the attachment
+        OSError / http.client.HTTPException: connection kept failing
+    """
+    size, checksum = file_sha1(filepath)
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            attachment_id = _upload_once(client, filepath, size, vals, progress)
+            log.info(f"[ATTACHMENT] Uploaded {vals.get('name')} ({size} bytes) as attachment {attachment_id}")
+            return attachment_id
+        except xmlrpc.client.Fault as fault:
+            # Cached uid went stale: log in again and retry once
+            if not _is_access_denied(fault) or attempt > 1:
+                raise
+            client.reauthenticate()
+        except (OSError, http.client.HTTPException, xmlrpc.client.ProtocolError) as e:
+            log.warning(f"[ATTACHMENT] Upload of {vals.get('name')} interrupted (attempt {attempt}): {e}")
+            try:
+                existing = _find_uploaded(client, vals, checksum)
+            except Exception as lookup_error:
+                log.debug(f"[ATTACHMENT] Could not check for a stored copy: {lookup_error}")
+                existing = None
+            if existing:
+                log.info(f"[ATTACHMENT] Server already stored {vals.get('name')} as attachment {existing}")
+                if progress:
+                    progress(size, size)
+                return existing
+            if attempt >= retries:
+                raise
+            time.sleep(min(2 ** attempt, 10))
@@ -24,7 +24,7 @@
 
 from config import get_all_accounts, initialize_app_settings_db, update_last_synced_at, get_setting
 from odoo_client import OdooClient
-from sync_from_odoo import sync_all_from_odoo,sync_ondemand_tables_from_odoo
+from sync_from_odoo import sync_all_from_odoo, sync_single_record, delete_local_record
 from sync_to_odoo import sync_all_to_odoo
 from logger import setup_logger
 from bus import send
@@ -47,7 +47,24 @@ import platform
 import urllib3
 import json
 import xmlrpc.client
-from common import check_table_exists, write_sync_report_to_db
+from common import check_table_exists, write_sync_report_to_db, safe_sql_execute
+from attachment_cache import get_attachment_cache
+from timesheet_summary import get_timesheet_summary as _get_timesheet_summary
+from attachment_transfer import (
+    stream_download_attachment,
+    stream_upload_attachment,
+    ChecksumMismatchError,
+    MAX_UPLOAD_SIZE,
+)
+from sync_metrics import profile_sync, phase, get_sync_metrics
+from sync_coordinator import (
+    SyncJob,
+    get_sync_holder,
+    request_preempt,
+    wait_for_release,
+    ATTACH_TIMEOUT,
+    PREEMPT_TIMEOUT,
+)
 import threading
 import base64
 import mimetypes
@@ -374,6 +391,171 @@ def attachment_ondemand_download(settings_db, account_id, remote_record_id):
             "error": str(e),
         }
 
+def _local_attachment_info(settings_db, account_id, remote_record_id):
+    """Return name/mimetype/checksum/file_size/url of a synced ir_attachment_app row, or None."""
+    if not check_table_exists(settings_db, "ir_attachment_app"):
+        return None
+    rows = safe_sql_execute(
+        settings_db,
+        "SELECT name, mimetype, checksum, file_size, url FROM ir_attachment_app "
+        "WHERE account_id = ? AND odoo_record_id = ? LIMIT 1",
+        (account_id, remote_record_id),
+        fetch=True,
+        commit=False,
+    )
+    if not rows:
+        return None
+    name, mimetype, checksum, file_size, url = rows[0]
+    try:
+        file_size = int(file_size or 0)
+    except (TypeError, ValueError):
+        file_size = 0
+    return {
+        "name": name or "",
+        "mimetype": mimetype or "",
+        "checksum": checksum if checksum and checksum not in ("0", "False") else "",
+        "file_size": file_size,
+        "url": url if url and str(url).startswith(("http://", "https://")) else "",
+    }
+
+
+def attachment_download_to_file(settings_db, account_id, remote_record_id):
+    """
+    Download an attachment straight to the export directory.
+
+    Unlike attachment_ondemand_download() the content never passes through
+    QML or memory as base64: it is streamed to disk, verified against the
+    synced SHA1 checksum and renamed into place. Progress is reported with
+    the "ondemand_download_progress" event as {record_id, received, total}.
+
+    Attachments with a known checksum are kept in the attachment cache, so
+    opening one again returns the cached file without touching the network.
+
+    Returns:
+        dict: {"success": True, "type": "binary", "path", "name", "mimetype", "cached"},
+              {"success": True, "type": "url", "url"} or
+              {"success": False, "error"}
+    """
+    accounts = get_all_accounts(settings_db)
+    selected = next((acc for acc in accounts if acc.get("id") == account_id), None)
+    if not selected:
+        return {"success": False, "error": "Account not found"}
+
+    cache = get_attachment_cache(settings_db)
+    info = _local_attachment_info(settings_db, account_id, remote_record_id)
+    if info and not info["url"]:
+        cached = cache.lookup(info["checksum"])
+        if cached:
+            log.debug(f"[ATTACHMENT] Cache hit for attachment {remote_record_id}")
+            return {
+                "success": True,
+                "type": "binary",
+                "path": cached,
+                "name": info["name"] or os.path.basename(cached),
+                "mimetype": info["mimetype"],
+                "cached": True,
+            }
+
+    try:
+        client = OdooClient(
+            selected["link"],
+            selected["database"],
+            selected["username"],
+            selected["api_key"],
+        )
+        if info is None:
+            # Not synced yet: fetch the metadata only, never the content
+            recs = client.call(
+                "ir.attachment", "read", [[remote_record_id]],
+                {"fields": ["name", "mimetype", "type", "url", "checksum", "file_size"]},
+            )
+            if not recs:
+                return {"success": False, "error": "Attachment not found"}
+            rec = recs[0]
+            info = {
+                "name": rec.get("name") or "",
+                "mimetype": rec.get("mimetype") or "",
+                "checksum": rec.get("checksum") or "",
+                "file_size": rec.get("file_size") or 0,
+                "url": rec.get("url") if rec.get("type") == "url" else "",
+            }
+
+        if info["url"]:
+            return {"success": True, "type": "url", "url": info["url"]}
+
+        use_cache = cache.is_valid_checksum(info["checksum"])
+        if use_cache:
+            out = cache.path_for(info["checksum"], info["name"] or f"attachment{_safe_ext_for(info['mimetype'])}")
+        else:
+            out = _export_path_for(info["name"], info["mimetype"])
+
+        def progress(received, total):
+            send("ondemand_download_progress", {
+                "record_id": remote_record_id, "received": received, "total": total,
+            })
+
+        stream_download_attachment(
+            client, remote_record_id, out,
+            expected_checksum=info["checksum"],
+            expected_size=info["file_size"],
+            progress=progress,
+        )
+        if use_cache:
+            cache.add(info["checksum"], out, info["mimetype"])
+        return {
+            "success": True,
+            "type": "binary",
+            "path": str(out),
+            "name": info["name"] or out.name,
+            "mimetype": info["mimetype"],
+            "cached": False,
+        }
+    except ChecksumMismatchError as e:
+        log.error(f"[ATTACHMENT] Attachment {remote_record_id} failed verification: {e}")
+        return {"success": False, "error": "Downloaded file is corrupted, please retry"}
+    except Exception as e:
+        log.exception(
+            "[ATTACHMENT] Failed to download attachment %s for account %s",
+            remote_record_id,
+            account_id,
+        )
+        return {"success": False, "error": str(e)}
+
+def get_attachment_cache_stats(settings_db):
+    """Return size, budget and hit/miss statistics of the attachment cache."""
+    try:
+        return get_attachment_cache(settings_db).stats()
+    except Exception as e:
+        log.exception("[ATTACHMENT] Failed to read cache statistics")
+        return {"error": str(e)}
+
+
+def get_timesheet_summary(settings_db, account_id, granularity="week", group_by="project_id", date_from="", date_to=""):
+    """
+    Return timesheet hours aggregated on the server (see timesheet_summary).
+
+    Covers the history before the sync window; account_analytic_line_app
+    holds the lines inside it.
+    """
+    try:
+        return _get_timesheet_summary(
+            settings_db, account_id, granularity, group_by,
+            date_from=date_from or None, date_to=date_to or None,
+        )
+    except Exception as e:
+        log.exception("[SYNC] Failed to read timesheet summary")
+        return {"error": str(e)}
+
+
+def clear_attachment_cache(settings_db):
+    """Delete all cached attachment files."""
+    try:
+        get_attachment_cache(settings_db).clear()
+        return {"success": True}
+    except Exception as e:
+        log.exception("[ATTACHMENT] Failed to clear attachment cache")
+        return {"success": False, "error": str(e)}
+
 def attachment_upload(settings_db, account_id, filepath, res_type, res_id):
     try:
         filepath = unquote(filepath)
@@ -404,10 +586,10 @@ def attachment_upload(settings_db, account_id, filepath, res_type, res_id):
             send("ondemand_upload_completed", False)
             return None
 
-        # 25 MB limit to prevent memory exhaustion and large payload failures
+        # The upload is streamed, so the cap only guards against oversized server payloads
         file_size = os.path.getsize(filepath)
-        if file_size > 25 * 1024 * 1024:
-            send("ondemand_upload_message", "Error: File exceeds 25MB limit")
+        if file_size > MAX_UPLOAD_SIZE:
+            send("ondemand_upload_message", f"Error: File exceeds {MAX_UPLOAD_SIZE // (1024 * 1024)}MB limit")
             send("ondemand_upload_completed", False)
             return None
 
@@ -424,14 +606,9 @@ def attachment_upload(settings_db, account_id, filepath, res_type, res_id):
             '.mp4': 'video/mp4',
             '.zip': 'application/zip'
         }
-        send("ondemand_upload_message", "Reading file...")
         ext = os.path.splitext(filename)[1].lower()
         mimetype = EXT_TO_MIME.get(ext, 'application/octet-stream')
 
-        file_bytes = None
-        with open(filepath, 'rb') as f:
-            file_bytes = f.read()
-
         client = OdooClient(
             selected["link"],
             selected["database"],
@@ -444,18 +621,26 @@ def attachment_upload(settings_db, account_id, filepath, res_type, res_id):
             'type': 'binary',
             'res_model': res_type,
             'res_id': res_id,
-            'datas': base64.b64encode(file_bytes).decode('utf-8'),
             'mimetype': mimetype
         }
         send("ondemand_upload_message", "Uploading file to server...")
-        attachment_id = client.call('ir.attachment', 'create', [vals])
+
+        def progress(sent, total):
+            pct = int(sent * 100 / total) if total else 100
+            send("ondemand_upload_message",
+                 f"Uploading... {pct}% ({sent / 1048576:.1f} / {total / 1048576:.1f} MB)")
+
+        attachment_id = stream_upload_attachment(client, filepath, vals, progress=progress)
         if not attachment_id or attachment_id <= 0:
             send("ondemand_upload_message", "Error: Server failed to save attachment")
             send("ondemand_upload_completed", False)
             return None
 
         send("ondemand_upload_message", "Syncing to local device...")
-        sync_ondemand_tables_from_odoo(client, selected["id"], settings_db, account_name=selected.get("name", ""))
+        sync_single_record(
+            client, "ir.attachment", "ir_attachment_app", attachment_id, selected["id"],
+            settings_db, account_name=selected.get("name", ""),
+        )
         send("ondemand_upload_completed", True)
         return attachment_id
 
@@ -508,7 +693,7 @@ def attachment_delete(settings_db, account_id, remote_record_id):
             log.warning(f"Unlink returned false or empty response for attachment {remote_record_id}")
             return {"success": False, "error": "Server failed to delete attachment"}
 
-        sync_ondemand_tables_from_odoo(client, selected["id"], settings_db, account_name=selected.get("name", ""))
+        delete_local_record("ir_attachment_app", "ir.attachment", remote_record_id, selected["id"], settings_db)
         return {"success": True}
     except Exception as e:
         error_msg = str(e)
@@ -544,6 +729,8 @@ def sync(settings_db, account_id):
         1. Sync from Odoo to local database
         2. Sync from local database to Odoo
         Updates sync report in database with progress and results.
+        Holds the account's sync_coordinator lock like sync_background(), so
+        a daemon sync of the same account is attached to or pre-empted.
     """
     send("progress",0)
     write_sync_report_to_db(
@@ -552,19 +739,40 @@ def sync(settings_db, account_id):
     # initialize_app_settings_db(settings_db) done by js
     accounts = get_all_accounts(settings_db)
     selected = accounts[account_id]
-    client = OdooClient(
-        selected["link"],
-        selected["database"],
-        selected["username"],
-        selected["api_key"],
-    )
-    send("progress",20)
-    log.debug("Syncing from oddo from server" + selected["link"])
-    sync_all_from_odoo(client, selected["id"], settings_db, account_name=selected.get("name", ""))
+    job = SyncJob(selected["id"], "app")
+    if not job.acquire():
+        if _join_running_sync(selected["id"]):
+            write_sync_report_to_db(
+                settings_db, account_id, "Successful", "Sync completed by background service"
+            )
+            send("progress",100)
+            return True
+        if not job.acquire():
+            write_sync_report_to_db(settings_db, account_id, "Failed", "Another sync is still running")
+            return False
 
-    log.debug("Syncing to odoo")
-    send("progress",50)
-    sync_all_to_odoo(client, selected["id"], settings_db)
+    state = "failed"
+    try:
+        with profile_sync(settings_db, selected["id"], "app"):
+            with phase("login"):
+                client = OdooClient(
+                    selected["link"],
+                    selected["database"],
+                    selected["username"],
+                    selected["api_key"],
+                )
+            send("progress",20)
+            job.update(progress=20)
+            log.debug("Syncing from oddo from server" + selected["link"])
+            sync_all_from_odoo(client, selected["id"], settings_db, account_name=selected.get("name", ""))
+
+            log.debug("Syncing to odoo")
+            send("progress",50)
+            job.update(progress=50)
+            sync_all_to_odoo(client, selected["id"], settings_db)
+        state = "completed"
+    finally:
+        job.finish(state)
 
     write_sync_report_to_db(
         settings_db, account_id, "Successful", "Sync completed successfully"
@@ -573,6 +781,47 @@ def sync(settings_db, account_id):
     return True
 
 
+def _join_running_sync(account_id):
+    """
+    Deal with a sync of the account running in another process (the daemon).
+
+    A full ("both") sync is attached to: its progress is relayed to QML and
+    its result reused. Any other sync is asked to stop at its next
+    checkpoint so the manual sync can run.
+
+    Returns:
+        bool: True if an attached sync completed, so nothing is left to do
+    """
+    holder = get_sync_holder(account_id)
+    if holder is None:
+        return False
+    owner = holder.get("owner", "another process")
+
+    if holder.get("direction") == "both":
+        log.info(f"[SYNC] Attaching to running {owner} sync of account {account_id} (pid {holder.get('pid')})")
+        send("sync_message", "Joining sync in progress")
+
+        def relay(status):
+            if status.get("state") != "running":
+                return
+            if status.get("progress") is not None:
+                send("sync_progress", status["progress"])
+            if status.get("message"):
+                send("sync_message", status["message"])
+
+        final = wait_for_release(account_id, ATTACH_TIMEOUT, on_status=relay)
+        if final and final.get("job_id") == holder.get("job_id") and final.get("state") == "completed":
+            return True
+        log.info(f"[SYNC] Attached sync ended without completing ({(final or {}).get('state', 'timeout')}), starting own sync")
+        return False
+
+    log.info(f"[SYNC] Pre-empting {holder.get('direction')} {owner} sync of account {account_id}")
+    send("sync_message", "Stopping background sync")
+    request_preempt(account_id, "app")
+    wait_for_release(account_id, PREEMPT_TIMEOUT)
+    return False
+
+
 def sync_background(settings_db, account_id):
     """
     Perform asynchronous bidirectional sync in a background thread.
@@ -586,6 +835,8 @@ def sync_background(settings_db, account_id):
         
     Note:
         Uses global sync_lock to prevent concurrent sync operations.
+        A daemon sync of the same account is attached to or pre-empted
+        through sync_coordinator instead of running a second one.
         Runs sync in separate thread to avoid blocking UI.
         Updates sync report with progress and handles errors gracefully.
     """
@@ -599,16 +850,36 @@ def sync_background(settings_db, account_id):
 
     def do_sync():
         global sync_in_progress
+        job = SyncJob(account_id, "app")
+        state = "failed"
+
+        def progress(value):
+            send("sync_progress", value)
+            job.update(progress=value)
+
         try:
             send("sync_progress",0)
             log.debug(f"[SYNC] Starting background sync to {settings_db}...")
             write_sync_report_to_db(
                 settings_db, account_id, "In Progress", "Sync job triggered"
             )
+            if not job.acquire():
+                if _join_running_sync(account_id):
+                    state = "completed"
+                    write_sync_report_to_db(
+                        settings_db, account_id, "Successful", "Sync completed by background service"
+                    )
+                    send("sync_progress",100)
+                    send("sync_completed",True)
+                    return
+                if not job.acquire():
+                    write_sync_report_to_db(settings_db, account_id, "Failed", "Another sync is still running")
+                    send("sync_completed",False)
+                    return
             # initialize_app_settings_db(settings_db) , done by js
             accounts = get_all_accounts(settings_db)
             selected = next((acc for acc in accounts if acc["id"] == account_id), None)
-            send("sync_progress",20)
+            progress(20)
 
             if not selected:
                 write_sync_report_to_db(settings_db, account_id, "Failed", "Account not found")
@@ -617,20 +888,22 @@ def sync_background(settings_db, account_id):
             # Proceed with syncing using `account`
             log.debug(f"[SYNC] Found account: {selected['name']} (ID: {selected['id']})")
 
-            send("sync_progress",25)
-            client = OdooClient(
-                selected["link"],
-                selected["database"],
-                selected["username"],
-                selected["api_key"],
-            )
-            send("sync_progress",30)
-            log.debug("Syncing from oddo : ID Is " + selected["link"])
-            sync_all_from_odoo(client, account_id, settings_db, account_name=selected.get("name", ""))
-            send("sync_progress",50)
-            log.debug("Syncing to odoo")
-            sync_all_to_odoo(client, account_id, settings_db)
-            send("sync_progress",90)
+            progress(25)
+            with profile_sync(settings_db, account_id, "app"):
+                with phase("login"):
+                    client = OdooClient(
+                        selected["link"],
+                        selected["database"],
+                        selected["username"],
+                        selected["api_key"],
+                    )
+                progress(30)
+                log.debug("Syncing from oddo : ID Is " + selected["link"])
+                sync_all_from_odoo(client, account_id, settings_db, account_name=selected.get("name", ""))
+                progress(50)
+                log.debug("Syncing to odoo")
+                sync_all_to_odoo(client, account_id, settings_db)
+            progress(90)
 
             log.debug("[SYNC] Background sync completed.")
             write_sync_report_to_db(
@@ -641,13 +914,15 @@ def sync_background(settings_db, account_id):
             )
             # Record successful sync timestamp for per-account interval tracking
             update_last_synced_at(settings_db, account_id)
-            send("sync_progress",100)
+            state = "completed"
+            progress(100)
             send("sync_completed",True)
         except Exception as e:
             log.exception(f"[SYNC] Error during background sync: {e}")
             write_sync_report_to_db(settings_db, account_id, "Failed", str(e))
             send("sync_completed",False)
         finally:
+            job.finish(state)
             with sync_lock:
                 sync_in_progress = False
 
@@ -656,6 +931,49 @@ def sync_background(settings_db, account_id):
     return True  # Return immediately so QML doesn’t wait
 
 
+def get_recent_logs(since_seq=0, min_level=None):
+    """
+    Return buffered log lines newer than a sequence number for the log viewer.
+    
+    Args:
+        since_seq (int): Last sequence number the caller has already shown
+        min_level (str): Optional minimum level name, e.g. "WARNING"
+        
+    Returns:
+        dict: {"last_seq": int, "entries": [...]} where entries are dicts with
+              seq, timestamp, level, name, filename, lineno and message.
+    """
+    handler = getattr(log, "json_handler", None)
+    if handler is None:
+        return {"last_seq": 0, "entries": []}
+    last_seq, entries = handler.read_since(since_seq, min_level)
+    return {"last_seq": last_seq, "entries": entries}
+
+
+def get_sync_performance(settings_db, account_id, runs=1):
+    """
+    Return per-phase timings of the latest sync runs for QML.
+    
+    Args:
+        settings_db (str): Path to the settings database file
+        account_id (int): Account ID to report on
+        runs (int): Number of most recent runs to return
+        
+    Returns:
+        list: Runs as returned by sync_metrics.get_sync_metrics, or an empty
+              list if nothing has been recorded yet.
+        
+    Note:
+        Each phase carries wall, network and parse time in milliseconds plus
+        bytes and rows, so a slow server can be told apart from a slow device.
+    """
+    try:
+        return get_sync_metrics(settings_db, account_id, runs)
+    except Exception as e:
+        log.error(f"[METRICS] Failed to read sync metrics: {e}")
+        return []
+
+
 def start_sync_in_background(settings_db, account_id):
     """
     Start a background synchronization process.
@@ -697,106 +1015,115 @@ def get_voice_models_dir():
     return models_dir
 
 
+def _describe_voice_model(item, source_label):
+    """
+    Returns the m_* fields shown in the voice settings for one model
+    directory. Walks the directory for its size, so results are kept in the
+    model catalogue.
+    """
+    known_names = {m["id"]: m["name"] for m in _available_voice_models() if "id" in m}
+    known_names["model"] = "Indian English" # The bundled one is usually named 'model'
+
+    if item.name in known_names:
+        model_name = known_names[item.name]
+    else:
+        # Fallback to cleaning README or using folder name
+        model_name = item.name
+        readme_path = item / "README"
+        if readme_path.exists():
+            try:
+                with open(readme_path, 'r') as f:
+                    first_line = f.readline().strip()
+                    if first_line:
+                        clean_name = first_line
+                        noise_phrases = [
+                            "for mobile Vosk applications",
+                            "for Android and iOS",
+                            "Vosk mobile model",
+                            "Vosk model",
+                            "Vosk",
+                            "model"
+                        ]
+                        for phrase in noise_phrases:
+                            clean_name = clean_name.replace(phrase, "").strip()
+
+                        if clean_name:
+                            model_name = clean_name
+            except Exception as e:
+                log.error(f"[VOICE] Error reading README for {item.name}: {e}")
+
+    # Add (Default) suffix for bundled models
+    display_name = model_name
+    if source_label == "App":
+        display_name = f"{model_name} (Default)"
+
+    # Calculate directory size
+    total_size = 0
+    try:
+        for f in item.rglob('*'):
+            if f.is_file():
+                total_size += f.stat().st_size
+        size_mb = total_size / (1024 * 1024)
+        model_size = f"{size_mb:.1f} MB"
+    except Exception:
+        model_size = "Unknown"
+
+    # Archive checksum recorded by the installer
+    sha256 = ""
+    try:
+        with open(item / ".install.json", "r") as f:
+            sha256 = json.load(f).get("sha256", "")
+    except Exception:
+        pass
+
+    try:
+        if source_label == "App":
+            rel_path = item.relative_to(root_dir)
+        else:
+            rel_path = item
+    except ValueError:
+        rel_path = item
+
+    return {
+        "m_name": display_name,
+        "m_path": str(rel_path),
+        "m_size": model_size,
+        "m_source": source_label,
+        "m_size_bytes": total_size,
+        "m_sha256": sha256,
+    }
+
+
+_voice_catalogue = None
+
+
+def get_voice_catalogue():
+    """Returns the persistent index of installed voice models."""
+    global _voice_catalogue
+    if _voice_catalogue is None:
+        from voice_to_text.model_catalogue import ModelCatalogue
+        user_models_dir = get_voice_models_dir()
+        _voice_catalogue = ModelCatalogue(
+            user_models_dir.parent / "voice_catalogue.json",
+            [
+                # 1. App directory models (Read-only on device)
+                (root_dir / "voice_to_text", "App"),
+                # 2. User data directory models (Writable)
+                (user_models_dir, "User"),
+            ],
+            _describe_voice_model,
+        )
+    return _voice_catalogue
+
+
 def list_installed_models():
     """
-    Scans for installed Vosk models in both the app directory and writable data directory.
-    Returns a list of dictionaries with model names, paths, and sizes.
+    Returns the installed Vosk models from both the app directory and the
+    writable data directory, as dictionaries with model names, paths and sizes.
+    Served from the model catalogue; directories are only rescanned after
+    they change.
     """
-    # 1. App directory models (Read-only on device)
-    app_models_dir = root_dir / "voice_to_text"
-    
-    # 2. User data directory models (Writable)
-    user_models_dir = get_voice_models_dir()
-    
-    search_paths = [
-        (app_models_dir, "App"),
-        (user_models_dir, "User")
-    ]
-    
-    models = []
-    seen_paths = set()
-    
-    for root_dir_to_scan, source_label in search_paths:
-        if not root_dir_to_scan.exists():
-            continue
-            
-        # Standard Vosk models are directories containing 'am' and 'graph' subdirectories
-        for item in root_dir_to_scan.iterdir():
-            if item.is_dir() and item not in seen_paths:
-                am_dir = item / "am"
-                graph_dir = item / "graph"
-                
-                if am_dir.exists() and graph_dir.exists():
-                    available_models = list_available_models()
-                    known_names = {m["id"]: m["name"] for m in available_models if "id" in m}
-                    known_names["model"] = "Indian English" # The bundled one is usually named 'model'
-                    
-                    if item.name in known_names:
-                        model_name = known_names[item.name]
-                    else:
-                        # Fallback to cleaning README or using folder name
-                        model_name = item.name
-                        readme_path = item / "README"
-                        if readme_path.exists():
-                            try:
-                                with open(readme_path, 'r') as f:
-                                    first_line = f.readline().strip()
-                                    if first_line:
-                                        clean_name = first_line
-                                        noise_phrases = [
-                                            "for mobile Vosk applications",
-                                            "for Android and iOS",
-                                            "Vosk mobile model",
-                                            "Vosk model",
-                                            "Vosk",
-                                            "model"
-                                        ]
-                                        for phrase in noise_phrases:
-                                            clean_name = clean_name.replace(phrase, "").strip()
-                                        
-                                        if clean_name:
-                                            model_name = clean_name
-                            except Exception as e:
-                                log.error(f"[VOICE] Error reading README for {item.name}: {e}")
-
-                    # Add (Default) suffix for bundled models
-                    display_name = model_name
-                    if source_label == "App":
-                        display_name = f"{model_name} (Default)"
-
-                    # Calculate directory size
-                    total_size = 0
-                    try:
-                        for f in item.rglob('*'):
-                            if f.is_file():
-                                total_size += f.stat().st_size
-                        size_mb = total_size / (1024 * 1024)
-                        model_size = f"{size_mb:.1f} MB"
-                    except Exception:
-                        model_size = "Unknown"
-
-                    try:
-                        if source_label == "App":
-                            rel_path = item.relative_to(root_dir)
-                        else:
-                            rel_path = item
-                            
-                        models.append({
-                            "m_name": display_name,
-                            "m_path": str(rel_path),
-                            "m_size": model_size,
-                            "m_source": source_label
-                        })
-                    except ValueError:
-                        models.append({
-                            "m_name": display_name,
-                            "m_path": str(item),
-                            "m_size": model_size,
-                            "m_source": source_label
-                        })
-                    seen_paths.add(item)
-    
-    models.sort(key=lambda x: x["m_name"].lower())
+    models = get_voice_catalogue().installed()
     log.info(f"[VOICE] Found {len(models)} installed models")
     return models
 
@@ -810,8 +1137,19 @@ def get_installed_voice_models():
     log.info(f"[VOICE] Found {len(installed)} installed models")
     return installed
     
+_device_total_ram_mb = None
+
+
 def get_device_total_ram_mb():
     """Returns total device RAM in MB to check model compatibility."""
+    global _device_total_ram_mb
+    if _device_total_ram_mb is None:
+        # Total RAM does not change while the app runs
+        _device_total_ram_mb = _read_device_total_ram_mb()
+    return _device_total_ram_mb
+
+
+def _read_device_total_ram_mb():
     try:
         with open('/proc/meminfo', 'r') as f:
             for line in f:
@@ -833,19 +1171,11 @@ def get_device_total_ram_mb():
 
 def get_paused_voice_models():
     """Returns a list of model IDs that have a partial download file."""
-    models_dir = get_voice_models_dir()
-    if not models_dir.exists():
-        return []
-    paused = []
-    for f in models_dir.glob("*.zip.tmp"):
-        paused.append(f.name.replace(".zip.tmp", ""))
-    return paused
+    return get_voice_catalogue().paused()
 
 
-def list_available_models():
-    """
-    Returns a list of models available for download.
-    """
+def _available_voice_models():
+    """Static list of models that can be downloaded."""
     models = [
         {"id": "vosk-model-small-en-us-0.15", "name": "English (US, Small)", "size": "40M", "url": "https://alphacephei.com/vosk/models/vosk-model-small-en-us-0.15.zip"},
         {"id": "vosk-model-en-us-0.22", "name": "English (US)", "size": "1.8G", "url": "https://alphacephei.com/vosk/models/vosk-model-en-us-0.22.zip"},
@@ -928,6 +1258,42 @@ def list_available_models():
     return models
 
 
+def _estimate_model_ram_mb(size):
+    """Rough RAM needed to load a model of the given download size ("40M", "1.8G")."""
+    size = (size or "").upper()
+    try:
+        if size.endswith("G"):
+            # ~2500 MB per GB of model, as assumed by the settings page
+            return int(float(size[:-1]) * 2500)
+        if size.endswith("M"):
+            return max(300, int(float(size[:-1]) * 4))
+    except ValueError:
+        pass
+    return 0
+
+
+def list_available_models():
+    """
+    Returns a list of models available for download, with their estimated
+    RAM requirement, install/paused state and expected archive checksum.
+    """
+    from voice_to_text.model_installer import load_manifest
+
+    catalogue = get_voice_catalogue()
+    installed = set(catalogue.installed_ids())
+    paused = set(catalogue.paused())
+    manifest = load_manifest()
+    models = []
+    for model in _available_voice_models():
+        model = dict(model)
+        model["ram_mb"] = _estimate_model_ram_mb(model.get("size"))
+        model["installed"] = model["id"] in installed
+        model["paused"] = model["id"] in paused
+        model["sha256"] = (manifest.get(model["id"]) or {}).get("sha256", "")
+        models.append(model)
+    return models
+
+
 def get_model_download_status():
     """Returns the current download status for UI polling."""
     return download_status
@@ -936,6 +1302,9 @@ def get_model_download_status():
 _voice_download_cancel_event = threading.Event()
 _voice_download_action = None
 
+# Separate pool for model downloads, sized for parallel ranged requests
+voice_http = None
+
 def cancel_voice_model_download():
     """Cancels an ongoing voice model download and deletes partial data."""
     global download_status, _voice_download_action
@@ -948,11 +1317,12 @@ def cancel_voice_model_download():
     # Clean up any partial download files immediately to prevent them from showing up on restart
     models_dir = get_voice_models_dir()
     if models_dir.exists():
-        for f in models_dir.glob("*.zip.tmp"):
+        for f in [*models_dir.glob("*.zip.tmp"), *models_dir.glob("*.zip.tmp.parts")]:
             try:
                 f.unlink()
             except Exception:
                 pass
+        get_voice_catalogue().mark_dirty()
                 
     return {"status": "cancelled"}
 
@@ -985,10 +1355,8 @@ def download_voice_model(model_id, url):
     }
     
     def do_download():
-        import zipfile
-        import shutil
+        from voice_to_text.model_installer import install_model, parts_path, DEFAULT_CONNECTIONS
         temp_zip = None
-        temp_extract_dir = None
         try:
             models_dir = get_voice_models_dir()
             target_path = models_dir / model_id
@@ -1000,97 +1368,29 @@ def download_voice_model(model_id, url):
                 return
 
             temp_zip = models_dir / f"{model_id}.zip.tmp"
-            existing_size = 0
-            if temp_zip.exists():
-                existing_size = temp_zip.stat().st_size
-            
-            headers = {}
-            if existing_size > 0:
-                headers['Range'] = f'bytes={existing_size}-'
-                log.info(f"[VOICE] Resuming {model_id} from {existing_size} bytes")
-                download_status["message"] = "Resuming..."
-            else:
-                log.info(f"[VOICE] Downloading model from {url}")
-                download_status["message"] = "Downloading..."
-            
-            # Using urllib3 for download with a timeout to handle sudden internet disconnection
-            response = http.request('GET', url, headers=headers, preload_content=False, timeout=urllib3.Timeout(connect=5.0, read=10.0))
-            if response.status not in (200, 206, 416):
-                raise Exception(f"Server returned status {response.status}")
-                
-            if response.status == 200 and existing_size > 0:
-                # Server ignored Range header, restart from scratch
-                log.info(f"[VOICE] Server ignored Range, restarting download")
-                existing_size = 0
-                temp_zip.unlink()
-                
-            content_length = response.getheader('Content-Length')
-            total_size = (int(content_length) + existing_size) if content_length else None
-            
-            if total_size and existing_size == 0:
-                # Check available disk space only on new downloads
-                try:
-                    _, _, free = shutil.disk_usage(str(models_dir))
-                    free_mb = free / (1024 * 1024)
-                    required_mb = (total_size * 2.5) / (1024 * 1024)
-                    if free < total_size * 2.5:
-                        raise Exception(f"Insufficient storage. Have {free_mb:.1f} MB, need at least {required_mb:.1f} MB available.")
-                except Exception as disk_err:
-                    if isinstance(disk_err, Exception) and "Insufficient storage" in str(disk_err):
-                        raise disk_err
-                    log.warning(f"[VOICE] Could not check disk space: {disk_err}")
-            
-            downloaded = existing_size
-            mode = 'ab' if existing_size > 0 else 'wb'
-            with open(temp_zip, mode) as f:
-                for chunk in response.stream(1024 * 64):
-                    if _voice_download_cancel_event.is_set():
-                        action = _voice_download_action
-                        if action == "pause":
-                            raise Exception("PAUSED_BY_USER")
-                        else:
-                            raise Exception("CANCELLED_BY_USER")
-                    f.write(chunk)
-                    downloaded += len(chunk)
-                    if total_size:
-                        progress = int((downloaded / total_size) * 80) # 80% for download
-                        download_status["progress"] = progress
-                        send("download_progress", progress)
-            
-            download_status["message"] = "Extracting..."
-            send("download_message", "Extracting...")
-            download_status["progress"] = 85
-            send("download_progress", 85)
-            
-            # Extract to a temporary directory to ensure atomic installation
-            temp_extract_dir = models_dir / f"{model_id}.extract.tmp"
-            if temp_extract_dir.exists():
-                shutil.rmtree(temp_extract_dir)
-            temp_extract_dir.mkdir(parents=True, exist_ok=True)
-            
-            with zipfile.ZipFile(temp_zip) as z:
-                z.extractall(temp_extract_dir)
-            
-            # Vosk models usually have a single folder inside the zip
-            # We want to find the directory containing the actual model files ('am' and 'graph')
-            model_folder = None
-            for root, dirs, files in os.walk(temp_extract_dir):
-                if 'am' in dirs and 'graph' in dirs:
-                    model_folder = Path(root)
-                    break
-            
-            if not model_folder:
-                # Fallback: look for any subdirectory
-                subdirs = [d for d in temp_extract_dir.iterdir() if d.is_dir()]
-                if len(subdirs) == 1:
-                    model_folder = subdirs[0]
-                else:
-                    model_folder = temp_extract_dir
-            
-            # Move to final location (atomic move on same filesystem)
-            if target_path.exists():
-                shutil.rmtree(target_path)
-            shutil.move(str(model_folder), str(target_path))
+            log.info(f"[VOICE] Downloading model from {url}")
+
+            def abort():
+                if _voice_download_cancel_event.is_set():
+                    return _voice_download_action or "cancel"
+                return None
+
+            def on_progress(progress):
+                download_status["progress"] = progress
+                send("download_progress", progress)
+
+            def on_message(message):
+                download_status["message"] = message
+                send("download_message", message)
+
+            global voice_http
+            if voice_http is None:
+                # One connection per range plus the probe
+                voice_http = urllib3.PoolManager(maxsize=DEFAULT_CONNECTIONS + 2, cert_reqs="CERT_NONE")
+            install_model(
+                voice_http, model_id, url, models_dir,
+                abort=abort, progress=on_progress, message=on_message,
+            )
                 
             download_status["progress"] = 100
             download_status["message"] = "Installation complete"
@@ -1111,24 +1411,21 @@ def download_voice_model(model_id, url):
             elif err_str == "CANCELLED_BY_USER":
                 download_status["is_paused"] = False
                 download_status["message"] = "Cancelled"
-                if temp_zip and temp_zip.exists():
-                    try:
-                        temp_zip.unlink()
-                    except:
-                        pass
+                if temp_zip:
+                    for leftover in (temp_zip, parts_path(temp_zip)):
+                        try:
+                            leftover.unlink()
+                        except Exception:
+                            pass
             else:
                 # Network error or other failure
                 download_status["error"] = err_str
                 download_status["message"] = "Failed"
                 download_status["is_paused"] = True # Keep partial file for resume
                 send("download_error", err_str)
-                
         finally:
-            if temp_extract_dir and temp_extract_dir.exists():
-                try:
-                    shutil.rmtree(temp_extract_dir)
-                except Exception:
-                    pass
+            # A model folder appeared or a partial download was kept/removed
+            get_voice_catalogue().mark_dirty()
 
     threading.Thread(target=do_download, daemon=True).start()
     return {"status": "started"}
@@ -1167,6 +1464,7 @@ def delete_voice_model(model_path):
             else:
                 path.unlink()
             log.info(f"[VOICE] Deleted user model: {model_path}")
+            get_voice_catalogue().mark_dirty()
             return {"status": "success"}
         
         # Check if it's in the app dir
@@ -1200,168 +1498,159 @@ def resolve_settings_db_path(db_name="myDatabase", app_id="ubtms"):
     return None
 
 
-def _subprocess_recognize(model_path, pipe, timeout):
-    """Runs voice recognition in a separate process to avoid blocking the GIL."""
-    import signal
-    def sigterm_handler(signum, frame):
-        raise SystemExit(0)
-    signal.signal(signal.SIGTERM, sigterm_handler)
+def _resolve_active_voice_model():
+    """
+    Returns the Path of the selected voice model, falling back to (and
+    saving) the first installed one. Returns None if no model is installed.
+    """
+    # Fetch the active model path from settings
+    # First try the specific settings DB
+    db_path = resolve_settings_db_path("myDatabase")
+    if not db_path:
+        # Fallback to main app DB
+        db_path = resolve_qml_db_path()
+
+    active_model_rel_path = ""
+    if db_path:
+         active_model_rel_path = get_setting(db_path, "active_voice_model", "")
+
+    # Resolve relative path if necessary
+    root_dir = Path(__file__).parent.parent.resolve()
+
+    model_path = None
+    if active_model_rel_path:
+        if not os.path.isabs(active_model_rel_path):
+            model_path = root_dir / active_model_rel_path
+        else:
+            model_path = Path(active_model_rel_path)
 
-    try:
-        from voice_to_text.voice2text import recognize_from_mic
-        
-        class PipeStopEvent:
-            def is_set(self):
-                if pipe.poll():
-                    msg = pipe.recv()
-                    if msg == "stop":
-                        return True
-                return False
-                
-        def _partial(txt):
-            pipe.send(("partial", txt))
-            
-        def _status(txt):
-            pipe.send(("status", txt))
-            
-        text, err = recognize_from_mic(verbose=False, stop_event=PipeStopEvent(), timeout=timeout, partial_callback=_partial, status_callback=_status, model_path=model_path)
-        pipe.send(("final", text, err))
-    except Exception as e:
-        import traceback
-        pipe.send(("final", None, f"Subprocess Error: {e}"))
+    if not model_path or not model_path.exists():
+        installed_models = list_installed_models()
+        if not installed_models:
+            return None
+        active_model_rel_path = installed_models[0]["m_path"]
+        if not os.path.isabs(active_model_rel_path):
+            model_path = root_dir / active_model_rel_path
+        else:
+            model_path = Path(active_model_rel_path)
+
+        if db_path:
+            try:
+                from config import set_setting
+                set_setting(db_path, "active_voice_model", active_model_rel_path)
+            except Exception as e:
+                log.warning(f"[VOICE] Could not auto-save active model to db: {e}")
+    return model_path
+
+
+_voice_libs_prepared = False
+
+
+def _prepare_voice_libs():
+    """Makes the bundled native libraries visible to the voice worker (once)."""
+    global _voice_libs_prepared
+    if _voice_libs_prepared:
+        return
+
+    # Paths to search for bundled libraries
+    base_voice_path = Path(__file__).parent.parent / "voice_to_text"
+    lib_path = base_voice_path / "lib"
+
+    # Pre-load libatomic if it exists in our bundle (fixes arm64 dependency issue)
+    atomic_lib = lib_path / "libatomic.so.1"
+    if atomic_lib.exists():
+        try:
+            ctypes.CDLL(str(atomic_lib))
+            log.info(f"[VOICE] Pre-loaded {atomic_lib}")
+        except Exception as e:
+            log.warning(f"[VOICE] Could not pre-load libatomic: {e}")
+
+    # Add bundled libs to environment for nested dependencies
+    env_path = str(lib_path)
+    if "LD_LIBRARY_PATH" in os.environ:
+        os.environ["LD_LIBRARY_PATH"] = f"{env_path}:{os.environ['LD_LIBRARY_PATH']}"
+    else:
+        os.environ["LD_LIBRARY_PATH"] = env_path
+    _voice_libs_prepared = True
+
+
+def preload_voice_recognition():
+    """
+    Loads the selected voice model into the voice worker in the background,
+    so the next run_voice_recognition() starts listening without delay.
+    Called when a page with a microphone button opens.
+    """
+    def do_preload():
+        try:
+            model_path = _resolve_active_voice_model()
+            if not model_path:
+                return
+            _prepare_voice_libs()
+            from voice_to_text.voice_worker import get_voice_worker
+            error = get_voice_worker().preload(model_path)
+            if error:
+                log.warning(f"[VOICE] Preloading voice model failed: {error}")
+        except Exception as e:
+            log.warning(f"[VOICE] Preloading voice model failed: {e}")
+
+    thread = threading.Thread(target=do_preload)
+    thread.daemon = True
+    thread.start()
+    return True
+
+
+def release_voice_recognition():
+    """Stops the voice worker and frees the memory held by the model."""
+    from voice_to_text.voice_worker import get_voice_worker
+    get_voice_worker().shutdown()
+    return True
 
 
 def run_voice_recognition():
     """
     Runs voice recognition in a background thread to avoid blocking the UI.
     Uses the offline Vosk engine.
+
+    Recognition runs in a persistent worker process (voice_to_text.voice_worker)
+    that keeps the model loaded between sessions.
     """
     def do_recognition():
-        import multiprocessing
         try:
             log.info("[VOICE] Starting offline voice recognition thread")
-            
-            # Fetch the active model path from settings
-            # First try the specific settings DB
-            db_path = resolve_settings_db_path("myDatabase")
-            if not db_path:
-                # Fallback to main app DB
-                db_path = resolve_qml_db_path()
-            
-            active_model_rel_path = ""
-            if db_path:
-                 active_model_rel_path = get_setting(db_path, "active_voice_model", "")
-            
-            # Resolve relative path if necessary
-            root_dir = Path(__file__).parent.parent.resolve()
-            
-            model_path = None
-            if active_model_rel_path:
-                if not os.path.isabs(active_model_rel_path):
-                    model_path = root_dir / active_model_rel_path
-                else:
-                    model_path = Path(active_model_rel_path)
-
-            if not model_path or not model_path.exists():
-                installed_models = list_installed_models()
-                if installed_models:
-                    active_model_rel_path = installed_models[0]["m_path"]
-                    if not os.path.isabs(active_model_rel_path):
-                        model_path = root_dir / active_model_rel_path
-                    else:
-                        model_path = Path(active_model_rel_path)
-                    
-                    if db_path:
-                        try:
-                            from config import set_setting
-                            set_setting(db_path, "active_voice_model", active_model_rel_path)
-                        except Exception as e:
-                            log.warning(f"[VOICE] Could not auto-save active model to db: {e}")
-                else:
-                    log.error("[VOICE] No language model downloaded")
-                    send("voice_recognition_error", "No language model downloaded. Please download one in Voice Model Settings.")
-                    return
 
-            # Paths to search for bundled libraries
-            base_voice_path = Path(__file__).parent.parent / "voice_to_text"
-            lib_path = base_voice_path / "lib"
-            
-            # Pre-load libatomic if it exists in our bundle (fixes arm64 dependency issue)
-            atomic_lib = lib_path / "libatomic.so.1"
-            if atomic_lib.exists():
-                try:
-                    ctypes.CDLL(str(atomic_lib))
-                    log.info(f"[VOICE] Pre-loaded {atomic_lib}")
-                except Exception as e:
-                    log.warning(f"[VOICE] Could not pre-load libatomic: {e}")
-            
-            # Add bundled libs to environment for nested dependencies
-            env_path = str(lib_path)
-            if "LD_LIBRARY_PATH" in os.environ:
-                os.environ["LD_LIBRARY_PATH"] = f"{env_path}:{os.environ['LD_LIBRARY_PATH']}"
-            else:
-                os.environ["LD_LIBRARY_PATH"] = env_path
-            
+            model_path = _resolve_active_voice_model()
+            if not model_path:
+                log.error("[VOICE] No language model downloaded")
+                send("voice_recognition_error", "No language model downloaded. Please download one in Voice Model Settings.")
+                return
+
+            _prepare_voice_libs()
+
             from voice_to_text.voice2text import list_microphones
+            from voice_to_text.voice_worker import get_voice_worker
             
             # Reset the stop event
             _voice_stop_event.clear()
             
             # Log available mics for debug
             log.info(f"[VOICE] mics: {list_microphones()}")
-            
+
+            def on_message(msg):
+                if msg[0] == "partial":
+                    send("voice_recognition_partial", msg[1])
+                elif msg[0] == "status":
+                    send("voice_recognition_status", msg[1])
+
             # Run recognition in a separate process to avoid GIL blocking and UI freezing
-            parent_conn, child_conn = multiprocessing.Pipe()
-            ctx = multiprocessing.get_context("spawn")
-            p = ctx.Process(target=_subprocess_recognize, args=(str(model_path), child_conn, 30))
-            p.start()
-            
-            import time
-            received_final = False
-            stop_sent_time = None
-            while p.is_alive():
-                if _voice_stop_event.is_set():
-                    parent_conn.send("stop")
-                    _voice_stop_event.clear()
-                    if stop_sent_time is None:
-                        stop_sent_time = time.time()
-                
-                # Watchdog: terminate if process ignores stop signal for > 5 seconds
-                if stop_sent_time is not None and (time.time() - stop_sent_time > 5.0):
-                    log.warning("[VOICE] Watchdog triggered: Process failed to stop cleanly. Terminating.")
-                    p.terminate()
-                    break
-                    
-                if parent_conn.poll(0.5):
-                    msg = parent_conn.recv()
-                    if msg[0] == "partial":
-                        send("voice_recognition_partial", msg[1])
-                    elif msg[0] == "status":
-                        send("voice_recognition_status", msg[1])
-                    elif msg[0] == "final":
-                        received_final = True
-                        text, error = msg[1], msg[2]
-                        if text:
-                            log.info(f"[VOICE] Recognized text: {text}")
-                            send("voice_recognition_result", text)
-                        else:
-                            log.warning(f"[VOICE] Recognition failed: {error or 'No speech detected'}")
-                            send("voice_recognition_error", error or "No speech detected")
-                        break
-            
-            # Ensure process cleanup
-            p.join(timeout=1)
-            if p.is_alive():
-                p.terminate()
-                p.join()
-                
-            # Handle unexpected crash (like OOM kill)
-            if not received_final:
-                exit_code = p.exitcode
-                if exit_code is not None and exit_code != 0:
-                    err_msg = f"Voice recognition crashed unexpectedly (possibly Out of Memory). Exit code: {exit_code}"
-                    log.error(f"[VOICE] {err_msg}")
-                    send("voice_recognition_error", err_msg)
+            text, error = get_voice_worker().recognize(
+                model_path, _voice_stop_event, on_message, timeout=30
+            )
+            if text:
+                log.info(f"[VOICE] Recognized text: {text}")
+                send("voice_recognition_result", text)
+            else:
+                log.warning(f"[VOICE] Recognition failed: {error or 'No speech detected'}")
+                send("voice_recognition_error", error or "No speech detected")
                 
         except Exception as e:
             log.exception(f"[VOICE] Error during voice recognition: {e}")
@@ -22,6 +22,7 @@
 # SOFTWARE.
 
 from datetime import datetime
+from functools import lru_cache
 import json
 import sqlite3
 import time
@@ -30,6 +31,7 @@ import base64
 import os
 from pathlib import Path
 from logger import setup_logger
+from schema_manager import ensure_schema
 
 log = setup_logger()
 
@@ -243,27 +245,13 @@ def add_notification(db_path, account_id, notif_type, message, payload, panel_in
             invoked to the system panel (1) or is still deferred (0)
 
     Note:
-        Creates notification table if it doesn't exist with proper schema constraints.
+        The notification table is created/upgraded by schema_manager, once per process.
         Sets read_status to 0 (unread) by default.
         Stores payload as JSON string and adds UTC timestamp.
         Uses safe_sql_execute for thread-safe database operations.
         Prevents duplicate notifications with same message within 60 seconds.
     """
-    # Ensure table exists
-    create_table_sql = """
-        CREATE TABLE IF NOT EXISTS notification (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            account_id INTEGER,
-            timestamp TEXT DEFAULT (datetime('now')),
-            message TEXT NOT NULL,
-            type TEXT CHECK(type IN ('Activity', 'Task', 'Project', 'ProjectUpdate', 'Timesheet', 'Sync')),
-            payload TEXT NOT NULL,
-            read_status INTEGER DEFAULT 0,
-            panel_invoked INTEGER DEFAULT 0
-        )
-    """
-
-    safe_sql_execute(db_path, create_table_sql)
+    ensure_schema(db_path)
 
     try:
         conn = sqlite3.connect(db_path)
@@ -318,26 +306,11 @@ def add_notification(db_path, account_id, notif_type, message, payload, panel_in
         except Exception:
             pass  # Don't fail the insert if cleanup fails
 
-    try:
-        safe_sql_execute(
-            db_path,
-            insert_sql,
-            (account_id, timestamp, message, notif_type, payload_json, 1 if panel_invoked else 0)
-        )
-    except sqlite3.OperationalError as e:
-        # Upgrade path: old databases may not yet include panel_invoked.
-        if "no column named panel_invoked" in str(e).lower():
-            safe_sql_execute(
-                db_path,
-                "ALTER TABLE notification ADD COLUMN panel_invoked INTEGER DEFAULT 0"
-            )
-            safe_sql_execute(
-                db_path,
-                insert_sql,
-                (account_id, timestamp, message, notif_type, payload_json, 1 if panel_invoked else 0)
-            )
-        else:
-            raise
+    safe_sql_execute(
+        db_path,
+        insert_sql,
+        (account_id, timestamp, message, notif_type, payload_json, 1 if panel_invoked else 0)
+    )
 
 
 def clear_sync_notifications(db_path, account_id, model_name=None):
@@ -773,14 +746,15 @@ def get_available_timezones():
     return common_timezones
 
 
-def get_system_timezone():
-    """
-    Get the system's current timezone.
-    
-    Returns:
-        str: Timezone name (e.g., "America/New_York") or "UTC" if detection fails
-    """
-    import os
+# Seconds a detected system timezone is reused before timedatectl is asked again.
+# The daemon also drops the cached value when timedated reports a change.
+SYSTEM_TIMEZONE_TTL = 300
+
+_system_tz_lock = threading.Lock()
+_system_tz_cache = {"tz": None, "expires": 0.0}
+
+
+def _detect_system_timezone():
     import subprocess
     
     try:
@@ -817,7 +791,6 @@ def get_system_timezone():
                     return tz
         
         # Fallback: try using Python's time module
-        import time
         tz_name = time.tzname[0]
         if tz_name:
             return tz_name
@@ -828,6 +801,68 @@ def get_system_timezone():
     return "UTC"
 
 
+def get_system_timezone():
+    """
+    Get the system's current timezone.
+    
+    The detected value is cached for SYSTEM_TIMEZONE_TTL seconds, or until
+    invalidate_system_timezone_cache() is called, so schedule checks do not
+    spawn timedatectl each time.
+    
+    Returns:
+        str: Timezone name (e.g., "America/New_York") or "UTC" if detection fails
+    """
+    now = time.monotonic()
+    with _system_tz_lock:
+        if _system_tz_cache["tz"] is not None and now < _system_tz_cache["expires"]:
+            return _system_tz_cache["tz"]
+    
+    tz = _detect_system_timezone()
+    with _system_tz_lock:
+        _system_tz_cache["tz"] = tz
+        _system_tz_cache["expires"] = now + SYSTEM_TIMEZONE_TTL
+    return tz
+
+
+def invalidate_system_timezone_cache():
+    """Forget the cached system timezone (e.g. after the user changed it)."""
+    with _system_tz_lock:
+        _system_tz_cache["tz"] = None
+        _system_tz_cache["expires"] = 0.0
+
+
+@lru_cache(maxsize=32)
+def _get_tzinfo(timezone_str):
+    """
+    Return a tzinfo for the zone name, or None if the zone is unknown or no
+    timezone library is available (callers then fall back to UTC).
+    
+    Results are cached, so an unknown zone is only logged once.
+    """
+    try:
+        from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+        try:
+            return ZoneInfo(timezone_str)
+        except (ZoneInfoNotFoundError, ValueError) as e:
+            log.warning(f"[COMMON] Unknown timezone '{timezone_str}', using UTC: {e}")
+            return None
+    except ImportError:
+        pass
+    
+    try:
+        import pytz
+        try:
+            return pytz.timezone(timezone_str)
+        except pytz.UnknownTimeZoneError as e:
+            log.warning(f"[COMMON] Unknown timezone '{timezone_str}', using UTC: {e}")
+            return None
+    except ImportError:
+        pass
+    
+    log.warning("[COMMON] No timezone library available, using UTC")
+    return None
+
+
 def get_current_time_in_timezone(timezone_str):
     """
     Get the current time in a specific timezone.
@@ -841,25 +876,12 @@ def get_current_time_in_timezone(timezone_str):
     from datetime import timezone as tz
     
     try:
-        # Try using zoneinfo (Python 3.9+)
-        try:
-            from zoneinfo import ZoneInfo
-            now = datetime.now(ZoneInfo(timezone_str))
-            return now
-        except ImportError:
-            pass
-        
-        # Fallback: try using pytz if available
-        try:
-            import pytz
-            tz_obj = pytz.timezone(timezone_str)
-            now = datetime.now(tz_obj)
-            return now
-        except ImportError:
-            pass
+        tz_obj = _get_tzinfo(timezone_str)
+        if tz_obj is not None:
+            return datetime.now(tz_obj)
         
-        # Last fallback: use UTC
-        log.warning(f"[COMMON] No timezone library available, using UTC")
+        # Unknown zone or no timezone library (logged once by _get_tzinfo): use UTC
+        log.debug(f"[COMMON] Timezone {timezone_str} not available, using UTC")
         return datetime.now(tz.utc)
         
     except Exception as e:
@@ -867,6 +889,7 @@ def get_current_time_in_timezone(timezone_str):
         return datetime.now(tz.utc)
 
 
+@lru_cache(maxsize=64)
 def parse_time_string(time_str):
     """
     Parse a time string in HH:MM format to hours and minutes.
@@ -891,6 +914,35 @@ def parse_time_string(time_str):
     return (0, 0)
 
 
+@lru_cache(maxsize=16)
+def get_active_window(active_start, active_end):
+    """
+    Precompute the active-hours window in minutes since midnight.
+    
+    Args:
+        active_start: Start time of active hours in "HH:MM" format
+        active_end: End time of active hours in "HH:MM" format
+        
+    Returns:
+        tuple: (start_mins, end_mins, overnight) where overnight is True when
+            the window wraps around midnight (e.g. 22:00-06:00)
+    """
+    start_hour, start_minute = parse_time_string(active_start)
+    end_hour, end_minute = parse_time_string(active_end)
+    start_mins = start_hour * 60 + start_minute
+    end_mins = end_hour * 60 + end_minute
+    return (start_mins, end_mins, start_mins > end_mins)
+
+
+def minutes_in_active_window(current_mins, window):
+    """Return whether a minute of the day falls inside a get_active_window() window."""
+    start_mins, end_mins, overnight = window
+    if overnight:
+        # Active if current time is after start OR before end
+        return current_mins >= start_mins or current_mins <= end_mins
+    return start_mins <= current_mins <= end_mins
+
+
 def is_within_active_hours(timezone_str, active_start, active_end):
     """
     Check if the current time is within the user's active notification hours.
@@ -913,28 +965,11 @@ def is_within_active_hours(timezone_str, active_start, active_end):
         
         # Get current time in user's timezone
         current_time = get_current_time_in_timezone(effective_tz)
-        current_hour = current_time.hour
-        current_minute = current_time.minute
-        
-        # Parse start and end times
-        start_hour, start_minute = parse_time_string(active_start)
-        end_hour, end_minute = parse_time_string(active_end)
+        current_mins = current_time.hour * 60 + current_time.minute
         
-        # Convert to minutes since midnight for easier comparison
-        current_mins = current_hour * 60 + current_minute
-        start_mins = start_hour * 60 + start_minute
-        end_mins = end_hour * 60 + end_minute
-        
-        # Handle normal case (start < end) and overnight case (start > end)
-        if start_mins <= end_mins:
-            # Normal case: e.g., 09:00 to 18:00
-            is_active = start_mins <= current_mins <= end_mins
-        else:
-            # Overnight case: e.g., 22:00 to 06:00
-            # Active if current time is after start OR before end
-            is_active = current_mins >= start_mins or current_mins <= end_mins
+        is_active = minutes_in_active_window(current_mins, get_active_window(active_start, active_end))
         
-        log.debug(f"[COMMON] Active hours check: tz={effective_tz}, current={current_hour:02d}:{current_minute:02d}, "
+        log.debug(f"[COMMON] Active hours check: tz={effective_tz}, current={current_time.hour:02d}:{current_time.minute:02d}, "
                   f"range={active_start}-{active_end}, is_active={is_active}")
         
         return is_active
@@ -1003,16 +1038,151 @@ def get_notification_schedule_settings(db_path):
         }
 
 
+_DAY_NAMES = ["Sun", "Mon", "Tue", "Wed", "Thu", "Fri", "Sat"]
+
+# Days searched ahead for the next schedule transition; a week plus one day
+# covers every combination of working days and overnight windows
+_SCHEDULE_LOOKAHEAD_DAYS = 9
+
+
+def _localize(tz_obj, naive):
+    """Attach a timezone to a naive local datetime (pytz zones need localize())."""
+    if hasattr(tz_obj, "localize"):
+        return tz_obj.localize(naive)
+    return naive.replace(tzinfo=tz_obj)
+
+
+class ScheduleEvaluator:
+    """
+    Answers "may a notification be delivered now?" without touching the database.
+    
+    Settings are loaded once. The evaluator remembers whether delivery is
+    currently allowed and the timestamp of the next change, so a check is a
+    single comparison until that moment passes; only then is the next
+    transition searched again.
+    
+    Args:
+        settings (dict): As returned by get_notification_schedule_settings()
+        timezone_str (str): Zone to evaluate in, defaults to the configured
+            one or the system timezone
+    """
+    
+    def __init__(self, settings, timezone_str=None):
+        from datetime import timezone as tz
+        
+        self.settings = settings
+        self.notifications_enabled = settings["notifications_enabled"]
+        self.schedule_enabled = settings["schedule_enabled"]
+        self.working_days = frozenset(settings["working_days"])
+        self.active_start = settings["active_start"]
+        self.active_end = settings["active_end"]
+        self.window = get_active_window(self.active_start, self.active_end)
+        self.timezone = timezone_str or settings["timezone"] or get_system_timezone()
+        self.tzinfo = _get_tzinfo(self.timezone) or tz.utc
+        self._state = None
+        self._valid_from = 0.0
+        self._valid_until = 0.0
+    
+    @classmethod
+    def from_db(cls, db_path):
+        return cls(get_notification_schedule_settings(db_path))
+    
+    def key(self):
+        """Tuple identifying the effective schedule, to detect settings changes."""
+        return (self.notifications_enabled, self.schedule_enabled, self.working_days,
+                self.window, self.timezone)
+    
+    def _allowed_at(self, local):
+        if not self.notifications_enabled:
+            return False
+        if not self.schedule_enabled:
+            return True
+        if (local.weekday() + 1) % 7 not in self.working_days:
+            return False
+        return minutes_in_active_window(local.hour * 60 + local.minute, self.window)
+    
+    def _find_next_transition(self, now, state):
+        """Return the first timestamp after now where the allowed state differs, or None."""
+        from datetime import timedelta
+        
+        if not (self.notifications_enabled and self.schedule_enabled):
+            return None
+        start_mins, end_mins, _ = self.window
+        # The state can only change at midnight, at the window start or one
+        # minute after the window end (the end minute itself is active)
+        boundaries = sorted({0, start_mins, end_mins + 1} - {24 * 60})
+        today = datetime.fromtimestamp(now, self.tzinfo).date()
+        for offset in range(_SCHEDULE_LOOKAHEAD_DAYS):
+            day = today + timedelta(days=offset)
+            for mins in boundaries:
+                naive = datetime(day.year, day.month, day.day, mins // 60, mins % 60)
+                ts = _localize(self.tzinfo, naive).timestamp()
+                if ts <= now:
+                    continue
+                if self._allowed_at(datetime.fromtimestamp(ts, self.tzinfo)) != state:
+                    return ts
+        return None
+    
+    def _refresh(self, now):
+        self._state = self._allowed_at(datetime.fromtimestamp(now, self.tzinfo))
+        next_ts = self._find_next_transition(now, self._state)
+        self._valid_from = now
+        self._valid_until = next_ts if next_ts is not None else float("inf")
+    
+    def allowed(self, now=None):
+        """Return whether delivery is allowed at now (epoch seconds, default: current time)."""
+        if now is None:
+            now = time.time()
+        if not (self._valid_from <= now < self._valid_until):
+            self._refresh(now)
+        return self._state
+    
+    def next_transition(self, now=None):
+        """Return the epoch timestamp of the next allowed/disallowed change, or None if it never changes."""
+        if now is None:
+            now = time.time()
+        self.allowed(now)
+        return None if self._valid_until == float("inf") else self._valid_until
+    
+    def check(self, now=None):
+        """
+        Returns:
+            tuple: (should_send: bool, reason: str), as should_send_notification()
+        """
+        if now is None:
+            now = time.time()
+        allowed = self.allowed(now)
+        
+        if not self.notifications_enabled:
+            return (False, "Notifications are disabled by user")
+        if not self.schedule_enabled:
+            return (True, "Notification scheduling is disabled")
+        
+        if allowed:
+            return (True, f"Current time is within active hours ({self.active_start}-{self.active_end})")
+        
+        current_time = datetime.fromtimestamp(now, self.tzinfo)
+        our_day = (current_time.weekday() + 1) % 7
+        if our_day not in self.working_days:
+            working_day_names = [_DAY_NAMES[d] for d in sorted(self.working_days) if 0 <= d <= 6]
+            return (False, f"Today is {_DAY_NAMES[our_day]}, not a working day. "
+                          f"Working days: {', '.join(working_day_names)}")
+        return (False, f"Outside active hours. Current time: {current_time.strftime('%H:%M')} ({self.timezone}), "
+                      f"Active: {self.active_start}-{self.active_end}")
+
+
 def should_send_notification(db_path):
     """
     Determine if a notification should be sent based on current schedule settings.
     
-    This is the main function that the daemon should call before sending any notification.
     It checks:
     1. Whether notifications are enabled (master toggle)
     2. If scheduling is enabled, whether the current day is a working day
     3. If scheduling is enabled, whether the current time falls within active hours
     
+    Callers checking many notifications in a row should keep a
+    ScheduleEvaluator instead, which reads the settings only once.
+    
     Args:
         db_path: Path to the SQLite database
         
@@ -1022,45 +1192,7 @@ def should_send_notification(db_path):
             - reason: Human-readable explanation for the decision
     """
     try:
-        settings = get_notification_schedule_settings(db_path)
-        
-        # Check master notification toggle first
-        if not settings["notifications_enabled"]:
-            return (False, "Notifications are disabled by user")
-        
-        # If scheduling is disabled, always send notifications
-        if not settings["schedule_enabled"]:
-            return (True, "Notification scheduling is disabled")
-        
-        # Get effective timezone and current time for day-of-week check
-        effective_tz = settings["timezone"] if settings["timezone"] else get_system_timezone()
-        current_time = get_current_time_in_timezone(effective_tz)
-        
-        # Check if today is a working day
-        # Python weekday(): Mon=0..Sun=6 -> We store as 0=Sun,1=Mon,...,6=Sat
-        # Convert Python weekday to our format: (py_weekday + 1) % 7 maps Mon=1,Tue=2,...,Sun=0
-        py_weekday = current_time.weekday()  # Mon=0, Tue=1, ..., Sun=6
-        our_day = (py_weekday + 1) % 7       # Sun=0, Mon=1, ..., Sat=6
-        
-        if our_day not in settings["working_days"]:
-            day_names = ["Sun", "Mon", "Tue", "Wed", "Thu", "Fri", "Sat"]
-            working_day_names = [day_names[d] for d in sorted(settings["working_days"]) if 0 <= d <= 6]
-            return (False, f"Today is {day_names[our_day]}, not a working day. "
-                          f"Working days: {', '.join(working_day_names)}")
-        
-        # Check if current time is within active hours
-        is_active = is_within_active_hours(
-            settings["timezone"],
-            settings["active_start"],
-            settings["active_end"]
-        )
-        
-        if is_active:
-            return (True, f"Current time is within active hours ({settings['active_start']}-{settings['active_end']})")
-        else:
-            return (False, f"Outside active hours. Current time: {current_time.strftime('%H:%M')} ({effective_tz}), "
-                          f"Active: {settings['active_start']}-{settings['active_end']}")
-        
+        return ScheduleEvaluator.from_db(db_path).check()
     except Exception as e:
         log.error(f"[COMMON] Error checking notification schedule: {e}")
         # On error, default to sending notifications
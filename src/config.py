@@ -24,6 +24,8 @@
 import sqlite3
 import os
 
+from schema_manager import table_columns
+
 
 def initialize_app_settings_db(db_path="app_settings.db"):
     """
@@ -49,6 +51,7 @@ DEFAULT_SETTINGS = {
     "autosync_enabled": "true",
     "sync_interval_minutes": "15",
     "sync_direction": "both",  # "both", "download_only", "upload_only"
+    "sync_fetch_concurrency": "0",  # Models downloaded in parallel by the daemon (0/1 = one at a time)
     # Notification settings
     "notifications_enabled": "true",  # Master notification toggle
     # Notification Schedule settings
@@ -57,6 +60,8 @@ DEFAULT_SETTINGS = {
     "notification_active_start": "09:00",  # Start of active hours (HH:MM format)
     "notification_active_end": "18:00",  # End of active hours (HH:MM format)
     "notification_working_days": "1,2,3,4,5",  # Working days (0=Sun,1=Mon,...,6=Sat) - CSV
+    # Attachment cache
+    "attachment_cache_size_mb": "500",  # Disk budget for downloaded attachments
 }
 
 
@@ -145,8 +150,10 @@ def get_all_accounts(settings_db_path):
         with sqlite3.connect(settings_db_path) as conn:
             cur = conn.cursor()
             # Backward compatibility: older databases may not have per-account sync columns yet.
-            cur.execute("PRAGMA table_info(users)")
-            existing_columns = {row[1] for row in cur.fetchall()}
+            # Passing the connection revalidates the cached columns against its schema cookie.
+            existing_columns = table_columns(settings_db_path, "users", conn=conn)
+            if not existing_columns:
+                return []
 
             projected_columns = [
                 "id", "name", "link", "database", "username", "api_key",
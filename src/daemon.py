@@ -99,10 +99,13 @@ sys.path.insert(0, os.path.dirname(__file__))
 
 from config import get_all_accounts, get_setting, get_account_sync_settings, update_last_synced_at, DEFAULT_SETTINGS
 from odoo_client import OdooClient
-from sync_from_odoo import sync_all_from_odoo
+from sync_from_odoo import sync_all_from_odoo, sync_all_from_odoo_concurrent
 from sync_to_odoo import sync_all_to_odoo
-from common import add_notification, get_current_assignments_snapshot, detect_new_assignments, should_send_notification, get_user_info_by_odoo_id
-from logger import setup_logger
+from common import add_notification, get_current_assignments_snapshot, detect_new_assignments, get_user_info_by_odoo_id, invalidate_system_timezone_cache, ScheduleEvaluator
+from logger import setup_logger, flush_logging
+from sync_metrics import profile_sync, phase
+from schema_manager import ensure_schema
+from sync_coordinator import SyncJob, SyncPreempted, get_sync_holder
 
 log = setup_logger()
 
@@ -183,10 +186,13 @@ class NotificationDaemon:
         self.started_version = APP_VERSION  # Track version at startup for auto-restart
         self.managed_mode = managed_mode
         self._last_schedule_allowed = None
+        self._schedule = None  # ScheduleEvaluator, reloaded on each tick
+        self.schedule_timer_id = None  # GLib timer for the next active-hours transition
         # Per-account sync tracking: {account_id: {"last_synced": datetime_or_None, "interval": int, ...}}
         self.account_sync_schedule = {}
         self._ensure_notification_tracking_schema()
         self._init_dbus()
+        self._setup_timezone_watch()
         if self.managed_mode:
             self._write_pid_file()
             self._setup_signal_handlers()
@@ -223,81 +229,21 @@ class NotificationDaemon:
                 "sync_direction": "both"
             }
 
-    def _ensure_notification_tracking_schema(self):
-        """Ensure notification table has delivery tracking columns for replay logic."""
-        conn = None
+    def _get_fetch_concurrency(self):
+        """Number of models to download in parallel (sync_fetch_concurrency setting)."""
         try:
-            conn = sqlite3.connect(self.app_db)
-            cursor = conn.cursor()
-
-            cursor.execute(
-                """
-                CREATE TABLE IF NOT EXISTS notification (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    account_id INTEGER,
-                    timestamp TEXT DEFAULT (datetime('now')),
-                    message TEXT NOT NULL,
-                    type TEXT CHECK(type IN ('Activity', 'Task', 'Project', 'ProjectUpdate', 'Timesheet', 'Sync')),
-                    payload TEXT NOT NULL,
-                    read_status INTEGER DEFAULT 0,
-                    panel_invoked INTEGER DEFAULT 0
-                )
-                """
-            )
-
-            # Migrate CHECK constraint: SQLite cannot ALTER CHECK constraints,
-            # so we must recreate the table if old constraint is missing 'ProjectUpdate'
-            cursor.execute("SELECT sql FROM sqlite_master WHERE type='table' AND name='notification'")
-            row = cursor.fetchone()
-            if row and row[0] and 'ProjectUpdate' not in row[0]:
-                log.info("[DAEMON] Migrating notification table to add 'ProjectUpdate' type...")
-                try:
-                    cursor.execute("BEGIN")
-                    cursor.execute("ALTER TABLE notification RENAME TO notification_old")
-                    cursor.execute("PRAGMA table_info(notification_old)")
-                    old_columns = {column_row[1] for column_row in cursor.fetchall()}
-                    panel_invoked_select = "COALESCE(panel_invoked, 0)" if "panel_invoked" in old_columns else "0"
-                    cursor.execute(
-                        """
-                        CREATE TABLE notification (
-                            id INTEGER PRIMARY KEY AUTOINCREMENT,
-                            account_id INTEGER,
-                            timestamp TEXT DEFAULT (datetime('now')),
-                            message TEXT NOT NULL,
-                            type TEXT CHECK(type IN ('Activity', 'Task', 'Project', 'ProjectUpdate', 'Timesheet', 'Sync')),
-                            payload TEXT NOT NULL,
-                            read_status INTEGER DEFAULT 0,
-                            panel_invoked INTEGER DEFAULT 0
-                        )
-                        """
-                    )
-                    cursor.execute(
-                        f"""
-                        INSERT INTO notification (id, account_id, timestamp, message, type, payload, read_status, panel_invoked)
-                        SELECT id, account_id, timestamp, message, type, payload, read_status,
-                               {panel_invoked_select} FROM notification_old
-                        """
-                    )
-                    cursor.execute("DROP TABLE notification_old")
-                    cursor.execute("COMMIT")
-                    log.info("[DAEMON] Notification table migrated successfully (added 'ProjectUpdate' type)")
-                except Exception as migration_err:
-                    log.error(f"[DAEMON] Migration failed, rolling back: {migration_err}", exc_info=True)
-                    cursor.execute("ROLLBACK")
-                    raise
-
-            cursor.execute("PRAGMA table_info(notification)")
-            columns = {row[1] for row in cursor.fetchall()}
-            if "panel_invoked" not in columns:
-                cursor.execute("ALTER TABLE notification ADD COLUMN panel_invoked INTEGER DEFAULT 0")
-                log.info("[DAEMON] Added notification.panel_invoked column")
+            return max(0, int(get_setting(self.app_db, "sync_fetch_concurrency")))
+        except (TypeError, ValueError) as e:
+            log.warning(f"[DAEMON] Invalid sync_fetch_concurrency setting, fetching sequentially: {e}")
+            return 0
 
-            conn.commit()
+    def _ensure_notification_tracking_schema(self):
+        """Apply pending schema migrations (notification table, sync metrics, attachment cache, sync indexes)."""
+        try:
+            version = ensure_schema(self.app_db)
+            log.debug(f"[DAEMON] Database schema version {version}")
         except Exception as e:
             log.error(f"[DAEMON] Failed to ensure notification tracking schema: {e}")
-        finally:
-            if conn:
-                conn.close()
 
     def _panel_invoked_from_result(self, delivery_result):
         """Convert send_notification diagnostics to a DB-friendly invoked flag."""
@@ -316,15 +262,66 @@ class NotificationDaemon:
         except (TypeError, ValueError):
             return str(value).strip() or None
 
+    def _refresh_schedule(self):
+        """Reload notification schedule settings and re-arm the transition timer if they changed."""
+        try:
+            schedule = ScheduleEvaluator.from_db(self.app_db)
+        except Exception as e:
+            log.error(f"[DAEMON] Failed to load notification schedule: {e}")
+            return self._schedule
+        previous = self._schedule
+        self._schedule = schedule
+        if previous is None or previous.key() != schedule.key() or self.schedule_timer_id is None:
+            self._arm_schedule_timer()
+        return schedule
+
+    def _check_schedule(self):
+        """Return (allowed, reason) from the loaded schedule without reading the database."""
+        try:
+            schedule = self._schedule or self._refresh_schedule()
+            return schedule.check()
+        except Exception as e:
+            log.error(f"[DAEMON] Failed to evaluate schedule state: {e}")
+            return (True, f"Error checking schedule: {e}")
+
     def _is_schedule_active_now(self):
         """Return whether notification schedule currently allows panel delivery."""
+        allowed, reason = self._check_schedule()
+        log.debug(f"[DAEMON] Schedule active={allowed}: {reason}")
+        return allowed
+
+    def _arm_schedule_timer(self):
+        """Schedule a one-shot callback at the next active-hours transition."""
+        if self.schedule_timer_id:
+            GLib.source_remove(self.schedule_timer_id)
+            self.schedule_timer_id = None
+        if self._schedule is None:
+            return
+        next_ts = self._schedule.next_transition()
+        if next_ts is None:
+            log.debug("[DAEMON] Notification schedule has no upcoming transition")
+            return
+        delay = max(1, int(next_ts - time.time()) + 1)
+        self.schedule_timer_id = GLib.timeout_add_seconds(delay, self._on_schedule_transition)
+        log.info(f"[DAEMON] Next notification schedule transition in {delay}s "
+                 f"({datetime.fromtimestamp(next_ts).strftime('%Y-%m-%d %H:%M')})")
+
+    def _on_schedule_transition(self):
+        """Timer callback at an active-hours boundary: replay deferred notifications when entering."""
+        self.schedule_timer_id = None
         try:
-            allowed, reason = should_send_notification(self.app_db)
-            log.debug(f"[DAEMON] Schedule active={allowed}: {reason}")
-            return allowed
+            self._apply_schedule_state(self._is_schedule_active_now())
         except Exception as e:
-            log.error(f"[DAEMON] Failed to evaluate schedule state: {e}")
-            return True
+            log.error(f"[DAEMON] Schedule transition handling failed: {e}")
+        self._arm_schedule_timer()
+        return False  # One-shot; re-armed above for the following transition
+
+    def _apply_schedule_state(self, current_schedule_allowed):
+        """Record the schedule state and replay deferred notifications on entering active hours."""
+        if self._last_schedule_allowed in (None, False) and current_schedule_allowed is True:
+            log.info("[DAEMON] Schedule transitioned to active hours, replaying deferred notifications")
+            self._replay_deferred_notifications_summary()
+        self._last_schedule_allowed = current_schedule_allowed
 
     def _replay_deferred_notifications_summary(self):
         """Send a single summary toast for unread notifications deferred outside active hours."""
@@ -412,10 +409,8 @@ class NotificationDaemon:
                 script_path = os.path.abspath(__file__)
                 log.info(f"[DAEMON] Executing: {python_exe} {script_path}")
                 
-                # Flush logs before restart
-                import logging
-                for handler in logging.root.handlers:
-                    handler.flush()
+                # Flush logs before restart (execv skips atexit handlers)
+                flush_logging()
                 
                 os.execv(python_exe, [python_exe, script_path])
                 # This line is never reached - execv replaces the process
@@ -484,6 +479,7 @@ class NotificationDaemon:
         self._save_last_check_times()
         self._release_wakelock()  # Release wakelock before exiting
         self._cleanup_pid_file()
+        flush_logging()
         if self.loop:
             self.loop.quit()
     
@@ -650,6 +646,28 @@ class NotificationDaemon:
         except Exception as e:
             log.warning(f"[DAEMON] Failed to register suspend handler: {e}")
     
+    def _setup_timezone_watch(self):
+        """Drop the cached system timezone when timedated reports a timezone change."""
+        try:
+            system_bus = dbus.SystemBus()
+            system_bus.add_signal_receiver(
+                self._handle_timedate_changed,
+                signal_name='PropertiesChanged',
+                dbus_interface='org.freedesktop.DBus.Properties',
+                bus_name='org.freedesktop.timedate1',
+                path='/org/freedesktop/timedate1'
+            )
+            log.info("[DAEMON] Timezone change handler registered with timedated")
+        except Exception as e:
+            log.warning(f"[DAEMON] Failed to register timezone change handler: {e}")
+
+    def _handle_timedate_changed(self, interface, changed, invalidated):
+        """Handle PropertiesChanged from org.freedesktop.timedate1."""
+        if 'Timezone' in changed or 'Timezone' in invalidated:
+            log.info(f"[DAEMON] System timezone changed to {changed.get('Timezone', 'unknown')}")
+            invalidate_system_timezone_cache()
+            self._refresh_schedule()
+
     def _handle_sleep_signal(self, sleeping):
         """Handle PrepareForSleep signal from logind.
         
@@ -664,6 +682,8 @@ class NotificationDaemon:
             log.info("[DAEMON] System waking up - refreshing wakelocks and scheduling sync")
             # Re-acquire wakelock after wake
             self._request_wakelock()
+            # GLib timers do not advance while suspended
+            self._arm_schedule_timer()
             # Schedule immediate sync after short delay
             GLib.timeout_add_seconds(5, self._sync_after_wake)
     
@@ -706,7 +726,7 @@ class NotificationDaemon:
         }
 
         # Check if notification should be sent based on schedule settings
-        should_send, reason = should_send_notification(self.app_db)
+        should_send, reason = self._check_schedule()
         result["schedule_allowed"] = should_send
         result["schedule_reason"] = reason
 
@@ -1363,14 +1383,14 @@ class NotificationDaemon:
 
     def sync_account(self, account, sync_direction="both"):
         """Sync a single account and check for updates.
-        
+
         Args:
             account: Account dictionary with connection details
             sync_direction: "both", "download_only", or "upload_only"
         """
         account_id = account["id"]
         account_name = account.get("name", "Unknown")
-        
+
         # Map config keys to OdooClient expected keys
         # config.py returns: id, name, link, database, username, api_key
         account_url = account.get("link")
@@ -1383,95 +1403,140 @@ class NotificationDaemon:
             log.info(f"[DAEMON] Skipping local/invalid account: {account_name}")
             return
 
-        # Get current user ID for assignment tracking
-        current_user_id = self.get_current_user_id(account_id, account_user)
-        
-        # CRITICAL: Capture assignment snapshot BEFORE sync
-        # This allows us to detect NEW assignments by comparing pre/post sync state
-        pre_sync_snapshot = get_current_assignments_snapshot(self.app_db, account_id, current_user_id)
-        log.info(f"[DAEMON] Pre-sync snapshot captured for {account_name}")
+        # One sync per account across processes; the app may attach to or take over this run
+        job = SyncJob(account_id, "daemon", sync_direction)
+        if not job.acquire():
+            holder = get_sync_holder(account_id) or {}
+            log.info(f"[DAEMON] Account {account_name} is already being synced by "
+                     f"{holder.get('owner', 'another process')} (pid {holder.get('pid', '?')}), skipping")
+            return
 
+        state = "failed"
         try:
-            log.info(f"[DAEMON] Syncing account: {account_name} (ID: {account_id}) [direction: {sync_direction}]")
-            
-            # Update heartbeat before creating client
-            self._update_heartbeat()
-            
-            # Create Odoo client (authenticates automatically)
-            client = OdooClient(
-                url=account_url,
-                db=account_db,
-                username=account_user,
-                password=account_pass
-            )
-            log.info(f"[DAEMON] OdooClient created for {account_name}")
-            
-            # Update heartbeat after client creation
-            self._update_heartbeat()
-            
-            # UPLOAD FIRST: Sync local changes to Odoo (prevents overwrites)
-            if sync_direction in ("both", "upload_only"):
+            # Record per-phase timings for this run in sync_metrics
+            with profile_sync(self.app_db, account_id, "daemon", sync_direction):
+                # Get current user ID for assignment tracking
+                current_user_id = self.get_current_user_id(account_id, account_user)
+
+                # CRITICAL: Capture assignment snapshot BEFORE sync
+                # This allows us to detect NEW assignments by comparing pre/post sync state
+                with phase("snapshot"):
+                    pre_sync_snapshot = get_current_assignments_snapshot(self.app_db, account_id, current_user_id)
+                log.info(f"[DAEMON] Pre-sync snapshot captured for {account_name}")
+
                 try:
-                    log.info(f"[DAEMON] Starting sync_all_to_odoo for {account_name}")
-                    self._update_heartbeat()
-                    
-                    sync_all_to_odoo(client, account_id, self.settings_db)
-                    
+                    log.info(f"[DAEMON] Syncing account: {account_name} (ID: {account_id}) [direction: {sync_direction}]")
+
+                    # Update heartbeat before creating client
                     self._update_heartbeat()
-                    log.info(f"[DAEMON] sync_all_to_odoo completed for {account_name}")
-                    
-                    # Clean up memory after upload sync
-                    self._cleanup_memory()
-                    
-                except Exception as upload_error:
-                    log.error(f"[DAEMON] sync_all_to_odoo failed: {upload_error}")
-                    log.error(f"[DAEMON] Upload sync error traceback: {traceback.format_exc()}")
-                    # Continue with download sync
-            
-            # DOWNLOAD: Sync data from Odoo to device
-            if sync_direction in ("both", "download_only"):
-                try:
-                    log.info(f"[DAEMON] Starting sync_all_from_odoo for {account_name}")
+
+                    # Create Odoo client (authenticates automatically)
+                    with phase("login"):
+                        client = OdooClient(
+                            url=account_url,
+                            db=account_db,
+                            username=account_user,
+                            password=account_pass
+                        )
+                    log.info(f"[DAEMON] OdooClient created for {account_name}")
+
+                    # Update heartbeat after client creation
                     self._update_heartbeat()
-                    
-                    sync_all_from_odoo(client, account_id, self.settings_db, account_name=account_name)
-                    
+                    job.update(progress=25)
+
+                    # UPLOAD FIRST: Sync local changes to Odoo (prevents overwrites)
+                    if sync_direction in ("both", "upload_only"):
+                        job.check_preempted()
+                        job.update(message="Syncing to Server")
+                        try:
+                            log.info(f"[DAEMON] Starting sync_all_to_odoo for {account_name}")
+                            self._update_heartbeat()
+
+                            sync_all_to_odoo(client, account_id, self.settings_db)
+
+                            self._update_heartbeat()
+                            log.info(f"[DAEMON] sync_all_to_odoo completed for {account_name}")
+
+                            # Clean up memory after upload sync
+                            self._cleanup_memory()
+
+                        except SyncPreempted:
+                            raise
+                        except Exception as upload_error:
+                            log.error(f"[DAEMON] sync_all_to_odoo failed: {upload_error}")
+                            log.error(f"[DAEMON] Upload sync error traceback: {traceback.format_exc()}")
+                            # Continue with download sync
+
+                    # DOWNLOAD: Sync data from Odoo to device
+                    if sync_direction in ("both", "download_only"):
+                        job.check_preempted()
+                        job.update(progress=50, message="Syncing from Server")
+                        try:
+                            log.info(f"[DAEMON] Starting sync_all_from_odoo for {account_name}")
+                            self._update_heartbeat()
+
+                            concurrency = self._get_fetch_concurrency()
+                            if concurrency > 1:
+                                sync_all_from_odoo_concurrent(
+                                    client, account_id, self.settings_db, account_name=account_name,
+                                    max_concurrency=concurrency, checkpoint=job.check_preempted,
+                                )
+                            else:
+                                sync_all_from_odoo(client, account_id, self.settings_db, account_name=account_name,
+                                                   checkpoint=job.check_preempted)
+
+                            self._update_heartbeat()
+                            log.info(f"[DAEMON] sync_all_from_odoo completed for {account_name}")
+
+                            # Clean up memory after download sync
+                            self._cleanup_memory()
+
+                        except SyncPreempted:
+                            raise
+                        except Exception as sync_error:
+                            log.error(f"[DAEMON] sync_all_from_odoo failed: {sync_error}")
+                            log.error(f"[DAEMON] Sync error traceback: {traceback.format_exc()}")
+                            # Continue with notification check using existing data
+
+                    # Update heartbeat after sync
                     self._update_heartbeat()
-                    log.info(f"[DAEMON] sync_all_from_odoo completed for {account_name}")
-                    
-                    # Clean up memory after download sync
+                    job.update(progress=90, message="Checking for new assignments")
+
+                    # Check for NEW assignments only (compare post-sync with pre-sync snapshot)
+                    log.info(f"[DAEMON] Checking for new assignments for {account_name}")
+                    with phase("notifications"):
+                        self.check_for_new_assignments(account_id, account_name, current_user_id, pre_sync_snapshot)
+
+                    log.info(f"[DAEMON] Sync completed for {account_name}")
+
+                    # Final memory cleanup after account processing
                     self._cleanup_memory()
-                    
-                except Exception as sync_error:
-                    log.error(f"[DAEMON] sync_all_from_odoo failed: {sync_error}")
-                    log.error(f"[DAEMON] Sync error traceback: {traceback.format_exc()}")
-                    # Continue with notification check using existing data
-            
-            # Update heartbeat after sync
-            self._update_heartbeat()
-            
-            # Check for NEW assignments only (compare post-sync with pre-sync snapshot)
-            log.info(f"[DAEMON] Checking for new assignments for {account_name}")
-            self.check_for_new_assignments(account_id, account_name, current_user_id, pre_sync_snapshot)
-            
-            log.info(f"[DAEMON] Sync completed for {account_name}")
-            
-            # Final memory cleanup after account processing
-            self._cleanup_memory()
-            
-            # Record successful sync timestamp in the database
-            update_last_synced_at(self.app_db, account_id)
-            
-        except Exception as e:
-            log.error(f"[DAEMON] Error syncing account {account_name}: {e}")
-            log.error(f"[DAEMON] Error traceback: {traceback.format_exc()}")
-            # On sync error, we still have the pre_sync_snapshot, so we can check for any
-            # assignments that might have been partially synced
-            try:
-                self.check_for_new_assignments(account_id, account_name, current_user_id, pre_sync_snapshot)
-            except Exception as e2:
-                log.error(f"[DAEMON] Failed to check assignments after error: {e2}")
-    
+
+                    # Record successful sync timestamp in the database
+                    update_last_synced_at(self.app_db, account_id)
+                    state = "completed"
+
+                except SyncPreempted as e:
+                    state = "preempted"
+                    log.info(f"[DAEMON] Sync of {account_name} stopped: {e}")
+                    # Still notify about assignments downloaded before the hand-over
+                    try:
+                        self.check_for_new_assignments(account_id, account_name, current_user_id, pre_sync_snapshot)
+                    except Exception as e2:
+                        log.error(f"[DAEMON] Failed to check assignments after hand-over: {e2}")
+                except Exception as e:
+                    log.error(f"[DAEMON] Error syncing account {account_name}: {e}")
+                    log.error(f"[DAEMON] Error traceback: {traceback.format_exc()}")
+                    # On sync error, we still have the pre_sync_snapshot, so we can check for any
+                    # assignments that might have been partially synced
+                    try:
+                        self.check_for_new_assignments(account_id, account_name, current_user_id, pre_sync_snapshot)
+                    except Exception as e2:
+                        log.error(f"[DAEMON] Failed to check assignments after error: {e2}")
+        finally:
+            job.finish(state)
+
+
     def sync_all_accounts(self, accounts_to_sync=None):
         """Sync accounts using per-account settings.
         
@@ -1562,6 +1627,9 @@ class NotificationDaemon:
         # Schedule tick-based timer (checks per-account intervals every 60 seconds)
         self._schedule_tick_timer()
         
+        # Load the notification schedule and arm the timer for its next transition
+        self._refresh_schedule()
+
         # Schedule heartbeat update every 30 seconds
         GLib.timeout_add_seconds(30, self._heartbeat_callback)
         
@@ -1606,6 +1674,9 @@ class NotificationDaemon:
             # Read global settings
             global_settings = self._get_sync_settings()
 
+            # Reload schedule settings once per tick; notifications sent during
+            # this tick's sync reuse the loaded evaluator
+            self._refresh_schedule()
             current_schedule_allowed = self._is_schedule_active_now()
             
             # Global kill switch
@@ -1672,11 +1743,9 @@ class NotificationDaemon:
             else:
                 log.debug(f"[DAEMON] Tick: no accounts due for sync")
 
-            if self._last_schedule_allowed in (None, False) and current_schedule_allowed is True:
-                log.info("[DAEMON] Schedule transitioned to active hours, replaying deferred notifications")
-                self._replay_deferred_notifications_summary()
-
-            self._last_schedule_allowed = current_schedule_allowed
+            # Normally handled by the transition timer; this catches settings
+            # changes and clock jumps between timer firings
+            self._apply_schedule_state(current_schedule_allowed)
                 
         except Exception as e:
             log.error(f"[DAEMON] Tick failed: {e}")
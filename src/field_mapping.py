@@ -0,0 +1,483 @@
+# -*- coding: utf-8 -*-
+# MIT License
+#
+# Copyright (c) 2025 CIT-Services
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Shared field mapping registry for both sync engines.
+
+field_config.json is parsed once per process and re-read only when its
+modification time changes. Each model mapping is validated and precompiled
+into column lists, SQL statement text and value converters so the per-record
+sync paths never touch the JSON file.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from sync_indexes import PENDING_STATUS_SQL
+
+log = logging.getLogger("odoo_sync")
+
+DEFAULT_CONFIG_PATH = "field_config.json"
+
+_SAFE_IDENTIFIER_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def convert_value(val, odoo_field=""):
+    """
+    Convert a raw Odoo value into something SQLite can store.
+
+    Args:
+        val: Value as returned by XML-RPC
+        odoo_field (str): Field name, used only for logging
+
+    Returns:
+        int, float, str or None
+
+    Note:
+        one2many/many2many id lists become comma-separated strings, many2one
+        [id, "name"] pairs become the id, booleans become 0/1 and anything
+        else falls back to str().
+    """
+    if isinstance(val, list) and val:
+        if all(isinstance(v, int) for v in val):
+            val = ",".join(str(v) for v in val)
+        else:
+            # many2one field: [id, "name"] - extract just the ID
+            val = val[0]
+
+    # Convert boolean to integer (SQLite doesn't support bool)
+    if isinstance(val, bool):
+        val = int(val)
+
+    # Ensure datetime is stored in ISO format if it's a datetime object
+    if isinstance(val, datetime):
+        val = val.isoformat()
+
+    if val is None or isinstance(val, (int, float, str)):
+        return val
+    try:
+        return str(val)  # fallback (for fields like selection or state)
+    except Exception as e:
+        log.warning(f"[WARN] Unable to convert field {odoo_field}: {e}")
+        return None
+
+
+def _convert_many2one(val, odoo_field=""):
+    # [id, "name"] -> id; False and anything unusual take the generic path
+    if val.__class__ is list and len(val) == 2 and val[1].__class__ is str:
+        return val[0]
+    return convert_value(val, odoo_field)
+
+
+def _convert_x2many(val, odoo_field=""):
+    if val.__class__ is list and val:
+        for v in val:
+            if v.__class__ is not int:
+                return convert_value(val, odoo_field)
+        return ",".join(map(str, val))
+    return convert_value(val, odoo_field)
+
+
+def _convert_boolean(val, odoo_field=""):
+    if val is True:
+        return 1
+    if val is False:
+        return 0
+    return convert_value(val, odoo_field)
+
+
+def _convert_text(val, odoo_field=""):
+    if val.__class__ is str:
+        return val
+    return convert_value(val, odoo_field)
+
+
+def _convert_number(val, odoo_field=""):
+    cls = val.__class__
+    if cls is int or cls is float:
+        return val
+    return convert_value(val, odoo_field)
+
+
+# Odoo fields_get type -> converter. Every fast path falls back to
+# convert_value for values it does not recognise, so the stored result is
+# identical to the generic conversion.
+TYPE_CONVERTERS = {
+    "many2one": _convert_many2one,
+    "one2many": _convert_x2many,
+    "many2many": _convert_x2many,
+    "boolean": _convert_boolean,
+    "char": _convert_text,
+    "text": _convert_text,
+    "html": _convert_text,
+    "selection": _convert_text,
+    "date": _convert_text,
+    "datetime": _convert_text,
+    "integer": _convert_number,
+    "float": _convert_number,
+    "monetary": _convert_number,
+}
+
+
+def converter_for_type(field_type):
+    """Return the converter for an Odoo field type (generic if unknown)."""
+    return TYPE_CONVERTERS.get(field_type, convert_value)
+
+
+class RowConverter:
+    """
+    Per-(model, table schema, field types) compiled record converter.
+
+    Built once by ModelMapping.row_converter() and reused for every record
+    of a sync run. Turns an Odoo record dict into the value list for the
+    cached upsert statement.
+
+    Attributes:
+        check_sql (str or None): SELECT for the local status/favorites/state
+        check_fields (tuple): Columns returned by check_sql, in order
+        favorites_index (int or None): Position of 'favorites' in the row
+        state_index (int or None): Position of activity 'state' in the row
+    """
+
+    __slots__ = (
+        "mapping",
+        "table_name",
+        "check_sql",
+        "check_fields",
+        "favorites_index",
+        "state_index",
+        "_steps",
+    )
+
+    def __init__(self, mapping, table_name, table_columns, field_types):
+        self.mapping = mapping
+        self.table_name = table_name
+        field_types = field_types or {}
+
+        steps = []
+        self.favorites_index = None
+        self.state_index = None
+        for odoo_field, sqlite_field in zip(mapping.odoo_fields, mapping.sqlite_columns):
+            if sqlite_field == "account_id":
+                continue  # appended separately
+            if sqlite_field == "favorites":
+                self.favorites_index = len(steps)
+            elif sqlite_field == "state" and table_name == "mail_activity_app":
+                self.state_index = len(steps)
+            steps.append((odoo_field, converter_for_type(field_types.get(odoo_field))))
+        self._steps = tuple(steps)
+
+        check_fields = []
+        if "status" in table_columns:
+            check_fields.append("status")
+        if "favorites" in table_columns:
+            check_fields.append("favorites")
+        if table_name == "mail_activity_app" and "state" in table_columns:
+            check_fields.append("state")
+        self.check_fields = tuple(check_fields)
+        self.check_sql = (
+            f"SELECT {', '.join(check_fields)} FROM {table_name} "
+            f"WHERE odoo_record_id = ? AND account_id = ?"
+            if check_fields else None
+        )
+
+    def convert(self, record, account_id):
+        """
+        Convert a record into upsert values (without the optional status).
+
+        Args:
+            record (dict): Record as returned by search_read
+            account_id (int): Local account id, appended last
+
+        Returns:
+            list: Values matching ModelMapping.upsert_columns()
+        """
+        get = record.get
+        values = [convert(get(odoo_field), odoo_field) for odoo_field, convert in self._steps]
+        values.append(account_id)
+        return values
+
+    def upsert_sql(self, preserve_status=False):
+        """Return the cached upsert statement for this table."""
+        return self.mapping.upsert_sql(self.table_name, preserve_status)
+
+
+class ModelMapping:
+    """
+    Precompiled field mapping for a single Odoo model.
+
+    Attributes:
+        model_name (str): Odoo model name
+        fields (dict): Odoo field name -> SQLite column name
+        odoo_fields (tuple): Odoo field names in config order
+        sqlite_columns (tuple): SQLite column names in config order
+    """
+
+    __slots__ = (
+        "model_name",
+        "fields",
+        "odoo_fields",
+        "sqlite_columns",
+        "_sql_cache",
+    )
+
+    def __init__(self, model_name, fields):
+        self.model_name = model_name
+        self.fields = dict(fields)
+        self.odoo_fields = tuple(self.fields.keys())
+        self.sqlite_columns = tuple(self.fields.values())
+        self._sql_cache = {}
+
+    def row_converter(self, table_name, table_columns, field_types=None):
+        """
+        Return a RowConverter compiled for a table schema and field types.
+
+        Args:
+            table_name (str): Validated SQLite table name
+            table_columns (iterable): Columns present in the local table
+            field_types (dict): Odoo field name -> fields_get type, optional
+
+        Returns:
+            RowConverter: Cached per distinct (table, columns, types) key.
+        """
+        types_key = tuple(
+            (f, field_types.get(f)) for f in self.odoo_fields
+        ) if field_types else ()
+        key = ("row", table_name, tuple(table_columns), types_key)
+        converter = self._sql_cache.get(key)
+        if converter is None:
+            converter = RowConverter(self, table_name, table_columns, field_types)
+            self._sql_cache[key] = converter
+        return converter
+
+    def __bool__(self):
+        return bool(self.fields)
+
+    def upsert_columns(self, preserve_status=False):
+        """
+        Return the column order used by insert_record for this model.
+
+        Args:
+            preserve_status (bool): Append the local 'status' column
+
+        Returns:
+            tuple: Mapped columns (without account_id), then account_id and
+                   optionally status.
+        """
+        key = ("columns", preserve_status)
+        columns = self._sql_cache.get(key)
+        if columns is None:
+            columns = tuple(c for c in self.sqlite_columns if c != "account_id")
+            columns += ("account_id",)
+            if preserve_status:
+                columns += ("status",)
+            self._sql_cache[key] = columns
+        return columns
+
+    def upsert_sql(self, table_name, preserve_status=False):
+        """
+        Return the cached INSERT ... ON CONFLICT statement for a table.
+
+        Args:
+            table_name (str): Validated SQLite table name
+            preserve_status (bool): Include the local 'status' column
+
+        Returns:
+            str: SQL statement with one placeholder per upsert column
+        """
+        key = ("upsert", table_name, preserve_status)
+        sql = self._sql_cache.get(key)
+        if sql is None:
+            columns = self.upsert_columns(preserve_status)
+            placeholders = ", ".join(["?"] * len(columns))
+            update_columns = [column for column in columns if column != "odoo_record_id"]
+            update_clause = ", ".join(f"{column} = excluded.{column}" for column in update_columns)
+            sql = (
+                f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({placeholders}) "
+                f"ON CONFLICT(odoo_record_id, account_id) DO UPDATE SET {update_clause}"
+            )
+            self._sql_cache[key] = sql
+        return sql
+
+    def local_select_columns(self):
+        """Return the column list selected by sync_to_odoo.get_local_records."""
+        return ("id",) + self.sqlite_columns + ("status", "odoo_record_id")
+
+    def local_select_sql(self, table_name, pending_only=False):
+        """
+        Return the cached SELECT used to read local rows for an account.
+
+        Args:
+            table_name (str): Validated SQLite table name
+            pending_only (bool): Only rows with status 'updated' or 'deleted',
+                matching the partial index from sync_indexes (stored
+                statuses are normalized, see normalize_status_values)
+
+        Returns:
+            str: SQL statement with a single account_id placeholder
+        """
+        key = ("select", table_name, pending_only)
+        sql = self._sql_cache.get(key)
+        if sql is None:
+            sql = f"SELECT {', '.join(self.local_select_columns())} FROM {table_name} WHERE account_id = ?"
+            if pending_only:
+                sql += f" AND {PENDING_STATUS_SQL}"
+            self._sql_cache[key] = sql
+        return sql
+
+
+_EMPTY_MAPPING = ModelMapping("", {})
+
+
+class FieldMappingRegistry:
+    """
+    Process-wide cache of parsed field_config.json files.
+
+    Entries are keyed by resolved path and revalidated with a single stat()
+    call, so edits to the config are picked up without restarting the daemon.
+    """
+
+    def __init__(self, base_dir=None):
+        self.base_dir = Path(base_dir or Path(__file__).parent).resolve()
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def _resolve(self, config_path):
+        return self.base_dir / (config_path or DEFAULT_CONFIG_PATH)
+
+    def _parse(self, full_path):
+        with open(full_path, "r") as f:
+            raw = json.load(f)
+        if not isinstance(raw, dict):
+            raise ValueError("top level must be an object of model mappings")
+
+        models = {}
+        for model_name, fields in raw.items():
+            if not isinstance(fields, dict):
+                log.warning(f"[CONFIG] Ignoring mapping for '{model_name}': expected an object")
+                continue
+            valid = {}
+            for odoo_field, sqlite_field in fields.items():
+                if not (
+                    isinstance(odoo_field, str)
+                    and isinstance(sqlite_field, str)
+                    and _SAFE_IDENTIFIER_PATTERN.fullmatch(sqlite_field)
+                ):
+                    log.warning(
+                        f"[CONFIG] Ignoring invalid mapping {odoo_field!r} -> {sqlite_field!r} for '{model_name}'"
+                    )
+                    continue
+                valid[odoo_field] = sqlite_field
+            models[model_name] = ModelMapping(model_name, valid)
+        return models
+
+    def get_models(self, config_path=DEFAULT_CONFIG_PATH):
+        """
+        Return all compiled model mappings for a config file.
+
+        Args:
+            config_path (str): Config path, relative to src/ unless absolute
+
+        Returns:
+            dict: Model name -> ModelMapping. Empty dict if the file is
+                  missing or unparsable.
+        """
+        full_path = self._resolve(config_path)
+        try:
+            st = os.stat(full_path)
+        except OSError as e:
+            log.debug(f"[ERROR] Failed to stat field mapping at {full_path}: {e}")
+            try:
+                log.debug(f"[DEBUG] Contents of {self.base_dir}: {os.listdir(self.base_dir)}")
+            except Exception as dir_err:
+                log.debug(f"[ERROR] Failed to list contents of {self.base_dir}: {dir_err}")
+            return {}
+
+        stamp = (st.st_mtime_ns, st.st_size)
+        entry = self._entries.get(full_path)
+        if entry is not None and entry[0] == stamp:
+            return entry[1]
+
+        with self._lock:
+            entry = self._entries.get(full_path)
+            if entry is not None and entry[0] == stamp:
+                return entry[1]
+            try:
+                models = self._parse(full_path)
+            except Exception as e:
+                log.error(f"[CONFIG] Failed to load field mapping from {full_path}: {e}")
+                # Keep serving the last good copy if the file is mid-edit
+                return entry[1] if entry is not None else {}
+            if entry is not None:
+                log.info(f"[CONFIG] Reloaded field mapping from {full_path}")
+            self._entries[full_path] = (stamp, models)
+            return models
+
+    def get(self, model_name, config_path=DEFAULT_CONFIG_PATH):
+        """Return the ModelMapping for a model (empty mapping if unknown)."""
+        return self.get_models(config_path).get(model_name, _EMPTY_MAPPING)
+
+    def clear(self):
+        """Drop every cached config so the next lookup re-reads from disk."""
+        with self._lock:
+            self._entries.clear()
+
+
+registry = FieldMappingRegistry()
+
+
+def get_model_mapping(model_name, config_path=DEFAULT_CONFIG_PATH):
+    """
+    Return the compiled mapping for a model from the shared registry.
+
+    Args:
+        model_name (str): Odoo model name
+        config_path (str): Path to the field configuration JSON file
+
+    Returns:
+        ModelMapping: Falsy when the model has no mapping.
+    """
+    return registry.get(model_name, config_path)
+
+
+def load_field_mapping(model_name, config_path=DEFAULT_CONFIG_PATH):
+    """
+    Load field mapping configuration for a specific Odoo model.
+
+    Args:
+        model_name (str): Name of the Odoo model to load mapping for
+        config_path (str): Path to the field configuration JSON file
+
+    Returns:
+        dict: Field mapping dictionary where keys are Odoo field names
+              and values are SQLite field names. Returns empty dict on error.
+
+    Note:
+        Returns a copy so callers may mutate it without touching the cache.
+    """
+    return dict(registry.get(model_name, config_path).fields)
@@ -22,50 +22,264 @@
 # SOFTWARE.
 
 # logger.py
+import atexit
 import logging
+import queue
 import sys
+import threading
 from logging import Handler, Formatter
-from logging.handlers import RotatingFileHandler
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
 from datetime import datetime
 from pathlib import Path
+from collections import deque
 import json
 import os
+import time
 
 
-class FlushingStreamHandler(logging.StreamHandler):
-    """StreamHandler that flushes after every emit for immediate log visibility."""
+# Batched sinks flush at most this often, or immediately for WARNING and above
+FLUSH_INTERVAL = 1.0
+FLUSH_LEVEL = logging.WARNING
+
+_listeners = []
+_listener_lock = threading.Lock()
+
+
+class _BatchFlushMixin:
+    """Write without flushing; flush on an interval or for important records."""
+
+    def _init_batching(self, flush_interval, flush_level):
+        self.flush_interval = flush_interval
+        self.flush_level = flush_level
+        self._last_flush = time.monotonic()
+
+    def _write_batched(self, record):
+        try:
+            msg = self.format(record)
+            self.stream.write(msg + self.terminator)
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+            return
+        now = time.monotonic()
+        if record.levelno >= self.flush_level or now - self._last_flush >= self.flush_interval:
+            self.flush()
+            self._last_flush = now
+
+
+class BatchFlushingStreamHandler(_BatchFlushMixin, logging.StreamHandler):
+    """StreamHandler that batches flushes; used behind the logging queue."""
+
+    def __init__(self, stream=None, flush_interval=FLUSH_INTERVAL, flush_level=FLUSH_LEVEL):
+        super().__init__(stream)
+        self._init_batching(flush_interval, flush_level)
+
     def emit(self, record):
-        super().emit(record)
-        self.flush()
+        self._write_batched(record)
+
+
+class BatchFlushingFileHandler(_BatchFlushMixin, RotatingFileHandler):
+    """RotatingFileHandler that batches flushes; used behind the logging queue."""
 
+    def __init__(self, filename, flush_interval=FLUSH_INTERVAL, flush_level=FLUSH_LEVEL, **kwargs):
+        super().__init__(filename, **kwargs)
+        self._init_batching(flush_interval, flush_level)
 
-class FlushingFileHandler(RotatingFileHandler):
-    """RotatingFileHandler that flushes after every emit for immediate log visibility."""
     def emit(self, record):
-        super().emit(record)
-        self.flush()
+        try:
+            if self.shouldRollover(record):
+                self.doRollover()
+            if self.stream is None:
+                self.stream = self._open()
+        except Exception:
+            self.handleError(record)
+            return
+        self._write_batched(record)
+
+
+class BatchingQueueListener(QueueListener):
+    """
+    QueueListener that flushes its handlers whenever the queue goes idle.
+
+    Together with the batch-flushing handlers this keeps formatting and
+    file/stream I/O on one background thread while still getting lines out
+    within FLUSH_INTERVAL when the daemon is quiet.
+    """
+
+    def __init__(self, log_queue, *handlers, flush_interval=FLUSH_INTERVAL):
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.flush_interval = flush_interval
+
+    def dequeue(self, block):
+        while True:
+            try:
+                return self.queue.get(block, timeout=self.flush_interval)
+            except queue.Empty:
+                self.flush_handlers()
+
+    def flush_handlers(self):
+        for handler in self.handlers:
+            try:
+                handler.flush()
+            except Exception:
+                pass
+
+
+def flush_logging(timeout=2.0):
+    """
+    Wait until queued log records are written and flush the sinks.
+
+    Args:
+        timeout (float): Maximum seconds to wait for the queue to drain.
+
+    Note:
+        Call before os.execv() or any exit path that skips atexit.
+    """
+    deadline = time.monotonic() + timeout
+    for listener in list(_listeners):
+        while listener.queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.01)
+        listener.flush_handlers()
+
+
+def shutdown_logging():
+    """Stop the background log listeners after writing every queued record."""
+    with _listener_lock:
+        listeners = list(_listeners)
+        _listeners.clear()
+    for listener in listeners:
+        try:
+            listener.stop()
+        except Exception:
+            pass
+        listener.flush_handlers()
+
+
+atexit.register(shutdown_logging)
+
+
+class LogEntry:
+    """Compact in-memory log record kept by JsonMemoryHandler."""
+
+    __slots__ = ("seq", "created", "levelno", "levelname", "name", "filename", "lineno", "message")
+
+    def __init__(self, seq, record):
+        self.seq = seq
+        self.created = record.created
+        self.levelno = record.levelno
+        self.levelname = record.levelname
+        self.name = record.name
+        self.filename = record.filename
+        self.lineno = record.lineno
+        self.message = record.getMessage()
 
 
 class JsonMemoryHandler(Handler):
-    def __init__(self):
+    """
+    Keeps the most recent log records in a fixed-size ring buffer.
+
+    Every entry gets a monotonically increasing sequence number so the
+    in-app log viewer can fetch only what it has not seen yet.
+
+    Args:
+        capacity (int): Maximum number of entries kept; older ones are dropped.
+    """
+
+    DEFAULT_CAPACITY = 2000
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
         super().__init__()
         # Set a formatter with both message and time format
         self.formatter = Formatter(fmt="%(message)s", datefmt="%Y-%m-%d %H:%M:%S")
-        self.logs = []
+        self._entries = deque(maxlen=capacity)
+        self._seq = 0
+
+    @property
+    def capacity(self):
+        return self._entries.maxlen
+
+    @property
+    def last_seq(self):
+        """Sequence number of the newest entry (0 if nothing was logged)."""
+        return self._seq
 
     def emit(self, record):
-        timestamp = self.formatter.formatTime(record, self.formatter.datefmt)
-        self.logs.append({
-            "timestamp": timestamp,
-            "level": record.levelname,
-            "name": record.name,
-            "filename": record.filename,
-            "lineno": record.lineno,
-            "message": record.getMessage(),
-        })
+        try:
+            self._seq += 1
+            self._entries.append(LogEntry(self._seq, record))
+        except Exception:
+            self.handleError(record)
+
+    def _to_dict(self, entry):
+        datefmt = self.formatter.datefmt if self.formatter else None
+        return {
+            "seq": entry.seq,
+            "timestamp": time.strftime(datefmt or "%Y-%m-%d %H:%M:%S", time.localtime(entry.created)),
+            "level": entry.levelname,
+            "name": entry.name,
+            "filename": entry.filename,
+            "lineno": entry.lineno,
+            "message": entry.message,
+        }
+
+    def read_since(self, since_seq=None, min_level=None):
+        """
+        Return the newest sequence number and the entries after since_seq.
+
+        Both are taken under the handler lock, so a record emitted in
+        between can neither be skipped nor returned twice by the next call.
+
+        Args:
+            since_seq (int): Only entries with a sequence number above this
+            min_level (int or str): Minimum level, e.g. logging.WARNING or "WARNING"
 
-    def get_json_string(self):
-        return json.dumps(self.logs, indent=2)
+        Returns:
+            tuple: (last_seq, entries), entries as returned by get_entries()
+        """
+        if isinstance(min_level, str):
+            min_level = logging.getLevelName(min_level.upper())
+            if not isinstance(min_level, int):
+                min_level = None
+        self.acquire()
+        try:
+            last_seq = self._seq
+            entries = list(self._entries)
+        finally:
+            self.release()
+        return last_seq, [
+            self._to_dict(e) for e in entries
+            if (since_seq is None or e.seq > since_seq)
+            and (min_level is None or e.levelno >= min_level)
+        ]
+
+    def get_entries(self, since_seq=None, min_level=None):
+        """
+        Return buffered entries as dictionaries, oldest first.
+
+        Args:
+            since_seq (int): Only entries with a sequence number above this
+            min_level (int or str): Minimum level, e.g. logging.WARNING or "WARNING"
+
+        Returns:
+            list: Entries with seq, timestamp, level, name, filename, lineno, message
+        """
+        return self.read_since(since_seq, min_level)[1]
+
+    @property
+    def logs(self):
+        """All buffered entries as dictionaries (kept for backwards compatibility)."""
+        return self.get_entries()
+
+    def get_json_string(self, since_seq=None, min_level=None):
+        return json.dumps(self.get_entries(since_seq, min_level), separators=(",", ":"))
+
+    def clear(self):
+        self.acquire()
+        try:
+            self._entries.clear()
+        finally:
+            self.release()
 
 
 def get_log_file_path():
@@ -124,6 +338,7 @@ def setup_logger(name="odoo_sync", log_file=None, level=logging.INFO):
 
         under_systemd = _is_running_under_systemd()
         file_logging_ok = False
+        sinks = []
         
         # File handler with rotation (5 files x 1MB each)
         # Skip when running under systemd - it already redirects stderr to the log file
@@ -136,7 +351,7 @@ def setup_logger(name="odoo_sync", log_file=None, level=logging.INFO):
                 log_path = Path(log_file)
                 log_path.parent.mkdir(parents=True, exist_ok=True)
                 
-                fh = FlushingFileHandler(
+                fh = BatchFlushingFileHandler(
                     log_file,
                     maxBytes=1024*1024,  # 1MB per file
                     backupCount=5,       # Keep 5 backup files
@@ -144,7 +359,7 @@ def setup_logger(name="odoo_sync", log_file=None, level=logging.INFO):
                 )
                 fh.setLevel(level)
                 fh.setFormatter(formatter)
-                logger.addHandler(fh)
+                sinks.append(fh)
                 file_logging_ok = True
             except Exception as e:
                 # Print to stderr immediately so it's visible even without file logging
@@ -153,12 +368,24 @@ def setup_logger(name="odoo_sync", log_file=None, level=logging.INFO):
         else:
             file_logging_ok = True  # systemd handles file logging
 
-        # Console/stderr handler with immediate flushing
+        # Console/stderr handler
         # Under systemd, this is the primary output (captured to log file by systemd)
-        ch = FlushingStreamHandler(sys.stderr)
+        ch = BatchFlushingStreamHandler(sys.stderr)
         ch.setLevel(level)
         ch.setFormatter(formatter)
-        logger.addHandler(ch)
+        sinks.append(ch)
+
+        # File and stream I/O happen on a background thread; the caller only
+        # enqueues the record. No formatter on the QueueHandler so the sinks
+        # format with their own layout.
+        log_queue = queue.Queue(-1)
+        qh = QueueHandler(log_queue)
+        qh.setLevel(level)
+        logger.addHandler(qh)
+        listener = BatchingQueueListener(log_queue, *sinks)
+        listener.start()
+        with _listener_lock:
+            _listeners.append(listener)
 
         # JSON memory handler for in-app log viewing
         json_handler = JsonMemoryHandler()
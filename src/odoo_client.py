@@ -24,15 +24,121 @@
 import xmlrpc.client
 import logging
 import base64
+import hashlib
 import socket
+import threading
+import time
 from urllib.parse import urlparse, urljoin
 from bus import send
+from sync_metrics import active_profiler, record_transfer
 
 # Default timeout for XML-RPC calls (60 seconds)
 DEFAULT_TIMEOUT = 60
 
+# Fault code Odoo uses for odoo.exceptions.AccessDenied over XML-RPC
+ACCESS_DENIED_FAULT = 3
 
-class HttpTimeoutTransport(xmlrpc.client.Transport):
+log = logging.getLogger("odoo_sync")
+
+# Authenticated sessions per (url, db, username, password digest):
+# {"uid": int, "url": str, "version": dict|None}. See OdooClient._cached_session.
+_session_cache = {}
+_session_lock = threading.Lock()
+
+
+def _is_access_denied(fault):
+    code = fault.faultCode
+    text = str(fault.faultString or "")
+    return code == ACCESS_DENIED_FAULT or code == "AccessDenied" or "AccessDenied" in text or "Access Denied" in text
+
+
+def clear_session_cache():
+    """Forget every cached uid, e.g. after accounts were edited."""
+    with _session_lock:
+        _session_cache.clear()
+
+
+class _AuthRetryProxy:
+    """
+    Wraps the /xmlrpc/2/object proxy and re-authenticates once when a call
+    fails with AccessDenied (cached uid no longer valid), then retries it.
+    """
+
+    def __init__(self, client, proxy):
+        self._client = client
+        self._proxy = proxy
+
+    def execute_kw(self, db, uid, password, *args):
+        try:
+            return self._proxy.execute_kw(db, uid, password, *args)
+        except xmlrpc.client.Fault as fault:
+            if not _is_access_denied(fault):
+                raise
+            log.info(f"[AUTH] Access denied for uid {uid} on {self._client.url}, re-authenticating")
+            new_uid = self._client.reauthenticate()
+            return self._proxy.execute_kw(db, new_uid, password, *args)
+
+    def __getattr__(self, name):
+        return getattr(self._proxy, name)
+
+
+class _MeteredResponse:
+    """Wraps an HTTP response and counts bytes and time spent in read()."""
+
+    def __init__(self, response):
+        self._response = response
+        self.bytes = 0
+        self.seconds = 0.0
+
+    def read(self, *args):
+        start = time.perf_counter()
+        data = self._response.read(*args)
+        self.seconds += time.perf_counter() - start
+        self.bytes += len(data)
+        return data
+
+    def __getattr__(self, name):
+        return getattr(self._response, name)
+
+
+class MeteredTransportMixin:
+    """
+    Reports request/response sizes and network vs. parse time to sync_metrics.
+
+    Only active while a sync run is being profiled; otherwise the stock
+    xmlrpc.client code path is used unchanged.
+    """
+
+    def single_request(self, host, handler, request_body, verbose=False):
+        if active_profiler() is None:
+            return super().single_request(host, handler, request_body, verbose)
+        self._metered = None
+        start = time.perf_counter()
+        try:
+            return super().single_request(host, handler, request_body, verbose)
+        finally:
+            total = time.perf_counter() - start
+            metered, parse = self._metered or (None, 0.0)
+            record_transfer(
+                bytes_in=metered.bytes if metered else 0,
+                bytes_out=len(request_body or b""),
+                network=total - parse,
+                parse=parse,
+            )
+
+    def parse_response(self, response):
+        if active_profiler() is None or not hasattr(response, "getheader"):
+            return super().parse_response(response)
+        metered = _MeteredResponse(response)
+        start = time.perf_counter()
+        try:
+            return super().parse_response(metered)
+        finally:
+            # Time inside read() is network; the remainder is XML decoding
+            self._metered = (metered, time.perf_counter() - start - metered.seconds)
+
+
+class HttpTimeoutTransport(MeteredTransportMixin, xmlrpc.client.Transport):
     """Custom transport with timeout support for plain HTTP XML-RPC calls."""
 
     def __init__(self, timeout=DEFAULT_TIMEOUT, *args, **kwargs):
@@ -45,7 +151,7 @@ class HttpTimeoutTransport(xmlrpc.client.Transport):
         return conn
 
 
-class TimeoutTransport(xmlrpc.client.SafeTransport):
+class TimeoutTransport(MeteredTransportMixin, xmlrpc.client.SafeTransport):
     """Custom transport with timeout support for HTTPS XML-RPC calls."""
     
     def __init__(self, timeout=DEFAULT_TIMEOUT, *args, **kwargs):
@@ -77,9 +183,64 @@ class OdooClient:
         self.db = db
         self.username = username
         self.password = password
-        self.uid = self._login()
+        self._session_key = (
+            self.url, db, username,
+            hashlib.sha256((password or "").encode("utf-8")).hexdigest(),
+        )
+        session = self._cached_session()
+        if session is not None:
+            # Validated lazily: a stale uid triggers reauthenticate() on AccessDenied
+            self.url = session["url"]
+            self.uid = session["uid"]
+        else:
+            self.uid = self._login()
+            self._store_session()
         self.models = self._get_model_proxy()
 
+    def _cached_session(self):
+        with _session_lock:
+            return _session_cache.get(self._session_key)
+
+    def _store_session(self, version=None):
+        with _session_lock:
+            previous = _session_cache.get(self._session_key) or {}
+            _session_cache[self._session_key] = {
+                "uid": self.uid,
+                "url": self.url,
+                "version": version if version is not None else previous.get("version"),
+            }
+
+    def reauthenticate(self):
+        """
+        Drop the cached session and log in again.
+
+        Returns:
+            int: The fresh uid (also stored on the client)
+        """
+        with _session_lock:
+            _session_cache.pop(self._session_key, None)
+        self.uid = self._login()
+        self._store_session()
+        return self.uid
+
+    def server_version(self):
+        """
+        Return the server's common.version() info, cached with the session.
+
+        Returns:
+            dict: e.g. {"server_version": "17.0", "server_version_info": [...], ...}
+        """
+        session = self._cached_session()
+        if session and session.get("version"):
+            return session["version"]
+        common = xmlrpc.client.ServerProxy(
+            f"{self.url}/xmlrpc/2/common",
+            transport=self._create_transport()
+        )
+        version = common.version()
+        self._store_session(version)
+        return version
+
     def _normalize_url(self, url):
         """Normalize server URL to a safe XML-RPC base URL."""
         normalized = (url or "").strip().rstrip("/")
@@ -201,12 +362,12 @@ class OdooClient:
             ServerProxy: A proxy for calling model methods.
         """
         try:
-            transport = TimeoutTransport(timeout=DEFAULT_TIMEOUT)
-            return xmlrpc.client.ServerProxy(
+            transport = self._create_transport()
+            return _AuthRetryProxy(self, xmlrpc.client.ServerProxy(
                 f"{self.url}/xmlrpc/2/object",
                 transport=transport,
                 allow_none=True
-            )
+            ))
         except Exception as e:
             raise ConnectionError(f"Failed to create model proxy: {e}")
 
@@ -234,16 +395,22 @@ class OdooClient:
                ValueError: if the record is missing or has no data.
                RuntimeError: on XML-RPC errors.
            """
-           # Authenticate with the provided username/password (fresh uid for this call)
-           try:
-               common = xmlrpc.client.ServerProxy(f"{self.url}/xmlrpc/2/common")
-               uid = common.authenticate(self.db, username, password, {})
-               if not uid:
-                   raise ValueError(
-                       f"Authentication failed for user '{username}' on database '{self.db}'"
+           # Reuse the client's session when the credentials are the same
+           if username == self.username and password == self.password:
+               uid = self.uid
+           else:
+               try:
+                   common = xmlrpc.client.ServerProxy(
+                       f"{self.url}/xmlrpc/2/common",
+                       transport=self._create_transport()
                    )
-           except Exception as e:
-               raise RuntimeError(f"On-demand login failed: {e}")
+                   uid = common.authenticate(self.db, username, password, {})
+                   if not uid:
+                       raise ValueError(
+                           f"Authentication failed for user '{username}' on database '{self.db}'"
+                       )
+               except Exception as e:
+                   raise RuntimeError(f"On-demand login failed: {e}")
 
            # Read the attachment with full base64 (bin_size=False)
            fields = ['name', 'mimetype', 'type', 'datas', 'url']
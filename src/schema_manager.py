@@ -0,0 +1,343 @@
+# -*- coding: utf-8 -*-
+# MIT License
+#
+# Copyright (c) 2025 CIT-Services
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+Versioned schema migrations and an in-memory column cache.
+
+The tables are created by the QML side (models/dbinit.js); the Python side
+owns the tables it adds itself (sync metrics, attachment cache, timesheet
+summary) and a few upgrades. Those are listed in MIGRATIONS and run once, in order, inside a
+transaction each; PRAGMA user_version records the last one applied so later
+starts skip them with a single PRAGMA read. A step that needs the QML tables
+raises MigrationDeferred while they do not exist yet and is retried later.
+
+table_columns() answers "does this table have column X?" from memory. The
+cache is only reloaded when SQLite's schema cookie (PRAGMA schema_version)
+changes, which refresh_schema_cache() checks once per sync instead of
+running PRAGMA table_info for every model on every call.
+"""
+
+import logging
+import sqlite3
+import threading
+
+from sync_indexes import create_sync_indexes, normalize_status_values
+
+log = logging.getLogger("odoo_sync")
+
+
+class MigrationDeferred(Exception):
+    """Raised by a migration step that cannot run yet; it is retried on a later call."""
+
+NOTIFICATION_TYPES = ("Activity", "Task", "Project", "ProjectUpdate", "Timesheet", "Sync")
+
+NOTIFICATION_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS notification (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        account_id INTEGER,
+        timestamp TEXT DEFAULT (datetime('now')),
+        message TEXT NOT NULL,
+        type TEXT CHECK(type IN ('Activity', 'Task', 'Project', 'ProjectUpdate', 'Timesheet', 'Sync')),
+        payload TEXT NOT NULL,
+        read_status INTEGER DEFAULT 0,
+        panel_invoked INTEGER DEFAULT 0
+    )
+"""
+
+
+def _columns(cursor, table):
+    cursor.execute(f"PRAGMA table_info({table})")
+    return tuple(row[1] for row in cursor.fetchall())
+
+
+def _migrate_notification_table(cursor):
+    """Create the notification table, or rebuild an old one without 'ProjectUpdate' / panel_invoked."""
+    cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'notification'")
+    row = cursor.fetchone()
+    if row is None:
+        cursor.execute(NOTIFICATION_TABLE_SQL)
+        return
+
+    # SQLite cannot ALTER a CHECK constraint, so the table is recreated
+    if row[0] and "ProjectUpdate" not in row[0]:
+        log.info("[SCHEMA] Rebuilding notification table to add 'ProjectUpdate' type")
+        old_columns = _columns(cursor, "notification")
+        panel_invoked_select = "COALESCE(panel_invoked, 0)" if "panel_invoked" in old_columns else "0"
+        cursor.execute("ALTER TABLE notification RENAME TO notification_old")
+        cursor.execute(NOTIFICATION_TABLE_SQL)
+        cursor.execute(
+            f"""
+            INSERT INTO notification (id, account_id, timestamp, message, type, payload, read_status, panel_invoked)
+            SELECT id, account_id, timestamp, message, type, payload, read_status,
+                   {panel_invoked_select} FROM notification_old
+            """
+        )
+        cursor.execute("DROP TABLE notification_old")
+        return
+
+    if "panel_invoked" not in _columns(cursor, "notification"):
+        cursor.execute("ALTER TABLE notification ADD COLUMN panel_invoked INTEGER DEFAULT 0")
+        log.info("[SCHEMA] Added notification.panel_invoked column")
+
+
+def _migrate_sync_metrics(cursor):
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS sync_metrics (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            run_id TEXT,
+            account_id INTEGER,
+            source TEXT,
+            direction TEXT,
+            started_at TEXT,
+            model TEXT,
+            phase TEXT,
+            wall_ms REAL,
+            network_ms REAL,
+            parse_ms REAL,
+            bytes_in INTEGER,
+            bytes_out INTEGER,
+            rows INTEGER,
+            calls INTEGER
+        )
+        """
+    )
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_sync_metrics_account_run ON sync_metrics (account_id, started_at)"
+    )
+
+
+def _migrate_attachment_cache(cursor):
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS attachment_cache_index (
+            checksum TEXT PRIMARY KEY,
+            path TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            mimetype TEXT,
+            created_at REAL,
+            last_access REAL,
+            hits INTEGER DEFAULT 0
+        )
+        """
+    )
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_attachment_cache_lru ON attachment_cache_index (last_access)"
+    )
+    cursor.execute(
+        "CREATE TABLE IF NOT EXISTS attachment_cache_stats (name TEXT PRIMARY KEY, value INTEGER DEFAULT 0)"
+    )
+
+
+def _migrate_timesheet_summary(cursor):
+    """Server-side timesheet totals (see timesheet_summary); models/dbinit.js has the same DDL."""
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS account_analytic_line_summary (
+            account_id INTEGER NOT NULL,
+            granularity TEXT NOT NULL,
+            period_start TEXT NOT NULL,
+            project_id INTEGER NOT NULL DEFAULT 0,
+            task_id INTEGER NOT NULL DEFAULT 0,
+            user_id INTEGER NOT NULL DEFAULT 0,
+            unit_amount REAL NOT NULL DEFAULT 0,
+            line_count INTEGER NOT NULL DEFAULT 0,
+            synced_at TEXT,
+            UNIQUE (account_id, granularity, period_start, project_id, task_id, user_id)
+        )
+        """
+    )
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_timesheet_summary_project "
+        "ON account_analytic_line_summary (account_id, granularity, project_id)"
+    )
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS account_analytic_line_summary_state (
+            account_id INTEGER NOT NULL,
+            granularity TEXT NOT NULL,
+            covered_before TEXT,
+            synced_at TEXT,
+            PRIMARY KEY (account_id, granularity)
+        )
+        """
+    )
+
+
+def _require_app_tables(cursor):
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'project_task_app'")
+    if cursor.fetchone() is None:
+        raise MigrationDeferred("the app has not created its tables yet")
+
+
+def _migrate_sync_indexes(cursor):
+    """Covering and partial indexes for the sync lookups (see sync_indexes)."""
+    _require_app_tables(cursor)
+    create_sync_indexes(cursor)
+
+
+def _migrate_status_values(cursor):
+    """Lowercased, trimmed status values so the exact pending filter finds every row."""
+    _require_app_tables(cursor)
+    normalize_status_values(cursor)
+
+
+# (version, description, migrate(cursor)); append only, never renumber.
+# Each step must also cope with databases already upgraded by older code.
+MIGRATIONS = (
+    (1, "notification table with ProjectUpdate type and panel_invoked", _migrate_notification_table),
+    (2, "sync_metrics table", _migrate_sync_metrics),
+    (3, "attachment cache index and stats tables", _migrate_attachment_cache),
+    (4, "sync lookup indexes on the *_app tables", _migrate_sync_indexes),
+    (5, "normalized status values on the *_app tables", _migrate_status_values),
+    (6, "timesheet summary and summary state tables", _migrate_timesheet_summary),
+)
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+_lock = threading.Lock()
+_migrated = set()
+_columns_cache = {}
+_schema_cookies = {}
+
+
+def ensure_schema(db_path):
+    """
+    Apply pending migrations to a database, once per process.
+
+    A deferred step stops the run without recording it, so the next call
+    tries again from that step.
+
+    Args:
+        db_path (str): App database
+
+    Returns:
+        int: Schema version after the call
+    """
+    with _lock:
+        if db_path in _migrated:
+            return SCHEMA_VERSION
+        conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+        try:
+            cursor = conn.cursor()
+            version = cursor.execute("PRAGMA user_version").fetchone()[0]
+            for target, description, migrate in MIGRATIONS:
+                if target <= version:
+                    continue
+                try:
+                    cursor.execute("BEGIN IMMEDIATE")
+                    migrate(cursor)
+                    cursor.execute(f"PRAGMA user_version = {int(target)}")
+                    cursor.execute("COMMIT")
+                except MigrationDeferred as e:
+                    cursor.execute("ROLLBACK")
+                    log.debug(f"[SCHEMA] Migration {target} ({description}) deferred: {e}")
+                    return version
+                except Exception as e:
+                    cursor.execute("ROLLBACK")
+                    log.error(f"[SCHEMA] Migration {target} ({description}) failed: {e}")
+                    return version
+                version = target
+                log.info(f"[SCHEMA] Applied migration {target}: {description}")
+        finally:
+            conn.close()
+        _migrated.add(db_path)
+        _forget(db_path)
+        return version
+
+
+def _forget(db_path):
+    for key in [key for key in _columns_cache if key[0] == db_path]:
+        del _columns_cache[key]
+    _schema_cookies.pop(db_path, None)
+
+
+def table_columns(db_path, table_name, conn=None):
+    """
+    Return the column names of a table from the in-memory cache.
+
+    Args:
+        db_path (str): Database path
+        table_name (str): Validated table name
+        conn (sqlite3.Connection): Optional open connection to db_path. The
+            cached columns are then checked against its schema cookie and
+            only reloaded if another process changed the schema since.
+
+    Returns:
+        tuple: Column names in table order, empty if the table does not exist
+    """
+    key = (db_path, table_name)
+    if conn is not None:
+        cookie = conn.execute("PRAGMA schema_version").fetchone()[0]
+        with _lock:
+            if _schema_cookies.get(db_path, cookie) != cookie:
+                _forget(db_path)
+    columns = _columns_cache.get(key)
+    if columns is None:
+        own_conn = conn is None
+        if own_conn:
+            conn = sqlite3.connect(db_path, timeout=30)
+        try:
+            cursor = conn.cursor()
+            # Read the cookie first so a concurrent change is caught by the next refresh
+            cookie = cursor.execute("PRAGMA schema_version").fetchone()[0]
+            columns = _columns(cursor, table_name)
+            with _lock:
+                _schema_cookies.setdefault(db_path, cookie)
+                _columns_cache[key] = columns
+        finally:
+            if own_conn:
+                conn.close()
+    return columns
+
+
+def refresh_schema_cache(db_path):
+    """
+    Drop cached columns of a database whose schema changed since they were read.
+
+    Returns:
+        bool: True if the cache was cleared
+    """
+    if db_path not in _schema_cookies:
+        return False
+    conn = sqlite3.connect(db_path, timeout=30)
+    try:
+        cookie = conn.execute("PRAGMA schema_version").fetchone()[0]
+    finally:
+        conn.close()
+    with _lock:
+        if _schema_cookies.get(db_path) == cookie:
+            return False
+        _forget(db_path)
+    return True
+
+
+def invalidate_schema_cache(db_path=None):
+    """Forget cached columns of one database, or of all of them."""
+    with _lock:
+        if db_path is None:
+            _columns_cache.clear()
+            _schema_cookies.clear()
+        else:
+            _forget(db_path)
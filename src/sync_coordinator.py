@@ -0,0 +1,255 @@
+# -*- coding: utf-8 -*-
+# MIT License
+#
+# Copyright (c) 2025 CIT-Services
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+Cross-process coordination of account syncs.
+
+The app (backend.py) and the background daemon are separate processes
+working on the same SQLite file. Each sync of an account holds an advisory
+fcntl.flock() on a per-account lock file, so only one of them talks to the
+server at a time. The kernel drops the lock when its holder exits, so a
+crashed sync never leaves a stale lock behind.
+
+Next to the lock the holder keeps a small JSON status (owner, pid,
+direction, progress, final state). Another process that finds the lock
+taken can read it to either wait for that sync and reuse its result
+("attach"), or create the preempt marker, which the holder checks between
+steps before it stops with SyncPreempted.
+"""
+
+import fcntl
+import json
+import logging
+import os
+import time
+import uuid
+from pathlib import Path
+
+log = logging.getLogger("odoo_sync")
+
+SYNC_LOCK_DIR = Path.home() / ".cache" / "ubtms" / "sync-locks"
+
+# Seconds a preempted holder gets to reach its next checkpoint
+PREEMPT_TIMEOUT = 120
+
+# Seconds to wait for a sync that is being attached to
+ATTACH_TIMEOUT = 1800
+
+
+class SyncPreempted(Exception):
+    """Raised inside a sync when another process asked to take over."""
+
+
+def _paths(account_id, lock_dir=None):
+    base = Path(lock_dir) if lock_dir else SYNC_LOCK_DIR
+    name = f"account-{int(account_id)}"
+    return base / f"{name}.lock", base / f"{name}.json", base / f"{name}.preempt"
+
+
+def _read_json(path):
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _pid_alive(pid):
+    if not isinstance(pid, int) or pid <= 0:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _holds_lock(status):
+    """
+    Return whether the sync that wrote a status still holds the lock.
+
+    The lock itself is not tried: even a brief test flock() would make a
+    concurrent SyncJob.acquire() fail. A holder writes state "running"
+    right after taking the lock and its final state before releasing it;
+    if it died instead, its pid is gone and the kernel has dropped the lock.
+    """
+    return bool(status) and status.get("state") == "running" and _pid_alive(status.get("pid"))
+
+
+class SyncJob:
+    """
+    Lock and status of one sync run of an account.
+
+    Args:
+        account_id (int): Local account id
+        owner (str): "app" or "daemon"
+        direction (str): "both", "download_only" or "upload_only"
+        lock_dir (str): Directory for lock/status files, defaults to SYNC_LOCK_DIR
+    """
+
+    def __init__(self, account_id, owner, direction="both", lock_dir=None):
+        self.account_id = account_id
+        self.owner = owner
+        self.direction = direction
+        self.lock_path, self.status_path, self.preempt_path = _paths(account_id, lock_dir)
+        self.job_id = None
+        self.status = {}
+        self._fd = None
+
+    def acquire(self):
+        """
+        Take the account lock without waiting.
+
+        Returns:
+            bool: True if this job now holds the lock (or locking is
+                unavailable), False if another sync holds it
+        """
+        if self._fd is not None:
+            return True
+        try:
+            self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        except OSError as e:
+            # Never block syncing because the lock directory is unusable
+            log.warning(f"[SYNC] Cannot use sync lock {self.lock_path}: {e}")
+            return True
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+        self._fd = fd
+        # A marker left for a previous holder does not apply to this run
+        self.preempt_path.unlink(missing_ok=True)
+        self.job_id = uuid.uuid4().hex
+        self.status = {
+            "job_id": self.job_id,
+            "account_id": self.account_id,
+            "owner": self.owner,
+            "pid": os.getpid(),
+            "direction": self.direction,
+            "state": "running",
+            "progress": 0,
+            "message": "",
+            "started_at": time.time(),
+        }
+        self._write_status()
+        return True
+
+    def _write_status(self):
+        tmp = self.status_path.with_name(self.status_path.name + ".tmp")
+        try:
+            with open(tmp, "w") as f:
+                json.dump(self.status, f)
+            os.replace(tmp, self.status_path)
+        except OSError as e:
+            log.debug(f"[SYNC] Could not write sync status: {e}")
+
+    def update(self, progress=None, message=None):
+        """Publish progress (0-100) and/or a message for processes attached to this job."""
+        if self._fd is None:
+            return
+        if progress is not None:
+            self.status["progress"] = progress
+        if message is not None:
+            self.status["message"] = message
+        self._write_status()
+
+    def preempt_requested(self):
+        return self._fd is not None and self.preempt_path.exists()
+
+    def check_preempted(self):
+        """Raise SyncPreempted if another process asked to take over."""
+        if self.preempt_requested():
+            requester = _read_json(self.preempt_path) or {}
+            raise SyncPreempted(f"Sync taken over by {requester.get('owner', 'another process')}")
+
+    def finish(self, state):
+        """
+        Record the final state ("completed", "failed" or "preempted") and release the lock.
+        """
+        if self._fd is None:
+            return
+        self.status.update(state=state, finished_at=time.time())
+        if state == "completed":
+            self.status["progress"] = 100
+        self._write_status()
+        fd, self._fd = self._fd, None
+        try:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        finally:
+            os.close(fd)
+
+
+def get_sync_holder(account_id, lock_dir=None):
+    """
+    Return the status of the sync currently holding the account lock.
+
+    Returns:
+        dict: Status written by the holder (owner, pid, direction, progress,
+            message, job_id, ...), or None if no sync is running
+    """
+    _, status_path, _ = _paths(account_id, lock_dir)
+    status = _read_json(status_path)
+    return status if _holds_lock(status) else None
+
+
+def request_preempt(account_id, owner, lock_dir=None):
+    """Ask the current holder to stop at its next checkpoint."""
+    _, _, preempt_path = _paths(account_id, lock_dir)
+    preempt_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(preempt_path, "w") as f:
+        json.dump({"owner": owner, "pid": os.getpid(), "requested_at": time.time()}, f)
+
+
+def wait_for_release(account_id, timeout, on_status=None, poll=0.5, lock_dir=None):
+    """
+    Wait until no sync holds the account lock.
+
+    Args:
+        account_id (int): Local account id
+        timeout (float): Seconds to wait
+        on_status (callable): Called with the holder's status whenever it changes
+        poll (float): Seconds between checks
+
+    Returns:
+        dict: Last status written by the holder (with its final state), or
+            None if the lock was still held after timeout
+    """
+    _, status_path, _ = _paths(account_id, lock_dir)
+    deadline = time.monotonic() + timeout
+    last = None
+    while True:
+        status = _read_json(status_path)
+        locked = _holds_lock(status)
+        if on_status and status and status != last:
+            on_status(status)
+        last = status or last
+        if not locked:
+            return last or {}
+        if time.monotonic() >= deadline:
+            return None
+        time.sleep(poll)
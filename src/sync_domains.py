@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+# MIT License
+#
+# Copyright (c) 2025 CIT-Services
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Per-model sync domains and record windows.
+
+sync_domains.json sits next to field_config.json and restricts which records
+of a model are downloaded:
+
+    {
+        "account.analytic.line": {"window": {"field": "date", "days": 365}},
+        "project.task": {
+            "domain": ["|", ["user_ids", "in", ["{uid}"]],
+                            ["message_partner_ids", "in", ["{partner_id}"]]]
+        }
+    }
+
+"domain" is a regular Odoo domain. String values "{uid}", "{partner_id}"
+and "{today}" are replaced per account when the sync runs. "window" adds
+(field, '>=', today - days) using the date or datetime format of the field.
+
+Models without an entry are synced in full, as before. The shipped file
+limits timesheet lines to the last 365 days. Older hours still count in the
+app's totals: timesheet_summary stores them per week from read_group, up to
+the same window start. Local rows that fall out of a window are kept while
+the server still has them (see sync_from_odoo.confirm_existing_ids).
+"""
+
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+log = logging.getLogger("odoo_sync")
+
+DEFAULT_DOMAINS_PATH = "sync_domains.json"
+
+_DOMAIN_OPERATORS = ("&", "|", "!")
+_PLACEHOLDERS = ("{uid}", "{partner_id}", "{today}")
+
+
+class ModelScope:
+    """
+    Parsed sync_domains.json entry for one model.
+
+    Args:
+        model_name (str): Odoo model name
+        domain (list): Domain with unresolved placeholders
+        window_field (str): Date/datetime field for the window, or None
+        window_days (int): Window length in days, or None
+    """
+
+    __slots__ = ("model_name", "domain", "window_field", "window_days")
+
+    def __init__(self, model_name, domain=None, window_field=None, window_days=None):
+        self.model_name = model_name
+        self.domain = domain or []
+        self.window_field = window_field
+        self.window_days = window_days
+
+    def resolve(self, context, field_types):
+        """
+        Build the concrete domain for one account.
+
+        Args:
+            context (ScopeContext): Per-account placeholder values
+            field_types (dict): Odoo field name -> type from fields_get
+
+        Returns:
+            list: Odoo domain (may be empty)
+        """
+        domain = [_substitute(term, context) for term in self.domain]
+        window = None
+        if self.window_field and self.window_days:
+            field_type = field_types.get(self.window_field)
+            if field_type not in ("date", "datetime"):
+                log.warning(
+                    f"[CONFIG] Ignoring sync window on {self.model_name}.{self.window_field}: "
+                    f"not a date/datetime field on this server"
+                )
+            else:
+                start = context.now - timedelta(days=self.window_days)
+                fmt = "%Y-%m-%d" if field_type == "date" else "%Y-%m-%d %H:%M:%S"
+                window = (list(domain), self.window_field, start.strftime(fmt))
+                domain.append([self.window_field, ">=", window[2]])
+        context.windows[self.model_name] = window
+        return domain
+
+
+class ScopeContext:
+    """
+    Lazily resolved placeholder values for one authenticated client.
+
+    The clock is read once, so every model of a run shares the same
+    "today". windows records the window each resolved model got, as
+    (domain without the window, field, start) or None, for the timesheet
+    summary of the history before it.
+
+    Args:
+        client: OdooClient (or any object with uid and call())
+        partner_id (int): Known partner id, skips the res.users read
+        now (datetime): Reference time, defaults to the current UTC time
+    """
+
+    def __init__(self, client, partner_id=None, now=None):
+        self.client = client
+        self._partner_id = partner_id
+        self.now = now or datetime.now(timezone.utc)
+        self.windows = {}
+
+    def value(self, placeholder):
+        if placeholder == "{uid}":
+            return self.client.uid
+        if placeholder == "{today}":
+            return self.now.strftime("%Y-%m-%d")
+        if placeholder == "{partner_id}":
+            if self._partner_id is None:
+                users = self.client.call("res.users", "read", [[self.client.uid]], {"fields": ["partner_id"]})
+                partner = users[0].get("partner_id") if users else False
+                self._partner_id = partner[0] if partner else False
+            return self._partner_id
+        raise KeyError(placeholder)
+
+
+def _substitute(term, context):
+    if isinstance(term, str):
+        return context.value(term) if term in _PLACEHOLDERS else term
+    if isinstance(term, list):
+        return [_substitute(item, context) for item in term]
+    return term
+
+
+def _validate_domain(domain):
+    if not isinstance(domain, list):
+        raise ValueError("domain must be a list")
+    for term in domain:
+        if isinstance(term, str):
+            if term not in _DOMAIN_OPERATORS:
+                raise ValueError(f"unknown domain operator {term!r}")
+        elif not (isinstance(term, list) and len(term) == 3 and isinstance(term[0], str)):
+            raise ValueError(f"invalid domain leaf {term!r}")
+
+
+class SyncDomainRegistry:
+    """
+    Cache of parsed sync_domains.json files, revalidated with stat() like
+    field_mapping.FieldMappingRegistry.
+    """
+
+    def __init__(self, base_dir=None):
+        self.base_dir = Path(base_dir or Path(__file__).parent).resolve()
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def _parse(self, full_path):
+        with open(full_path, "r") as f:
+            raw = json.load(f)
+        if not isinstance(raw, dict):
+            raise ValueError("top level must be an object of model entries")
+
+        scopes = {}
+        for model_name, entry in raw.items():
+            try:
+                if not isinstance(entry, dict):
+                    raise ValueError("expected an object")
+                domain = entry.get("domain", [])
+                _validate_domain(domain)
+                window = entry.get("window") or {}
+                window_field = window.get("field")
+                window_days = window.get("days")
+                if window and not (isinstance(window_field, str) and isinstance(window_days, int) and window_days > 0):
+                    raise ValueError("window needs a field name and a positive number of days")
+                scopes[model_name] = ModelScope(model_name, domain, window_field, window_days)
+            except ValueError as e:
+                log.warning(f"[CONFIG] Ignoring sync domain for '{model_name}': {e}")
+        return scopes
+
+    def get_scopes(self, config_path=DEFAULT_DOMAINS_PATH):
+        """Return model name -> ModelScope; empty if the file is missing or invalid."""
+        full_path = self.base_dir / (config_path or DEFAULT_DOMAINS_PATH)
+        try:
+            st = os.stat(full_path)
+        except OSError:
+            return {}
+
+        stamp = (st.st_mtime_ns, st.st_size)
+        entry = self._entries.get(full_path)
+        if entry is not None and entry[0] == stamp:
+            return entry[1]
+
+        with self._lock:
+            entry = self._entries.get(full_path)
+            if entry is not None and entry[0] == stamp:
+                return entry[1]
+            try:
+                scopes = self._parse(full_path)
+            except Exception as e:
+                log.error(f"[CONFIG] Failed to load sync domains from {full_path}: {e}")
+                return entry[1] if entry is not None else {}
+            self._entries[full_path] = (stamp, scopes)
+            return scopes
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+registry = SyncDomainRegistry()
+
+
+def resolve_sync_domain(client, model_name, field_types, context=None, config_path=DEFAULT_DOMAINS_PATH):
+    """
+    Return the configured domain for a model, resolved for the client's account.
+
+    Args:
+        client (OdooClient): Authenticated client (provides uid)
+        model_name (str): Odoo model name
+        field_types (dict): Result of get_model_field_info for the model
+        context (ScopeContext): Reuse placeholder lookups across models
+        config_path (str): Config path, relative to src/ unless absolute
+
+    Returns:
+        list: Domain to sync, or None when the model has no entry (full sync)
+    """
+    scope = registry.get_scopes(config_path).get(model_name)
+    if scope is None:
+        return None
+    try:
+        return scope.resolve(context or ScopeContext(client), field_types)
+    except Exception as e:
+        log.warning(f"[CONFIG] Could not resolve sync domain for '{model_name}', syncing all records: {e}")
+        return None
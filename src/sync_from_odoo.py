@@ -25,16 +25,20 @@
 import json
 import sqlite3
 import re
-from functools import lru_cache
 from xmlrpc.client import ServerProxy
 from odoo_client import OdooClient
 import logging
 from datetime import timezone
 from datetime import datetime
 from common import sanitize_datetime, safe_sql_execute, add_notification, clear_sync_notifications
+from field_mapping import load_field_mapping, get_model_mapping
 from pathlib import Path
 import os
 from bus import send
+from sync_metrics import phase
+from sync_domains import resolve_sync_domain, ScopeContext
+from timesheet_summary import TIMESHEET_MODEL, sync_timesheet_summary
+from schema_manager import table_columns, refresh_schema_cache
 
 log = logging.getLogger("odoo_sync")
 
@@ -48,19 +52,14 @@ def _validate_table_name(table_name):
     return table_name
 
 
-@lru_cache(maxsize=128)
 def get_table_columns(db_path, table_name):
-    """Return cached table columns for a sync run. Cache is cleared at sync start."""
-    safe_table_name = _validate_table_name(table_name)
-    # Safe to interpolate after strict identifier validation above.
-    table_info = safe_sql_execute(
-        db_path, f"PRAGMA table_info({safe_table_name})", fetch=True, commit=False
-    )
-    return tuple(row[1] for row in table_info or [])
+    """Return table columns from the schema_manager cache (reloaded only after schema changes)."""
+    return table_columns(db_path, _validate_table_name(table_name))
 
 
-def clear_table_columns_cache():
-    get_table_columns.cache_clear()
+def clear_table_columns_cache(db_path):
+    """Drop cached columns if the schema changed, e.g. after the app added a column."""
+    refresh_schema_cache(db_path)
 
 
 def get_record_display_name(record, model_name=None):
@@ -92,37 +91,6 @@ def get_record_display_name(record, model_name=None):
         return f"id={record_id}"
 
 
-def load_field_mapping(model_name, config_path="field_config.json"):
-    """
-    Load field mapping configuration for a specific Odoo model.
-    
-    Args:
-        model_name (str): Name of the Odoo model to load mapping for
-        config_path (str): Path to the field configuration JSON file
-        
-    Returns:
-        dict: Field mapping dictionary where keys are Odoo field names 
-              and values are SQLite field names. Returns empty dict on error.
-    """
-    try:
-        current_dir = Path(__file__).parent.resolve()
-        full_path = current_dir / config_path
-        with open(full_path, "r") as f:
-            mapping = json.load(f)
-        return mapping.get(model_name, {})
-    except Exception as e:
-        log.debug(
-            f"[ERROR] Failed to load field mapping for '{model_name}' at {full_path}: {e}"
-        )
-        # List all files in the directory
-        try:
-            files = os.listdir(current_dir)
-            log.debug(f"[DEBUG] Contents of {current_dir}: {files}")
-        except Exception as dir_err:
-            log.debug(f"[ERROR] Failed to list contents of {current_dir}: {dir_err}")
-        return {}
-
-
 def should_update_local(odoo_write_date: str, local_last_modified: str) -> bool:
     """
     Determine if local record should be updated based on timestamps.
@@ -156,6 +124,7 @@ def insert_record(
     db_path="app_settings.db",
     config_path="field_config.json",
     account_name="",
+    field_types=None,
 ):
     """
     Insert or replace a record in the local SQLite database.
@@ -167,125 +136,60 @@ def insert_record(
         record (dict): Record data from Odoo
         db_path (str): Path to the SQLite database file
         config_path (str): Path to the field configuration JSON file
+        field_types (dict): Optional Odoo field name -> fields_get type, used
+            to pick typed converters
         
     Note:
         Handles data type conversion for SQLite compatibility and converts
         one2many/many2many fields to comma-separated strings. Adds notification
         on failure. Preserves local 'status' field if record has pending changes.
+        The row converter and SQL are compiled once per model/table schema.
     """
     try:
-        field_map = load_field_mapping(model_name, config_path)
-        columns = []
-        values = []
+        table_columns = get_table_columns(db_path, table_name)
+        converter = get_model_mapping(model_name, config_path).row_converter(
+            table_name, table_columns, field_types
+        )
         record["account_id"] = account_id
-        table_columns = set(get_table_columns(db_path, table_name))
         
         # Check if local record has pending changes (status = 'updated' or 'created')
         # If so, we should preserve certain local fields like 'favorites' and 'state' for activities
         odoo_record_id = record.get("id")
-        existing_status = None
-        existing_favorites = None
-        existing_state = None  # For mail_activity_app - preserve done state
-        if odoo_record_id:
+        existing = {}
+        if odoo_record_id and converter.check_sql:
             try:
-                select_fields = []
-                if "status" in table_columns:
-                    select_fields.append("status")
-                if "favorites" in table_columns:
-                    select_fields.append("favorites")
-                if table_name == "mail_activity_app" and "state" in table_columns:
-                    select_fields.append("state")
-
-                if select_fields:
-                    check_sql = f"SELECT {', '.join(select_fields)} FROM {table_name} WHERE odoo_record_id = ? AND account_id = ?"
-                    result = safe_sql_execute(db_path, check_sql, (odoo_record_id, account_id), fetch=True, commit=False)
-                    if result and len(result) > 0:
-                        field_index = 0
-                        if "status" in table_columns:
-                            existing_status = result[0][field_index]
-                            field_index += 1
-                        if "favorites" in table_columns:
-                            existing_favorites = result[0][field_index]
-                            field_index += 1
-                        if table_name == "mail_activity_app" and "state" in table_columns:
-                            existing_state = result[0][field_index]
-                        # DEBUG: Log activity sync decisions
-                        if table_name == "mail_activity_app":
-                            activity_name = record.get('summary') or '(no summary)'
-                            log.info(f"[ACTIVITY_SYNC] Activity '{activity_name}' (odoo_id={odoo_record_id}): local_status={existing_status}, local_state={existing_state}, server_state={record.get('state')}")
+                result = safe_sql_execute(db_path, converter.check_sql, (odoo_record_id, account_id), fetch=True, commit=False)
+                if result:
+                    existing = dict(zip(converter.check_fields, result[0]))
+                    # DEBUG: Log activity sync decisions
+                    if table_name == "mail_activity_app":
+                        activity_name = record.get('summary') or '(no summary)'
+                        log.info(f"[ACTIVITY_SYNC] Activity '{activity_name}' (odoo_id={odoo_record_id}): local_status={existing.get('status')}, local_state={existing.get('state')}, server_state={record.get('state')}")
             except Exception as e:
                 log.debug(f"[DEBUG] Could not check existing status: {e}")
-        
-        for odoo_field, sqlite_field in field_map.items():
-            val = record.get(odoo_field)
-
-            # Convert one2many or many2many fields to comma-separated string of IDs
-            # Also handles many2one fields which return [id, "name"] tuples
-            if isinstance(val, list) and val:
-                if all(isinstance(v, (int, int)) for v in val):
-                    val = ",".join(str(v) for v in val)
-                else:
-                    # many2one field: [id, "name"] - extract just the ID
-                    val = val[0]
-                #     # Handles case like [[id, "name"], [id, "name"]] (Odoo returns tuples)
-                #     val = ",".join(str(v[0]) if isinstance(v, (list, tuple)) else str(v) for v in val)
-
-            # Convert boolean to integer (SQLite doesn't support bool)
-            if isinstance(val, bool):
-                val = int(val)
-
-            # Ensure datetime is stored in ISO format if it's a datetime object
-            if isinstance(val, datetime):
-                val = val.isoformat()
-
-            # Convert None or unexpected types to safe defaults
-            if val is None:
-                val = None
-            elif isinstance(val, (int, float, str)):
-                pass  # allowed types
-            else:
-                try:
-                    val = str(val)  # fallback (for fields like selection or state)
-                except Exception as e:
-                    log.warning(f"[WARN] Unable to convert field {odoo_field}: {e}")
-                    val = None
-            
+        existing_status = existing.get("status")
+
+        values = converter.convert(record, account_id)
+
+        preserve_status = existing_status in ("updated", "created")
+        if preserve_status:
             # Preserve local favorites if there are pending changes
-            if sqlite_field == "favorites" and existing_status in ("updated", "created"):
-                val = existing_favorites
-                log.debug(f"[PRESERVE] Keeping local favorites value: {val} (status={existing_status})")
-            
+            if converter.favorites_index is not None:
+                values[converter.favorites_index] = existing.get("favorites")
+                log.debug(f"[PRESERVE] Keeping local favorites value: {existing.get('favorites')} (status={existing_status})")
+
             # Preserve local state for activities if there are pending changes (e.g., 'done' state)
-            if sqlite_field == "state" and table_name == "mail_activity_app" and existing_status in ("updated", "created"):
-                if existing_state:
-                    val = existing_state
-                    activity_name = record.get('summary') or '(no summary)'
-                    log.info(f"[ACTIVITY_SYNC] Preserving local state='{val}' for activity '{activity_name}' (odoo_id={odoo_record_id}) - has pending changes (status={existing_status})")
-            
-            if sqlite_field == "account_id":
-                continue  # Already manually handled
-            columns.append(sqlite_field)
-            values.append(val)
-
-        # Finally, append account_id at the end
-        columns.append("account_id")
-        values.append(account_id)
-        
-        # Preserve status if there are pending changes
-        if existing_status in ("updated", "created"):
-            columns.append("status")
+            existing_state = existing.get("state")
+            if converter.state_index is not None and existing_state:
+                values[converter.state_index] = existing_state
+                activity_name = record.get('summary') or '(no summary)'
+                log.info(f"[ACTIVITY_SYNC] Preserving local state='{existing_state}' for activity '{activity_name}' (odoo_id={odoo_record_id}) - has pending changes (status={existing_status})")
+
+            # Preserve status if there are pending changes
             values.append(existing_status)
             log.debug(f"[PRESERVE] Keeping local status: {existing_status}")
 
-        placeholders = ", ".join(["?"] * len(columns))
-        update_columns = [column for column in columns if column != "odoo_record_id"]
-        update_clause = ", ".join(f"{column} = excluded.{column}" for column in update_columns)
-        sql = (
-            f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({placeholders}) "
-            f"ON CONFLICT(odoo_record_id, account_id) DO UPDATE SET {update_clause}"
-        )
-
-        safe_sql_execute(db_path, sql, values)
+        safe_sql_execute(db_path, converter.upsert_sql(preserve_status), values)
     except Exception as e:
         display_name = get_record_display_name(record, model_name)
         error_msg = str(e)
@@ -308,19 +212,20 @@ def insert_record(
         )
 
 
-def get_model_fields(client, model_name):
+def get_model_field_info(client, model_name):
     """
-    Retrieve all available fields for a specific Odoo model.
+    Retrieve the available fields of an Odoo model together with their types.
     
     Args:
         client (OdooClient): Authenticated Odoo client instance
         model_name (str): Name of the Odoo model
         
     Returns:
-        list: List of field names available in the model. Returns empty list on error.
+        dict: Field name -> Odoo field type (e.g. 'many2one', 'char').
+              Returns empty dict on error.
     """
     try:
-        return client.models.execute_kw(
+        fields = client.models.execute_kw(
             client.db,
             client.uid,
             client.password,
@@ -328,13 +233,28 @@ def get_model_fields(client, model_name):
             "fields_get",
             [],
             {"attributes": ["string", "type"]},
-        ).keys()
+        )
+        return {name: attrs.get("type") for name, attrs in fields.items()}
     except Exception as e:
         log.error(
             f"[ERROR] Failed to fetch fields for model '{model_name}': {e}. "
             f"Please check the model exists, is accessible, and your connection is active."
         )
-        return []
+        return {}
+
+
+def get_model_fields(client, model_name):
+    """
+    Retrieve all available fields for a specific Odoo model.
+    
+    Args:
+        client (OdooClient): Authenticated Odoo client instance
+        model_name (str): Name of the Odoo model
+        
+    Returns:
+        list: List of field names available in the model. Returns empty list on error.
+    """
+    return get_model_field_info(client, model_name).keys()
 
 
 def sync_model(
@@ -345,6 +265,10 @@ def sync_model(
     db_path="app_settings.db",
     config_path="field_config.json",
     account_name="",
+    domains=None,
+    delta=False,
+    scope_context=None,
+    prefetched=None,
 ):
     """
     Synchronize a complete Odoo model with its corresponding SQLite table.
@@ -356,28 +280,87 @@ def sync_model(
         account_id (int): Account ID for record association
         db_path (str): Path to the SQLite database file  
         config_path (str): Path to the field configuration JSON file
+        domains (list): Optional list of Odoo domains; the model is then
+            restricted to the union of their results. None syncs every record.
+        delta (bool): With domains, only fetch records changed since the
+            newest local write_date (plus scoped records missing locally)
+        scope_context (ScopeContext): Shared placeholder values for
+            sync_domains.json, so e.g. the partner id is read once per run
+        prefetched (tuple): (field_info, records) already fetched by
+            async_odoo_client.fetch_models_concurrently(); skips fields_get
+            and the fetch itself
         
     Note:
         Performs complete sync including fetching records, updating local database,
         and removing orphaned records. Adds notification on failure.
+        With domains, the ids in scope are searched first (ids only) and local
+        rows outside that set are removed as orphans.
+        A domain/window from sync_domains.json is combined with the given
+        domains. Local rows outside it are only removed once an id search
+        shows the server no longer has them; rows that merely fell out of
+        the window stay, and their hours are not lost from the totals.
     """
-    clear_table_columns_cache()
+    clear_table_columns_cache(db_path)
     log.info(f"[SYNC] Fetching '{model_name}' records from Odoo...")
-    field_map = prepare_field_mapping(client, model_name, config_path)
+    # One fields_get per model: reused for validation, fetch and typed conversion
+    if prefetched is not None:
+        field_info, prefetched_records = prefetched
+    else:
+        with phase("fields_get", model_name):
+            field_info = get_model_field_info(client, model_name)
+    field_map = prepare_field_mapping(client, model_name, config_path, field_info)
     odoo_fields = list(field_map.keys())
     if not odoo_fields:
         log.warning(f"[WARN] No valid fields found for model '{model_name}'. Skipping sync.")
         return
 
+    config_domain = resolve_sync_domain(client, model_name, field_info, scope_context)
+    # A prefetched result (concurrent fetch) already has the configured domain applied
+    if prefetched is None and config_domain is not None:
+        if domains is None:
+            domains = [config_domain]
+        else:
+            domains = [list(domain) + config_domain for domain in domains]
+        log.debug(f"[SYNC] '{model_name}' restricted by sync_domains.json: {config_domain}")
+
     try:
-        records = fetch_odoo_records(client, model_name, odoo_fields)
+        scoped_ids = None
+        if prefetched is not None:
+            records = prefetched_records
+        elif domains is None:
+            with phase("fetch", model_name) as timing:
+                records = fetch_odoo_records(client, model_name, odoo_fields, field_info)
+                timing.add_rows(len(records))
+        else:
+            with phase("scope", model_name) as timing:
+                scoped_ids = search_scoped_ids(client, model_name, domains)
+                timing.add_rows(len(scoped_ids))
+            with phase("fetch", model_name) as timing:
+                records = fetch_scoped_records(
+                    client, model_name, odoo_fields, field_info, domains, scoped_ids,
+                    table_name, account_id, db_path, delta,
+                )
+                timing.add_rows(len(records))
         log.info(f"[SYNC] Downloaded {len(records)} records for '{model_name}'.")
-        fetched_odoo_ids = process_odoo_records(
-            records, table_name, model_name, account_id, config_path, db_path
-        )
-        remove_orphaned_local_records(
-            fetched_odoo_ids, table_name, model_name, account_id, db_path
-        )
+        with phase("upsert", model_name) as timing:
+            fetched_odoo_ids = process_odoo_records(
+                records, table_name, model_name, account_id, config_path, db_path,
+                field_types=field_info,
+            )
+            timing.add_rows(len(fetched_odoo_ids))
+        with phase("orphans", model_name):
+            keep_ids = fetched_odoo_ids if scoped_ids is None else scoped_ids
+            reason = "no longer exists on server"
+            if config_domain is not None:
+                # Outside the configured domain/window is not the same as deleted
+                keep_ids = keep_ids | confirm_existing_ids(
+                    client, model_name, get_local_odoo_ids(db_path, table_name, account_id) - keep_ids
+                )
+            elif scoped_ids is not None:
+                reason = "outside the synced scope"
+            remove_orphaned_local_records(
+                keep_ids, table_name, model_name, account_id, db_path, reason=reason
+            )
 
         log.info(f"[SYNC] Completed sync for '{model_name}' -> '{table_name}' ({len(fetched_odoo_ids)} records processed)")
         
@@ -425,7 +408,7 @@ def sync_model(
             )
 
 
-def prepare_field_mapping(client, model_name, config_path):
+def prepare_field_mapping(client, model_name, config_path, model_fields=None):
     """
     Prepare and validate field mapping for a model against available Odoo fields.
     
@@ -433,12 +416,14 @@ def prepare_field_mapping(client, model_name, config_path):
         client (OdooClient): Authenticated Odoo client instance
         model_name (str): Name of the Odoo model
         config_path (str): Path to the field configuration JSON file
+        model_fields (dict): Optional result of get_model_field_info, to avoid
+            another fields_get round-trip
         
     Returns:
         dict: Validated field mapping with only fields that exist in the Odoo model
     """
     field_map = load_field_mapping(model_name, config_path)
-    all_model_fields = get_model_fields(client, model_name)
+    all_model_fields = model_fields if model_fields is not None else get_model_fields(client, model_name)
 
     valid_field_map = {}
     missing_fields = []
@@ -460,9 +445,9 @@ def prepare_field_mapping(client, model_name, config_path):
     return valid_field_map
 
 
-def fetch_odoo_records(client, model_name, fields):
+def fetch_odoo_records(client, model_name, fields, model_fields=None, domain=None):
     """
-    Fetch all records from an Odoo model with specified fields.
+    Fetch all records (or those matching a domain) from an Odoo model.
     
     Uses a fast single-request path first. If the XML-RPC response fails to parse
     (e.g. due to malformed HTML in rich-text fields like 'description'), falls back
@@ -472,6 +457,9 @@ def fetch_odoo_records(client, model_name, fields):
         client (OdooClient): Authenticated Odoo client instance
         model_name (str): Name of the Odoo model to fetch from
         fields (list): List of field names to fetch
+        model_fields (dict): Optional result of get_model_field_info, to avoid
+            another fields_get round-trip
+        domain (list): Optional Odoo domain, defaults to all records
         
     Returns:
         list: List of record dictionaries from Odoo
@@ -480,7 +468,8 @@ def fetch_odoo_records(client, model_name, fields):
         Automatically includes 'id' field and 'write_date' if available in the model.
     """
     # Ensure we include 'id' (safe for all), but 'write_date' only if it's valid
-    model_fields = get_model_fields(client, model_name)
+    if model_fields is None:
+        model_fields = get_model_fields(client, model_name)
     safe_fields = list(fields)
     log.debug(f"[FETCH] {model_name} fetching fields: {safe_fields}")
 
@@ -497,7 +486,7 @@ def fetch_odoo_records(client, model_name, fields):
             client.password,
             model_name,
             "search_read",
-            [[]],
+            [domain or []],
             {"fields": safe_fields},
         )
     except Exception as e:
@@ -513,10 +502,10 @@ def fetch_odoo_records(client, model_name, fields):
         
         log.warning(f"[FETCH] XML parse error fetching {model_name} in bulk: {e}")
         log.info(f"[FETCH] Falling back to batched fetching for {model_name}...")
-        return _fetch_odoo_records_batched(client, model_name, safe_fields)
+        return _fetch_odoo_records_batched(client, model_name, safe_fields, domain=domain)
 
 
-def _fetch_odoo_records_batched(client, model_name, fields, batch_size=50):
+def _fetch_odoo_records_batched(client, model_name, fields, batch_size=50, domain=None):
     """
     Fallback: fetch records in batches to isolate problematic records.
     
@@ -530,6 +519,7 @@ def _fetch_odoo_records_batched(client, model_name, fields, batch_size=50):
         model_name (str): Name of the Odoo model
         fields (list): List of field names to fetch
         batch_size (int): Number of records per batch
+        domain (list): Optional Odoo domain, defaults to all records
         
     Returns:
         list: Successfully fetched records (problematic ones skipped)
@@ -537,7 +527,7 @@ def _fetch_odoo_records_batched(client, model_name, fields, batch_size=50):
     # Step 1: Get all record IDs (lightweight — no field data, no XML issues)
     all_ids = client.models.execute_kw(
         client.db, client.uid, client.password,
-        model_name, "search", [[]]
+        model_name, "search", [domain or []]
     )
     log.info(f"[FETCH] {model_name}: {len(all_ids)} record IDs found, fetching in batches of {batch_size}")
     
@@ -578,7 +568,8 @@ def _fetch_odoo_records_batched(client, model_name, fields, batch_size=50):
 
 
 def process_odoo_records(
-    records, table_name, model_name, account_id, config_path, db_path
+    records, table_name, model_name, account_id, config_path, db_path,
+    field_types=None,
 ):
     """
     Process fetched Odoo records and update local database based on timestamps.
@@ -590,6 +581,7 @@ def process_odoo_records(
         account_id (int): Account ID for record association
         config_path (str): Path to the field configuration JSON file
         db_path (str): Path to the SQLite database file
+        field_types (dict): Optional Odoo field name -> type, passed to insert_record
         
     Returns:
         set: Set of Odoo record IDs that were processed
@@ -600,32 +592,32 @@ def process_odoo_records(
     """
     fetched_odoo_ids = set()
 
-    # Check once if 'last_modified' column exists in the table using PRAGMA
-    pragma_result = safe_sql_execute(
-        db_path, f"PRAGMA table_info({table_name})", commit=False, fetch=True
-    )
-    columns = [row[1] for row in pragma_result]
+    # Check once which bookkeeping columns exist (cached per sync run)
+    columns = get_table_columns(db_path, table_name)
     has_last_modified = "last_modified" in columns
     has_status = "status" in columns
     has_draft_flag = "has_draft" in columns
 
+    select_fields = []
+    if has_last_modified:
+        select_fields.append("last_modified")
+    if has_status:
+        select_fields.append("status")
+    if has_draft_flag:
+        select_fields.append("has_draft")
+    local_state_sql = (
+        f"SELECT {', '.join(select_fields)} FROM {table_name} WHERE odoo_record_id = ? AND account_id = ?"
+    )
+
     for rec in records:
         odoo_id = rec["id"]
         fetched_odoo_ids.add(odoo_id)
         #print(rec) #to view the record for debugging
 
-        if has_last_modified or has_status or has_draft_flag:
-            select_fields = []
-            if has_last_modified:
-                select_fields.append("last_modified")
-            if has_status:
-                select_fields.append("status")
-            if has_draft_flag:
-                select_fields.append("has_draft")
-
+        if select_fields:
             row = safe_sql_execute(
                 db_path,
-                f"SELECT {', '.join(select_fields)} FROM {table_name} WHERE odoo_record_id = ? AND account_id = ?",
+                local_state_sql,
                 (odoo_id, account_id),
                 commit=False,
                 fetch=True,
@@ -654,7 +646,8 @@ def process_odoo_records(
 
             if should_update_local(odoo_write_date, local_last_modified):
                 insert_record(
-                    table_name, model_name, account_id, rec, db_path, config_path
+                    table_name, model_name, account_id, rec, db_path, config_path,
+                    field_types=field_types,
                 )
             else:
                 # For mail.activity, backfill resId if it's missing (migration for existing records)
@@ -683,14 +676,15 @@ def process_odoo_records(
                     f"[SKIP] {model_name} id={odoo_id} unchanged (local is newer or equal)."
                 )
         else:
-            insert_record(table_name, model_name, account_id, rec, db_path, config_path)
+            insert_record(table_name, model_name, account_id, rec, db_path, config_path, field_types=field_types)
             #log.debug(f"[FORCE] {model_name} id={odoo_id} updated (no timestamp column).")
 
     return fetched_odoo_ids
 
 
 def remove_orphaned_local_records(
-    fetched_odoo_ids, table_name, model_name, account_id, db_path
+    fetched_odoo_ids, table_name, model_name, account_id, db_path,
+    reason="no longer exists on server",
 ):
     """
     Remove local records that no longer exist in Odoo.
@@ -701,17 +695,16 @@ def remove_orphaned_local_records(
         model_name (str): Name of the Odoo model (for logging)
         account_id (int): Account ID to filter records
         db_path (str): Path to the SQLite database file
+        reason (str): Why the missing records are removed, for the log
         
     Note:
         Deletes local records with odoo_record_id not in the fetched set,
         ensuring local database doesn't contain stale records.
-        EXCEPTION: Records with status='updated' are preserved (pending local changes).
+        EXCEPTION: Records with status 'updated', 'created' or 'deleted' are
+        preserved (pending local changes still to be pushed).
         EXCEPTION: For mail_activity_app, records with state='done' are preserved.
     """
-    pragma_result = safe_sql_execute(
-        db_path, f"PRAGMA table_info({table_name})", commit=False, fetch=True
-    )
-    columns = [row[1] for row in pragma_result]
+    columns = get_table_columns(db_path, table_name)
 
     select_fields = ["id", "odoo_record_id"]
     has_status = "status" in columns
@@ -749,7 +742,7 @@ def remove_orphaned_local_records(
         
         if odoo_id not in fetched_odoo_ids:
             # Skip deletion if record has pending local changes
-            if status in ("updated", "created"):
+            if status in ("updated", "created", "deleted"):
                 log.info(f"[SKIP_DELETE] {model_name}: local_id={local_id}, odoo_id={odoo_id} has pending local changes (status={status}) - keeping record")
                 continue
 
@@ -769,13 +762,206 @@ def remove_orphaned_local_records(
                 commit=True,
             )
             log.info(
-                f"[DELETE] {model_name}: local_id={local_id}, odoo_id={odoo_id} removed - no longer exists on server."
+                f"[DELETE] {model_name}: local_id={local_id}, odoo_id={odoo_id} removed - {reason}."
             )
 
 
+# Largest id list sent in a single `in` domain
+SCOPE_BATCH_SIZE = 500
+
+_WRITE_DATE_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}")
+
+
+def chunked_in_domains(base_domain, field, ids, batch_size=SCOPE_BATCH_SIZE):
+    """
+    Split an `in` condition over many ids into several domains.
+
+    Args:
+        base_domain (list): Leaves shared by every batch
+        field (str): Field compared with `in`
+        ids (iterable): Ids to match
+        batch_size (int): Maximum ids per domain
+
+    Returns:
+        list: One domain per batch, empty when there are no ids
+    """
+    ids = sorted(set(ids))
+    return [
+        list(base_domain) + [(field, "in", ids[i:i + batch_size])]
+        for i in range(0, len(ids), batch_size)
+    ]
+
+
+def get_local_odoo_ids(db_path, table_name, account_id):
+    """Return the set of server ids stored locally for an account (empty if the table is missing)."""
+    safe_table_name = _validate_table_name(table_name)
+    if "odoo_record_id" not in get_table_columns(db_path, safe_table_name):
+        return set()
+    rows = safe_sql_execute(
+        db_path,
+        f"SELECT odoo_record_id FROM {safe_table_name} WHERE account_id = ? AND odoo_record_id > 0",
+        (account_id,),
+        fetch=True,
+        commit=False,
+    ) or []
+    return {int(row[0]) for row in rows if row[0] is not None}
+
+
+def get_local_watermark(db_path, table_name, account_id):
+    """
+    Return the newest server write_date stored locally, for delta fetches.
+
+    Rows with pending local changes are ignored because their last_modified
+    is a local timestamp, not the server's write_date.
+
+    Returns:
+        str: 'YYYY-MM-DD HH:MM:SS' or None when nothing usable is stored
+    """
+    safe_table_name = _validate_table_name(table_name)
+    columns = get_table_columns(db_path, safe_table_name)
+    if "last_modified" not in columns:
+        return None
+    status_filter = " AND COALESCE(status, '') NOT IN ('updated', 'created')" if "status" in columns else ""
+    rows = safe_sql_execute(
+        db_path,
+        f"SELECT MAX(last_modified) FROM {safe_table_name} WHERE account_id = ?{status_filter}",
+        (account_id,),
+        fetch=True,
+        commit=False,
+    )
+    value = rows[0][0] if rows else None
+    if not value or not _WRITE_DATE_PATTERN.match(str(value)):
+        return None
+    return str(value)[:19].replace("T", " ")
+
+
+def search_scoped_ids(client, model_name, domains):
+    """Return the set of server ids matching any of the domains (ids only, no field data)."""
+    ids = set()
+    for domain in domains:
+        ids.update(client.models.execute_kw(
+            client.db, client.uid, client.password,
+            model_name, "search", [domain],
+        ))
+    return ids
+
+
+def confirm_existing_ids(client, model_name, candidate_ids):
+    """
+    Return which of the candidate ids still exist on the server.
+
+    Used before orphan removal when sync_domains.json restricted the sync: a
+    local row outside the domain/window is not an orphan unless the server
+    no longer has it. Only ids are searched, in batches of SCOPE_BATCH_SIZE.
+    """
+    if not candidate_ids:
+        return set()
+    return search_scoped_ids(client, model_name, chunked_in_domains([], "id", candidate_ids))
+
+
+def fetch_scoped_records(
+    client, model_name, fields, model_fields, domains, scoped_ids,
+    table_name, account_id, db_path, delta=False,
+):
+    """
+    Fetch the records of a scoped model, optionally only what changed.
+
+    Args:
+        client (OdooClient): Authenticated Odoo client instance
+        model_name (str): Name of the Odoo model
+        fields (list): Field names to fetch
+        model_fields (dict): Result of get_model_field_info
+        domains (list): Domains defining the scope
+        scoped_ids (set): Ids returned by search_scoped_ids for the same domains
+        table_name (str): Local table, used for the delta watermark
+        account_id (int): Account ID
+        db_path (str): Path to the SQLite database file
+        delta (bool): Fetch only records written since the local watermark,
+            plus scoped ids that are not stored locally yet
+
+    Returns:
+        list: Record dictionaries, one per id
+    """
+    watermark = None
+    if delta and "write_date" in model_fields:
+        watermark = get_local_watermark(db_path, table_name, account_id)
+
+    if watermark:
+        # >= so records written in the same second as the watermark are not missed
+        fetch_domains = [list(domain) + [("write_date", ">=", watermark)] for domain in domains]
+        missing = scoped_ids - get_local_odoo_ids(db_path, table_name, account_id)
+        fetch_domains += chunked_in_domains([], "id", missing)
+        log.debug(f"[FETCH] {model_name}: delta since {watermark}, {len(missing)} record(s) new to this device")
+    else:
+        fetch_domains = domains
+
+    records = {}
+    for domain in fetch_domains:
+        for rec in fetch_odoo_records(client, model_name, fields, model_fields, domain=domain):
+            records[rec["id"]] = rec
+    return list(records.values())
+
+
+# Local tables whose records' attachments are synced (res_model -> table)
+ATTACHMENT_SCOPE_TABLES = {
+    "project.project": "project_project_app",
+    "project.task": "project_task_app",
+    "project.update": "project_update_app",
+}
+
+
+def attachment_scope_domains(db_path, account_id):
+    """
+    Build batched ir.attachment domains covering the records this device has.
+
+    Returns:
+        list: Domains of the form [('res_model', '=', m), ('res_id', 'in', ids)]
+    """
+    domains = []
+    for res_model, table in ATTACHMENT_SCOPE_TABLES.items():
+        ids = get_local_odoo_ids(db_path, table, account_id)
+        domains.extend(chunked_in_domains([("res_model", "=", res_model)], "res_id", ids))
+    return domains
+
+
+# Models synced through a scope (with write_date deltas) instead of a full search_read
+MODEL_SCOPES = {
+    "ir.attachment": attachment_scope_domains,
+}
+
+
+def _sync_model_scoped(
+    client, model, table, account_id, db_path, config_path, account_name="",
+    scope_context=None, prefetched=None,
+):
+    scope = MODEL_SCOPES.get(model)
+    domains = scope(db_path, account_id) if scope else None
+    sync_model(
+        client, model, table, account_id, db_path, config_path,
+        account_name=account_name, domains=domains, delta=scope is not None,
+        scope_context=scope_context, prefetched=None if scope else prefetched,
+    )
+
+
+# Models downloaded by sync_all_from_odoo, in order (Odoo model -> local table)
+MODELS_TO_SYNC = {
+    "project.project": "project_project_app",
+    "project.task": "project_task_app",
+    "account.analytic.line": "account_analytic_line_app",
+    "mail.activity.type": "mail_activity_type_app",
+    "mail.activity": "mail_activity_app",
+    "res.users": "res_users_app",
+    "ir.model": "ir_model_app",
+    "project.update": "project_update_app",
+    "project.task.type": "project_task_type_app",
+    "project.project.stage": "project_project_stage_app",
+    "ir.attachment": "ir_attachment_app",
+}
+
+
 def sync_all_from_odoo(
     client, account_id, db_path="app_settings.db", config_path="field_config.json",
-    account_name="",
+    account_name="", prefetched=None, checkpoint=None,
 ):
     """
     Synchronize all configured Odoo models with their corresponding SQLite tables.
@@ -785,42 +971,41 @@ def sync_all_from_odoo(
         account_id (int): Account ID for record association
         db_path (str): Path to the SQLite database file
         config_path (str): Path to the field configuration JSON file
+        prefetched (dict): Optional model -> (field_info, records) from
+            async_odoo_client.fetch_models_concurrently()
+        checkpoint (callable): Optional, called before each model; may raise
+            (e.g. SyncJob.check_preempted) to stop between models
         
     Note:
         Syncs the following models:
         - project.project -> project_project_app
         - project.task -> project_task_app  
         - account.analytic.line -> account_analytic_line_app
+          (plus read_group totals -> account_analytic_line_summary)
         - mail.activity.type -> mail_activity_type_app
         - mail.activity -> mail_activity_app
         - res.users -> res_users_app
     """
     log.debug(f"Account id is {account_id}")
 
-    models_to_sync = {
-        "project.project": "project_project_app",
-        "project.task": "project_task_app",
-        "account.analytic.line": "account_analytic_line_app",
-        "mail.activity.type": "mail_activity_type_app",
-        "mail.activity": "mail_activity_app",
-        "res.users": "res_users_app",
-        "ir.model":"ir_model_app",
-        "project.update":"project_update_app",
-        "project.task.type":"project_task_type_app",
-        "project.project.stage":"project_project_stage_app",
-        "ir.attachment":"ir_attachment_app",
-    }
+    models_to_sync = MODELS_TO_SYNC
 
-    # Dont do this , too heavy
-    """
-    models_to_sync = {
-        "ir.attachment":"ir_attachment_app",
-    }
-    """
+    # ir.attachment is scoped to the projects/tasks/updates synced above (see MODEL_SCOPES),
+    # other models by their optional entry in sync_domains.json
+    scope_context = ScopeContext(client)
     for model, table in models_to_sync.items():
+        if checkpoint:
+            checkpoint()
         send("sync_message",f"Syncing from Server {model}")
-        sync_model(client, model, table, account_id, db_path, config_path, account_name=account_name)
-
+        _sync_model_scoped(
+            client, model, table, account_id, db_path, config_path,
+            account_name=account_name, scope_context=scope_context,
+            prefetched=(prefetched or {}).get(model),
+        )
+        if model == TIMESHEET_MODEL:
+            # Totals of the history before the window the raw lines were limited to
+            send("sync_message", "Syncing timesheet totals from Server")
+            sync_timesheet_summary(client, account_id, db_path, scope_context)
 
 
 def sync_ondemand_tables_from_odoo(
@@ -851,4 +1036,103 @@ def sync_ondemand_tables_from_odoo(
     }
 
     for model, table in models_to_sync.items():
-        sync_model(client, model, table, account_id, db_path, config_path, account_name=account_name)
+        _sync_model_scoped(client, model, table, account_id, db_path, config_path, account_name=account_name)
+
+
+def sync_single_record(
+    client, model_name, table_name, odoo_record_id, account_id,
+    db_path="app_settings.db", config_path="field_config.json", account_name="",
+):
+    """
+    Refresh one record from Odoo without syncing the whole model.
+
+    Used after on-demand operations (e.g. an attachment upload) where only
+    the affected row needs to change locally.
+
+    Args:
+        client (OdooClient): Authenticated Odoo client instance
+        model_name (str): Name of the Odoo model
+        table_name (str): Name of the SQLite table
+        odoo_record_id (int): Server id of the record
+        account_id (int): Account ID for record association
+        db_path (str): Path to the SQLite database file
+        config_path (str): Path to the field configuration JSON file
+
+    Returns:
+        bool: True if the record was upserted, False if it no longer exists on
+              the server (the local row is removed in that case)
+    """
+    _validate_table_name(table_name)
+    field_info = get_model_field_info(client, model_name)
+    field_map = prepare_field_mapping(client, model_name, config_path, field_info)
+    fields = list(field_map.keys())
+    if "id" not in fields:
+        fields.append("id")
+    if "write_date" in field_info and "write_date" not in fields:
+        fields.append("write_date")
+
+    # search_read returns [] for a deleted id where read would raise MissingError
+    records = client.call(
+        model_name, "search_read", [[("id", "=", int(odoo_record_id))]], {"fields": fields}
+    )
+    if not records:
+        delete_local_record(table_name, model_name, odoo_record_id, account_id, db_path)
+        return False
+
+    insert_record(
+        table_name, model_name, account_id, records[0], db_path, config_path,
+        account_name=account_name, field_types=field_info,
+    )
+    log.info(f"[SYNC] Refreshed {model_name} record {odoo_record_id} -> '{table_name}'")
+    return True
+
+
+def delete_local_record(table_name, model_name, odoo_record_id, account_id, db_path="app_settings.db"):
+    """
+    Remove the local copy of a record that was deleted on the server.
+
+    Args:
+        table_name (str): Name of the SQLite table
+        model_name (str): Name of the Odoo model (for logging)
+        odoo_record_id (int): Server id of the record
+        account_id (int): Account ID the record belongs to
+        db_path (str): Path to the SQLite database file
+    """
+    safe_table_name = _validate_table_name(table_name)
+    safe_sql_execute(
+        db_path,
+        f"DELETE FROM {safe_table_name} WHERE account_id = ? AND odoo_record_id = ?",
+        (account_id, odoo_record_id),
+    )
+    log.info(f"[DELETE] {model_name}: odoo_id={odoo_record_id} removed locally after server delete.")
+
+
+def sync_all_from_odoo_concurrent(
+    client, account_id, db_path="app_settings.db", config_path="field_config.json",
+    account_name="", max_concurrency=4, checkpoint=None,
+):
+    """
+    Like sync_all_from_odoo(), but downloads all models concurrently first.
+
+    The fetch phase runs on an asyncio event loop (async_odoo_client) with
+    up to max_concurrency requests in flight; the upserts then run in the
+    usual order. Any model whose concurrent fetch failed is fetched again
+    sequentially by sync_model(). The daemon uses this when the
+    sync_fetch_concurrency setting is above 1.
+    """
+    from async_odoo_client import prefetch_models
+
+    with phase("fetch_concurrent") as timing:
+        try:
+            prefetched = prefetch_models(
+                client.url, client.db, client.username, client.password,
+                list(MODELS_TO_SYNC), config_path, max_concurrency,
+            )
+        except Exception as e:
+            log.warning(f"[FETCH] Concurrent fetch failed, falling back to sequential sync: {e}")
+            prefetched = {}
+        timing.add_rows(sum(len(records) for _, records in prefetched.values()))
+    sync_all_from_odoo(
+        client, account_id, db_path, config_path,
+        account_name=account_name, prefetched=prefetched, checkpoint=checkpoint,
+    )
@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+# MIT License
+#
+# Copyright (c) 2025 CIT-Services
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+Indexes for the sync engines' lookups on the *_app tables.
+
+The tables are created by the QML side (models/dbinit.js) with only the
+implicit UNIQUE (odoo_record_id, account_id) index. The sync code mostly
+filters by account first and reads the bookkeeping columns of each row:
+
+    WHERE odoo_record_id = ? AND account_id = ?          (per fetched record)
+    WHERE account_id = ? AND odoo_record_id IS NOT NULL  (orphan scan)
+    WHERE account_id = ? AND status IN ('updated', 'deleted')  (upload)
+
+create_sync_indexes() adds, for every table that has the columns:
+
+    idx_<table>_sync     (account_id, odoo_record_id, status, last_modified,
+                          has_draft); SQLite has no INCLUDE, so the read-only
+                          columns are trailing key columns, which makes the
+                          lookups above covering index scans
+    idx_<table>_pending  (account_id, status) WHERE status IN ('updated', 'deleted')
+    idx_<table>_draft    (account_id) WHERE has_draft = 1
+
+The pending filter compares status exactly, while the upload used to
+accept any case and surrounding blanks. normalize_status_values() lowercases
+and trims stored values and adds triggers that do the same for every later
+write, from the QML side as well, so the exact filter misses nothing.
+
+Both are idempotent and run as schema_manager migrations once the QML side
+has created the tables. explain_query_plan() returns the plan of a query
+for checks.
+"""
+
+import logging
+import sqlite3
+
+log = logging.getLogger("odoo_sync")
+
+# Statuses of rows waiting to be pushed; must match the partial index WHERE
+# clause exactly for SQLite to use the index
+PENDING_STATUSES = ("updated", "deleted")
+PENDING_STATUS_SQL = "status IN ('updated', 'deleted')"
+
+_COVERING_COLUMNS = ("account_id", "odoo_record_id", "status", "last_modified", "has_draft")
+
+
+def _app_tables(cursor):
+    cursor.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE '%\\_app' ESCAPE '\\'"
+    )
+    return [row[0] for row in cursor.fetchall() if row[0].replace("_", "").isalnum()]
+
+
+def _index_statements(table, columns):
+    """Return (index_name, sql) pairs for one table, given its column names."""
+    if "account_id" not in columns:
+        return []
+    statements = []
+    if "odoo_record_id" in columns:
+        key = [c for c in _COVERING_COLUMNS if c in columns]
+        statements.append((
+            f"idx_{table}_sync",
+            f"CREATE INDEX IF NOT EXISTS idx_{table}_sync ON {table} ({', '.join(key)})",
+        ))
+    if "status" in columns:
+        statements.append((
+            f"idx_{table}_pending",
+            f"CREATE INDEX IF NOT EXISTS idx_{table}_pending ON {table} (account_id, status) "
+            f"WHERE {PENDING_STATUS_SQL}",
+        ))
+    if "has_draft" in columns:
+        statements.append((
+            f"idx_{table}_draft",
+            f"CREATE INDEX IF NOT EXISTS idx_{table}_draft ON {table} (account_id) WHERE has_draft = 1",
+        ))
+    return statements
+
+
+def create_sync_indexes(cursor):
+    """
+    Create the missing sync indexes on all *_app tables.
+
+    Args:
+        cursor (sqlite3.Cursor): Cursor of the caller's transaction
+
+    Returns:
+        list[str]: Names of the indexes created by this call
+    """
+    created = []
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+    existing = {row[0] for row in cursor.fetchall()}
+    for table in _app_tables(cursor):
+        cursor.execute(f"PRAGMA table_info({table})")
+        columns = {row[1] for row in cursor.fetchall()}
+        for name, sql in _index_statements(table, columns):
+            if name in existing:
+                continue
+            cursor.execute(sql)
+            created.append(name)
+    if created:
+        log.info(f"[SYNC] Created {len(created)} sync index(es): {', '.join(created)}")
+    return created
+
+
+def normalize_status_values(cursor):
+    """
+    Lowercase and trim the status of every *_app row, now and on later writes.
+
+    Args:
+        cursor (sqlite3.Cursor): Cursor of the caller's transaction
+
+    Returns:
+        int: Number of rows whose stored status changed
+    """
+    changed = 0
+    for table in _app_tables(cursor):
+        cursor.execute(f"PRAGMA table_info({table})")
+        if "status" not in {row[1] for row in cursor.fetchall()}:
+            continue
+        cursor.execute(f"UPDATE {table} SET status = lower(trim(status)) WHERE status != lower(trim(status))")
+        changed += cursor.rowcount
+        for suffix, event in (("insert", "INSERT"), ("update", "UPDATE OF status")):
+            cursor.execute(
+                f"CREATE TRIGGER IF NOT EXISTS trg_{table}_status_{suffix} AFTER {event} ON {table} "
+                f"WHEN NEW.status != lower(trim(NEW.status)) BEGIN "
+                f"UPDATE {table} SET status = lower(trim(NEW.status)) WHERE rowid = NEW.rowid; END"
+            )
+    if changed:
+        log.info(f"[SYNC] Normalized the status of {changed} local row(s)")
+    return changed
+
+
+def ensure_sync_indexes(db_path):
+    """
+    Create the missing sync indexes of a database outside the migrations
+    (benchmarks and tests).
+
+    Returns:
+        list[str]: Names of the indexes created by this call
+    """
+    conn = sqlite3.connect(db_path, timeout=30)
+    try:
+        created = create_sync_indexes(conn.cursor())
+        conn.commit()
+        if created:
+            # Give the planner statistics for the new indexes
+            conn.execute("PRAGMA optimize")
+    finally:
+        conn.close()
+    return created
+
+
+def drop_sync_indexes(db_path):
+    """Drop the sync indexes again, e.g. to benchmark the tables without them."""
+    conn = sqlite3.connect(db_path, timeout=30)
+    try:
+        cursor = conn.cursor()
+        for table in _app_tables(cursor):
+            for suffix in ("sync", "pending", "draft"):
+                cursor.execute(f"DROP INDEX IF EXISTS idx_{table}_{suffix}")
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def explain_query_plan(db_path, sql, values=()):
+    """
+    Return the EXPLAIN QUERY PLAN details of a query.
+
+    Returns:
+        list[str]: One detail line per plan step, e.g.
+            "SEARCH project_task_app USING COVERING INDEX idx_project_task_app_sync (account_id=?)"
+    """
+    conn = sqlite3.connect(db_path, timeout=30)
+    try:
+        rows = conn.execute(f"EXPLAIN QUERY PLAN {sql}", values).fetchall()
+    finally:
+        conn.close()
+    return [row[-1] for row in rows]
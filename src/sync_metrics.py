@@ -0,0 +1,318 @@
+# -*- coding: utf-8 -*-
+# MIT License
+#
+# Copyright (c) 2025 CIT-Services
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Per-phase timing for sync runs.
+
+A sync run is wrapped in profile_sync(), which activates a SyncProfiler for
+the current thread. Code inside the run marks its phases with phase(); the
+XML-RPC transports in odoo_client report bytes and time spent waiting on the
+network versus parsing the response into the innermost open phase. When the
+run finishes the collected rows are written to the sync_metrics table.
+
+Outside an active run every helper here is a cheap no-op.
+"""
+
+import logging
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+
+from common import safe_sql_execute
+from schema_manager import ensure_schema
+
+log = logging.getLogger("odoo_sync")
+
+# Number of runs kept per account in sync_metrics
+MAX_RUNS_PER_ACCOUNT = 20
+
+_local = threading.local()
+
+
+class PhaseStats:
+    """Accumulated counters for one (model, phase) pair."""
+
+    __slots__ = ("wall", "network", "parse", "bytes_in", "bytes_out", "rows", "calls")
+
+    def __init__(self):
+        self.wall = 0.0
+        self.network = 0.0
+        self.parse = 0.0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.rows = 0
+        self.calls = 0
+
+
+class SyncProfiler:
+    """
+    Collects phase timings for a single sync run of one account.
+
+    Args:
+        account_id (int): Local account id
+        source (str): Who started the run, e.g. "daemon" or "app"
+        direction (str): "both", "download_only" or "upload_only"
+    """
+
+    def __init__(self, account_id, source, direction="both"):
+        self.run_id = uuid.uuid4().hex
+        self.account_id = account_id
+        self.source = source
+        self.direction = direction
+        self.started_at = datetime.utcnow().isoformat() + "Z"
+        self._t0 = time.perf_counter()
+        self.total = 0.0
+        self.stats = {}
+        self._stack = []
+
+    def _get(self, model, name):
+        key = (model or "", name)
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = self.stats[key] = PhaseStats()
+        return stats
+
+    def current(self):
+        """Return the PhaseStats of the innermost open phase, or an 'rpc' bucket."""
+        if self._stack:
+            return self._stack[-1]
+        return self._get("", "rpc")
+
+    def finish(self):
+        self.total = time.perf_counter() - self._t0
+
+    def rows_for_db(self):
+        for (model, name), s in self.stats.items():
+            yield (
+                self.run_id, self.account_id, self.source, self.direction,
+                self.started_at, model, name,
+                round(s.wall * 1000, 2), round(s.network * 1000, 2), round(s.parse * 1000, 2),
+                s.bytes_in, s.bytes_out, s.rows, s.calls,
+            )
+
+    def summary(self):
+        """Return a one-line human readable summary of the slowest phases."""
+        top = sorted(self.stats.items(), key=lambda kv: kv[1].wall, reverse=True)[:5]
+        parts = [
+            f"{model or '-'}:{name}={s.wall:.2f}s"
+            + (f" (net {s.network:.2f}s, parse {s.parse:.2f}s, {s.bytes_in // 1024}KiB)" if s.bytes_in else "")
+            for (model, name), s in top
+        ]
+        return f"total={self.total:.2f}s " + ", ".join(parts)
+
+
+def active_profiler():
+    """Return the SyncProfiler running on this thread, or None."""
+    return getattr(_local, "profiler", None)
+
+
+class _PhaseHandle:
+    """Returned by phase(); lets the caller report rows touched."""
+
+    __slots__ = ("stats",)
+
+    def __init__(self, stats):
+        self.stats = stats
+
+    def add_rows(self, count):
+        if self.stats is not None:
+            self.stats.rows += count
+
+
+@contextmanager
+def phase(name, model=None):
+    """
+    Time a block as a named phase of the active sync run.
+
+    Args:
+        name (str): Phase name (login, fields_get, fetch, upsert, orphans,
+            push, notifications, ...)
+        model (str): Odoo model the phase belongs to, optional
+
+    Yields:
+        _PhaseHandle: call add_rows() to record rows touched
+    """
+    profiler = active_profiler()
+    if profiler is None:
+        yield _PhaseHandle(None)
+        return
+
+    stats = profiler._get(model, name)
+    profiler._stack.append(stats)
+    start = time.perf_counter()
+    try:
+        yield _PhaseHandle(stats)
+    finally:
+        stats.wall += time.perf_counter() - start
+        stats.calls += 1
+        profiler._stack.pop()
+
+
+def add_rows(count):
+    """Add rows touched to the innermost open phase of the active run."""
+    profiler = active_profiler()
+    if profiler is not None:
+        profiler.current().rows += count
+
+
+def record_transfer(bytes_in=0, bytes_out=0, network=0.0, parse=0.0):
+    """
+    Attribute one RPC round-trip to the innermost open phase.
+
+    Args:
+        bytes_in (int): Response body bytes received
+        bytes_out (int): Request body bytes sent
+        network (float): Seconds spent sending and waiting/reading the response
+        parse (float): Seconds spent decoding the XML response
+    """
+    profiler = active_profiler()
+    if profiler is None:
+        return
+    stats = profiler.current()
+    stats.bytes_in += bytes_in
+    stats.bytes_out += bytes_out
+    stats.network += network
+    stats.parse += parse
+
+
+def save_profile(db_path, profiler):
+    """
+    Persist a finished run and trim old runs for the account.
+
+    Args:
+        db_path (str): Path to the app SQLite database
+        profiler (SyncProfiler): Finished profiler
+    """
+    ensure_schema(db_path)
+    rows = list(profiler.rows_for_db())
+    rows.append((
+        profiler.run_id, profiler.account_id, profiler.source, profiler.direction,
+        profiler.started_at, "", "total", round(profiler.total * 1000, 2),
+        0, 0, 0, 0, 0, 1,
+    ))
+    safe_sql_execute(
+        db_path,
+        """
+        INSERT INTO sync_metrics (run_id, account_id, source, direction, started_at, model, phase,
+                                  wall_ms, network_ms, parse_ms, bytes_in, bytes_out, rows, calls)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        rows,
+        many=True,
+    )
+    safe_sql_execute(
+        db_path,
+        """
+        DELETE FROM sync_metrics WHERE account_id = ? AND run_id NOT IN (
+            SELECT run_id FROM sync_metrics WHERE account_id = ? AND phase = 'total'
+            ORDER BY started_at DESC LIMIT ?
+        )
+        """,
+        (profiler.account_id, profiler.account_id, MAX_RUNS_PER_ACCOUNT),
+    )
+
+
+@contextmanager
+def profile_sync(db_path, account_id, source, direction="both"):
+    """
+    Profile a sync run on the current thread and store it in sync_metrics.
+
+    Args:
+        db_path (str): Path to the app SQLite database
+        account_id (int): Local account id
+        source (str): "daemon" or "app"
+        direction (str): Sync direction of the run
+
+    Yields:
+        SyncProfiler: the active profiler
+
+    Note:
+        Failures while saving metrics are logged and never break the sync.
+    """
+    previous = active_profiler()
+    profiler = SyncProfiler(account_id, source, direction)
+    _local.profiler = profiler
+    try:
+        yield profiler
+    finally:
+        _local.profiler = previous
+        profiler.finish()
+        log.info(f"[METRICS] Account {account_id} ({source}): {profiler.summary()}")
+        try:
+            save_profile(db_path, profiler)
+        except Exception as e:
+            log.warning(f"[METRICS] Failed to store sync metrics: {e}")
+
+
+def get_sync_metrics(db_path, account_id, runs=1):
+    """
+    Return the most recent profiled runs for an account.
+
+    Args:
+        db_path (str): Path to the app SQLite database
+        account_id (int): Local account id
+        runs (int): Number of runs to return, newest first
+
+    Returns:
+        list: One dict per run: {run_id, source, direction, started_at,
+              total_ms, phases: [{model, phase, wall_ms, network_ms, parse_ms,
+              bytes_in, bytes_out, rows, calls}, ...]}
+    """
+    ensure_schema(db_path)
+    run_rows = safe_sql_execute(
+        db_path,
+        """
+        SELECT run_id, source, direction, started_at, wall_ms FROM sync_metrics
+        WHERE account_id = ? AND phase = 'total'
+        ORDER BY started_at DESC LIMIT ?
+        """,
+        (account_id, runs),
+        fetch=True,
+        commit=False,
+    ) or []
+
+    result = []
+    for run_id, source, direction, started_at, total_ms in run_rows:
+        phase_rows = safe_sql_execute(
+            db_path,
+            """
+            SELECT model, phase, wall_ms, network_ms, parse_ms, bytes_in, bytes_out, rows, calls
+            FROM sync_metrics WHERE run_id = ? AND phase != 'total'
+            ORDER BY wall_ms DESC
+            """,
+            (run_id,),
+            fetch=True,
+            commit=False,
+        ) or []
+        keys = ("model", "phase", "wall_ms", "network_ms", "parse_ms", "bytes_in", "bytes_out", "rows", "calls")
+        result.append({
+            "run_id": run_id,
+            "source": source,
+            "direction": direction,
+            "started_at": started_at,
+            "total_ms": total_ms,
+            "phases": [dict(zip(keys, row)) for row in phase_rows],
+        })
+    return result
@@ -27,10 +27,13 @@ import sqlite3
 import logging
 from odoo_client import OdooClient
 from common import sanitize_datetime, safe_sql_execute, add_notification, clear_sync_notifications
+from field_mapping import load_field_mapping, get_model_mapping
 from pathlib import Path
 from datetime import datetime, timezone
 import os
 from bus import send
+from sync_metrics import phase, add_rows
+from schema_manager import ensure_schema
 
 log = logging.getLogger("odoo_sync")
 
@@ -69,40 +72,6 @@ def get_record_display_name(record, model_name=None):
         return f"id={record_id}"
 
 
-def load_field_mapping(model_name, config_path="field_config.json"):
-    """
-    Load field mapping configuration for a specific Odoo model.
-    
-    Args:
-        model_name (str): Name of the Odoo model to load mapping for
-        config_path (str): Path to the field configuration JSON file
-        
-    Returns:
-        dict: Field mapping dictionary where keys are Odoo field names 
-              and values are SQLite field names. Returns empty dict on error.
-              
-    Note:
-        Reads from JSON configuration file in the same directory as the script.
-        Lists directory contents on error for debugging purposes.
-    """
-    try:
-        current_dir = Path(__file__).parent.resolve()
-        full_path = current_dir / config_path
-        with open(full_path, "r") as f:
-            mapping = json.load(f)
-        return mapping.get(model_name, {})
-    except Exception as e:
-        log.debug(
-            f"[ERROR] Failed to load field mapping for '{model_name}' at {full_path}: {e}"
-        )
-        try:
-            files = os.listdir(current_dir)
-            log.debug(f"[DEBUG] Contents of {current_dir}: {files}")
-        except Exception as dir_err:
-            log.debug(f"[ERROR] Failed to list contents of {current_dir}: {dir_err}")
-        return {}
-
-
 def get_res_model_id(db_path, account_id, res_model, client=None):
     """
     Look up the Odoo model ID (res_model_id) using multiple fallback strategies.
@@ -433,6 +402,7 @@ def get_local_records(
     account_id,
     db_path="app_settings.db",
     config_path="field_config.json",
+    pending_only=False,
 ):
     """
     Retrieve local records from SQLite database for a specific table and account.
@@ -443,6 +413,7 @@ def get_local_records(
         account_id: Account ID to filter records by
         db_path (str): Path to SQLite database file
         config_path (str): Path to field configuration JSON file
+        pending_only (bool): Only return rows with status 'updated' or 'deleted'
         
     Returns:
         list: List of records (dictionaries) from the local SQLite table
@@ -452,12 +423,11 @@ def get_local_records(
         Joins the 'id' field, mapped fields from field_config, 'status', and 'odoo_record_id'.
         Filters records by account_id.
     """
-    field_map = load_field_mapping(model_name, config_path)
-    sqlite_fields = list(field_map.values())
+    mapping = get_model_mapping(model_name, config_path)
 
     try:
-        fields = ["id"] + sqlite_fields + ["status", "odoo_record_id"]
-        query = f"SELECT {', '.join(fields)} FROM {table_name} WHERE account_id = ?"
+        fields = mapping.local_select_columns()
+        query = mapping.local_select_sql(table_name, pending_only)
         rows = safe_sql_execute(db_path, query, (account_id,), fetch=True, commit=False)
         records = (
             [dict(zip(fields, row)) for row in rows] if rows else []
@@ -1074,8 +1044,9 @@ def sync_to_odoo(
     if model_name == "mail.activity":
         cleanup_corrupted_activities(db_path, account_id)
     
+    # Only rows waiting to be pushed; served by the partial pending index
     all_records = get_local_records(
-        table_name, model_name, account_id, db_path, config_path
+        table_name, model_name, account_id, db_path, config_path, pending_only=True
     )
 
     local_records = [r for r in all_records if normalized_status(r) == "updated"]
@@ -1134,6 +1105,7 @@ def sync_to_odoo(
                 payload={"record_id": record.get("id"), "record_name": record_name}
             )
 
+    add_rows(len(local_records) + len(deleted_records))
     log.info(
         f"[SYNC] {model_name}: {len(local_records)} updated, {len(deleted_records)} deleted."
     )
@@ -1165,7 +1137,10 @@ def sync_all_to_odoo(
         "project.update":"project_update_app",
     }
 
+    # The pending-row query relies on the normalized status values (migration 5)
+    ensure_schema(db_path)
 
     for model, table in models.items():
         send("sync_message",f"Syncing to Server {model}")
-        sync_to_odoo(client, model, table, account_id, db_path, config_path)
+        with phase("push", model):
+            sync_to_odoo(client, model, table, account_id, db_path, config_path)
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+# MIT License
+#
+# Copyright (c) 2025 CIT-Services
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Shared fixtures for the src/ tests.
+
+The modules in src/ import each other as top-level modules (the daemon and
+the QML backend run with src/ on sys.path), so the tests do the same.
+Run them from the repository root with ``python -m pytest src/tests``.
+"""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC_DIR = Path(__file__).resolve().parent.parent
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+# Minimal copies of the QML-created tables (models/dbinit.js) the tests touch
+APP_TABLES_SQL = (
+    """
+    CREATE TABLE project_task_app (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        account_id INTEGER,
+        name TEXT,
+        project_id INTEGER,
+        last_modified datetime,
+        status TEXT DEFAULT "",
+        has_draft INTEGER DEFAULT 0,
+        odoo_record_id INTEGER,
+        UNIQUE (odoo_record_id, account_id)
+    )
+    """,
+    """
+    CREATE TABLE account_analytic_line_app (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        account_id INTEGER,
+        project_id INTEGER,
+        task_id INTEGER,
+        name TEXT,
+        unit_amount FLOAT,
+        last_modified datetime,
+        record_date datetime,
+        user_id INTEGER,
+        status TEXT DEFAULT "",
+        has_draft INTEGER DEFAULT 0,
+        odoo_record_id INTEGER,
+        UNIQUE (odoo_record_id, account_id)
+    )
+    """,
+)
+
+
+def create_app_tables(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        for sql in APP_TABLES_SQL:
+            conn.execute(sql)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """Path of a fresh, empty SQLite database."""
+    return str(tmp_path / "app.db")
+
+
+@pytest.fixture
+def app_db(db_path):
+    """Database with the QML-side *_app tables the tests use."""
+    create_app_tables(db_path)
+    return db_path
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+# MIT License
+#
+# Copyright (c) 2025 CIT-Services
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Tests for streaming the datas field out of an XML-RPC read response."""
+
+import base64
+import io
+import xmlrpc.client
+
+import pytest
+
+from attachment_transfer import _DatasResponseParser
+
+
+def _parse(records, chunk_size=7):
+    body = xmlrpc.client.dumps((records,), methodresponse=True, allow_none=True).encode("utf-8")
+    sink = io.BytesIO()
+    parser = _DatasResponseParser(sink)
+    for i in range(0, len(body), chunk_size):
+        parser.feed(body[i:i + chunk_size])
+    parser.close()
+    return parser, sink.getvalue()
+
+
+def test_datas_is_decoded_across_chunks():
+    content = bytes(range(256)) * 4
+    parser, data = _parse([{"id": 1, "datas": base64.b64encode(content).decode()}])
+    assert parser.found
+    assert data == content
+
+
+@pytest.mark.parametrize("datas", [False, None, ""])
+def test_missing_content_is_reported_as_not_found(datas):
+    parser, data = _parse([{"id": 1, "datas": datas}])
+    assert not parser.found
+    assert data == b""
+
+
+def test_fault_is_raised():
+    body = xmlrpc.client.dumps(xmlrpc.client.Fault(2, "Access denied"), methodresponse=True).encode("utf-8")
+    parser = _DatasResponseParser(io.BytesIO())
+    parser.feed(body)
+    with pytest.raises(xmlrpc.client.Fault):
+        parser.close()
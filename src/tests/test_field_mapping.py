@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+# MIT License
+#
+# Copyright (c) 2025 CIT-Services
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Tests for the memoised field_config.json registry and the row converters."""
+
+import json
+import os
+
+import pytest
+
+from field_mapping import FieldMappingRegistry, ModelMapping, TYPE_CONVERTERS, convert_value
+
+
+@pytest.fixture
+def config_dir(tmp_path):
+    path = tmp_path / "field_config.json"
+    path.write_text(json.dumps({"project.task": {"name": "name", "project_id": "project_id"}}))
+    return tmp_path
+
+
+def test_registry_reuses_the_parsed_config(config_dir):
+    registry = FieldMappingRegistry(config_dir)
+    first = registry.get("project.task")
+    assert first.odoo_fields == ("name", "project_id")
+    assert registry.get("project.task") is first
+
+
+def test_registry_reloads_an_edited_config(config_dir):
+    registry = FieldMappingRegistry(config_dir)
+    first = registry.get("project.task")
+    path = config_dir / "field_config.json"
+    path.write_text(json.dumps({"project.task": {"name": "name", "user_ids": "user_id"}}))
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+    second = registry.get("project.task")
+    assert second is not first
+    assert second.sqlite_columns == ("name", "user_id")
+
+
+def test_registry_keeps_the_last_good_config_while_the_file_is_broken(config_dir):
+    registry = FieldMappingRegistry(config_dir)
+    first = registry.get("project.task")
+    path = config_dir / "field_config.json"
+    path.write_text("{not json")
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+    assert registry.get("project.task") is first
+
+
+def test_registry_drops_unsafe_column_names(config_dir):
+    (config_dir / "field_config.json").write_text(
+        json.dumps({"project.task": {"name": "name", "x": "name; DROP TABLE users"}})
+    )
+    assert FieldMappingRegistry(config_dir).get("project.task").odoo_fields == ("name",)
+
+
+@pytest.mark.parametrize("field_type, value", [
+    ("many2one", [7, "Project"]),
+    ("many2one", False),
+    ("many2many", [1, 2, 3]),
+    ("many2many", []),
+    ("boolean", True),
+    ("boolean", False),
+    ("char", "text"),
+    ("char", False),
+    ("integer", 3),
+    ("float", 1.5),
+    ("float", False),
+    ("datetime", "2025-01-02 03:04:05"),
+])
+def test_typed_converters_match_the_generic_conversion(field_type, value):
+    assert TYPE_CONVERTERS[field_type](value, "field") == convert_value(value, "field")
+
+
+def test_row_converter_builds_values_in_upsert_column_order():
+    mapping = ModelMapping("project.task", {
+        "id": "odoo_record_id", "name": "name", "project_id": "project_id", "user_ids": "user_id",
+    })
+    converter = mapping.row_converter(
+        "project_task_app", ("odoo_record_id", "name", "project_id", "user_id", "status"),
+        {"project_id": "many2one", "user_ids": "many2many"},
+    )
+    record = {"id": 5, "name": "Task", "project_id": [2, "Project"], "user_ids": [3, 4]}
+
+    assert mapping.upsert_columns() == ("odoo_record_id", "name", "project_id", "user_id", "account_id")
+    assert converter.convert(record, 1) == [5, "Task", 2, "3,4", 1]
+    assert converter.check_fields == ("status",)
+    assert mapping.row_converter(
+        "project_task_app", ("odoo_record_id", "name", "project_id", "user_id", "status"),
+        {"project_id": "many2one", "user_ids": "many2many"},
+    ) is converter
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+# MIT License
+#
+# Copyright (c) 2025 CIT-Services
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Tests for the in-memory log buffer behind the in-app log viewer."""
+
+import logging
+
+from logger import JsonMemoryHandler
+
+
+def _logger(handler):
+    logger = logging.getLogger("test_logger_buffer")
+    logger.handlers[:] = [handler]
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    return logger
+
+
+def test_polling_from_the_returned_seq_sees_each_entry_once():
+    handler = JsonMemoryHandler()
+    logger = _logger(handler)
+    logger.info("one")
+    logger.info("two")
+
+    last_seq, entries = handler.read_since(0)
+    assert [e["message"] for e in entries] == ["one", "two"]
+    assert last_seq == entries[-1]["seq"]
+
+    logger.info("three")
+    last_seq, entries = handler.read_since(last_seq)
+    assert [e["message"] for e in entries] == ["three"]
+    assert handler.read_since(last_seq) == (last_seq, [])
+
+
+def test_filtered_entries_still_advance_the_seq():
+    handler = JsonMemoryHandler()
+    logger = _logger(handler)
+    logger.warning("kept")
+    logger.debug("filtered")
+
+    last_seq, entries = handler.read_since(0, "WARNING")
+    assert [e["message"] for e in entries] == ["kept"]
+    assert last_seq == handler.last_seq == 2
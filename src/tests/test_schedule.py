@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+# MIT License
+#
+# Copyright (c) 2025 CIT-Services
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Tests for the active-hours window and the cached notification schedule."""
+
+import logging
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+
+from common import ScheduleEvaluator, _get_tzinfo, get_active_window
+
+ALL_DAYS = [0, 1, 2, 3, 4, 5, 6]
+
+
+def _settings(start="09:00", end="18:00", days=(1, 2, 3, 4, 5), enabled=True, scheduled=True):
+    return {
+        "notifications_enabled": enabled,
+        "schedule_enabled": scheduled,
+        "timezone": "UTC",
+        "active_start": start,
+        "active_end": end,
+        "working_days": list(days),
+    }
+
+
+def _ts(*args, tz=timezone.utc):
+    return datetime(*args, tzinfo=tz).timestamp()
+
+
+def test_active_window_in_minutes():
+    assert get_active_window("09:00", "18:00") == (540, 1080, False)
+    assert get_active_window("22:00", "06:00") == (1320, 360, True)
+
+
+def test_transitions_of_a_working_day():
+    evaluator = ScheduleEvaluator(_settings())
+    monday = (2026, 10, 19)
+
+    assert not evaluator.allowed(_ts(*monday, 8, 30))
+    assert evaluator.next_transition(_ts(*monday, 8, 30)) == _ts(*monday, 9, 0)
+    assert evaluator.allowed(_ts(*monday, 9, 0))
+    # The end minute itself is still active
+    assert evaluator.allowed(_ts(*monday, 18, 0, 59))
+    assert evaluator.next_transition(_ts(*monday, 9, 0)) == _ts(*monday, 18, 1)
+
+
+def test_friday_evening_waits_for_monday():
+    evaluator = ScheduleEvaluator(_settings())
+    friday_evening = _ts(2026, 10, 23, 18, 30)
+
+    assert not evaluator.allowed(friday_evening)
+    assert evaluator.next_transition(friday_evening) == _ts(2026, 10, 26, 9, 0)
+    reason = evaluator.check(_ts(2026, 10, 24, 12, 0))[1]
+    assert reason.startswith("Today is Sat, not a working day")
+
+
+def test_overnight_window():
+    evaluator = ScheduleEvaluator(_settings("22:00", "06:00", ALL_DAYS))
+
+    assert evaluator.allowed(_ts(2026, 10, 19, 23, 0))
+    assert evaluator.next_transition(_ts(2026, 10, 19, 23, 0)) == _ts(2026, 10, 20, 6, 1)
+    assert not evaluator.allowed(_ts(2026, 10, 20, 12, 0))
+    assert evaluator.next_transition(_ts(2026, 10, 20, 12, 0)) == _ts(2026, 10, 20, 22, 0)
+
+
+def test_transition_across_a_dst_change():
+    berlin = ZoneInfo("Europe/Berlin")
+    evaluator = ScheduleEvaluator(_settings(days=ALL_DAYS), timezone_str="Europe/Berlin")
+    saturday_evening = _ts(2026, 3, 28, 20, 0, tz=berlin)
+
+    # Clocks go forward on Sunday 29 March: 09:00 CEST is 07:00 UTC
+    assert evaluator.next_transition(saturday_evening) == _ts(2026, 3, 29, 7, 0)
+
+
+def test_state_is_reused_until_the_next_transition(monkeypatch):
+    evaluator = ScheduleEvaluator(_settings())
+    searches = []
+    find = evaluator._find_next_transition
+
+    def counting_find(now, state):
+        searches.append(now)
+        return find(now, state)
+
+    monkeypatch.setattr(evaluator, "_find_next_transition", counting_find)
+
+    for minute in range(0, 60, 5):
+        assert evaluator.allowed(_ts(2026, 10, 19, 10, minute))
+    assert len(searches) == 1
+    assert not evaluator.allowed(_ts(2026, 10, 19, 18, 1))
+    assert len(searches) == 2
+
+
+def test_no_transition_without_a_schedule():
+    assert ScheduleEvaluator(_settings(scheduled=False)).next_transition(_ts(2026, 10, 19, 3, 0)) is None
+    evaluator = ScheduleEvaluator(_settings(enabled=False))
+    assert evaluator.check(_ts(2026, 10, 19, 10, 0)) == (False, "Notifications are disabled by user")
+    assert evaluator.next_transition(_ts(2026, 10, 19, 10, 0)) is None
+
+
+def test_unknown_timezone_falls_back_to_utc_and_warns_once(caplog):
+    _get_tzinfo.cache_clear()
+    with caplog.at_level(logging.WARNING, logger="odoo_sync"):
+        assert _get_tzinfo("Mars/Olympus_Mons") is None
+        assert _get_tzinfo("Mars/Olympus_Mons") is None
+    assert caplog.text.count("Unknown timezone 'Mars/Olympus_Mons'") == 1
+
+    evaluator = ScheduleEvaluator(_settings(), timezone_str="Mars/Olympus_Mons")
+    assert evaluator.tzinfo is timezone.utc
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+# MIT License
+#
+# Copyright (c) 2025 CIT-Services
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Tests for the versioned migrations and the cached column sets."""
+
+import sqlite3
+
+import schema_manager
+from conftest import create_app_tables
+from schema_manager import SCHEMA_VERSION, ensure_schema, table_columns
+
+
+def _user_version(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("PRAGMA user_version").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def _names(db_path, kind):
+    conn = sqlite3.connect(db_path)
+    try:
+        return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = ?", (kind,))}
+    finally:
+        conn.close()
+
+
+def test_migrations_create_the_python_owned_tables_and_indexes(app_db):
+    assert ensure_schema(app_db) == SCHEMA_VERSION
+    assert _user_version(app_db) == SCHEMA_VERSION
+    assert {"notification", "sync_metrics", "attachment_cache_index", "attachment_cache_stats"} <= _names(app_db, "table")
+    assert {"idx_project_task_app_sync", "idx_project_task_app_pending", "idx_project_task_app_draft",
+            "idx_account_analytic_line_app_sync"} <= _names(app_db, "index")
+
+
+def test_migrations_run_once_per_process(app_db, monkeypatch):
+    ensure_schema(app_db)
+    monkeypatch.setattr(sqlite3, "connect", lambda *a, **k: (_ for _ in ()).throw(AssertionError("reconnected")))
+    assert ensure_schema(app_db) == SCHEMA_VERSION
+
+
+def test_index_migration_waits_for_the_app_tables(db_path):
+    version = ensure_schema(db_path)
+    assert version < SCHEMA_VERSION
+    assert _user_version(db_path) == version
+    assert "sync_metrics" in _names(db_path, "table")
+
+    create_app_tables(db_path)
+    assert ensure_schema(db_path) == SCHEMA_VERSION
+    assert "idx_project_task_app_sync" in _names(db_path, "index")
+
+
+def test_table_columns_are_served_from_memory(app_db, monkeypatch):
+    assert "status" in table_columns(app_db, "project_task_app")
+    monkeypatch.setattr(schema_manager, "_columns", lambda *a: ("unexpected",))
+    assert "status" in table_columns(app_db, "project_task_app")
+
+
+def test_table_columns_with_a_connection_see_columns_added_elsewhere(app_db):
+    assert "color" not in table_columns(app_db, "project_task_app")
+
+    other = sqlite3.connect(app_db)
+    other.execute("ALTER TABLE project_task_app ADD COLUMN color INTEGER")
+    other.commit()
+    other.close()
+
+    conn = sqlite3.connect(app_db)
+    try:
+        assert "color" in table_columns(app_db, "project_task_app", conn=conn)
+    finally:
+        conn.close()
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+# MIT License
+#
+# Copyright (c) 2025 CIT-Services
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Tests for the cross-process sync lock and its status file."""
+
+import fcntl
+import json
+import os
+
+from sync_coordinator import SyncJob, get_sync_holder, wait_for_release
+
+
+def test_holder_is_read_from_the_status_file(tmp_path):
+    job = SyncJob(1, "daemon", "upload_only", lock_dir=tmp_path)
+    assert job.acquire()
+
+    holder = get_sync_holder(1, lock_dir=tmp_path)
+    assert (holder["owner"], holder["direction"], holder["pid"]) == ("daemon", "upload_only", os.getpid())
+
+    job.finish("completed")
+    assert get_sync_holder(1, lock_dir=tmp_path) is None
+    assert wait_for_release(1, 0, lock_dir=tmp_path)["state"] == "completed"
+
+
+def test_checking_the_holder_never_takes_the_lock(tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setattr(fcntl, "flock", lambda fd, op: calls.append(op))
+    get_sync_holder(1, lock_dir=tmp_path)
+    wait_for_release(1, 0, lock_dir=tmp_path)
+    assert calls == []
+
+
+def test_second_job_cannot_acquire_while_the_first_runs(tmp_path):
+    first = SyncJob(1, "daemon", lock_dir=tmp_path)
+    second = SyncJob(1, "app", lock_dir=tmp_path)
+    assert first.acquire()
+    assert get_sync_holder(1, lock_dir=tmp_path)["owner"] == "daemon"
+    assert not second.acquire()
+    first.finish("completed")
+    assert second.acquire()
+    second.finish("completed")
+
+
+def test_running_status_of_a_dead_process_is_ignored(tmp_path):
+    (tmp_path / "account-1.json").write_text(json.dumps({"state": "running", "pid": 2 ** 22 + 1}))
+    assert get_sync_holder(1, lock_dir=tmp_path) is None
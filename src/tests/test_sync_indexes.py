@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+# MIT License
+#
+# Copyright (c) 2025 CIT-Services
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""EXPLAIN QUERY PLAN checks for the sync lookups and the status normalization."""
+
+import sqlite3
+
+import pytest
+
+from field_mapping import ModelMapping
+from schema_manager import ensure_schema
+from sync_indexes import PENDING_STATUS_SQL, explain_query_plan
+
+TABLES = ("project_task_app", "account_analytic_line_app")
+
+
+def _fill(db_path, table, rows=200):
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.executemany(
+            f"INSERT INTO {table} (account_id, odoo_record_id, name, status) VALUES (?, ?, ?, ?)",
+            [(1 + i % 2, i, f"row {i}", "updated" if i % 50 == 0 else "") for i in range(rows)],
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def migrated_db(app_db):
+    for table in TABLES:
+        _fill(app_db, table)
+    ensure_schema(app_db)
+    return app_db
+
+
+@pytest.mark.parametrize("table", TABLES)
+def test_orphan_scan_uses_the_covering_sync_index(migrated_db, table):
+    plan = explain_query_plan(
+        migrated_db,
+        f"SELECT id, odoo_record_id, status, has_draft FROM {table} "
+        f"WHERE account_id = ? AND odoo_record_id IS NOT NULL",
+        (1,),
+    )
+    assert any(f"COVERING INDEX idx_{table}_sync" in step for step in plan), plan
+
+
+@pytest.mark.parametrize("table", TABLES)
+def test_pending_rows_use_the_partial_pending_index(migrated_db, table):
+    sql = ModelMapping("model", {"name": "name"}).local_select_sql(table, pending_only=True)
+    plan = explain_query_plan(migrated_db, sql, (1,))
+    assert any(f"INDEX idx_{table}_pending" in step for step in plan), plan
+    assert not any(step.startswith("SCAN") for step in plan), plan
+
+
+@pytest.mark.parametrize("table", TABLES)
+def test_draft_rows_use_the_partial_draft_index(migrated_db, table):
+    plan = explain_query_plan(migrated_db, f"SELECT * FROM {table} WHERE account_id = ? AND has_draft = 1", (1,))
+    assert any(f"INDEX idx_{table}_draft" in step for step in plan), plan
+
+
+def _pending_names(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return {
+            row[0] for row in conn.execute(
+                f"SELECT name FROM project_task_app WHERE account_id = 1 AND {PENDING_STATUS_SQL}"
+            )
+        }
+    finally:
+        conn.close()
+
+
+def test_existing_statuses_are_normalized_by_the_migration(app_db):
+    conn = sqlite3.connect(app_db)
+    conn.execute("INSERT INTO project_task_app (account_id, odoo_record_id, name, status) VALUES (1, 1, 'a', 'Updated ')")
+    conn.commit()
+    conn.close()
+
+    ensure_schema(app_db)
+    assert _pending_names(app_db) == {"a"}
+
+
+def test_later_writes_are_normalized_by_the_triggers(app_db):
+    ensure_schema(app_db)
+    conn = sqlite3.connect(app_db)
+    conn.execute("INSERT INTO project_task_app (account_id, odoo_record_id, name, status) VALUES (1, 1, 'a', ' DELETED')")
+    conn.execute("INSERT INTO project_task_app (account_id, odoo_record_id, name, status) VALUES (1, 2, 'b', '')")
+    conn.execute("UPDATE project_task_app SET status = 'Updated' WHERE name = 'b'")
+    conn.commit()
+    conn.close()
+
+    assert _pending_names(app_db) == {"a", "b"}
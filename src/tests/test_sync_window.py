@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+# MIT License
+#
+# Copyright (c) 2025 CIT-Services
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Tests for orphan handling when sync_domains.json limits a model to a window."""
+
+import logging
+import sqlite3
+from datetime import date
+
+import sync_from_odoo
+from sync_from_odoo import sync_model
+
+MODEL = "account.analytic.line"
+TABLE = "account_analytic_line_app"
+
+FIELDS = {
+    "id": "integer", "name": "char", "date": "date", "unit_amount": "float",
+    "project_id": "many2one", "task_id": "many2one", "user_id": "many2one", "write_date": "datetime",
+}
+
+TODAY = date.today().isoformat()
+
+
+def _matches(record, domain):
+    for field, op, value in domain:
+        if op == "in" and record[field] not in value:
+            return False
+        if op == ">=" and not record[field] >= value:
+            return False
+    return True
+
+
+class FakeModels:
+    def __init__(self, records):
+        self.records = records
+        self.searches = []
+
+    def execute_kw(self, db, uid, password, model, method, args, kwargs=None):
+        assert model == MODEL
+        if method == "fields_get":
+            return {name: {"string": name, "type": ftype} for name, ftype in FIELDS.items()}
+        matching = [r for r in self.records if _matches(r, args[0])]
+        if method == "search":
+            self.searches.append(args[0])
+            return [r["id"] for r in matching]
+        if method == "search_read":
+            return [dict(r) for r in matching]
+        raise AssertionError(method)
+
+
+class FakeClient:
+    db, uid, password = "db", 2, "secret"
+
+    def __init__(self, records):
+        self.models = FakeModels(records)
+
+
+def _line(odoo_id, day):
+    return {
+        "id": odoo_id, "name": f"line {odoo_id}", "date": day, "unit_amount": 1.0,
+        "project_id": False, "task_id": False, "user_id": [2, "Me"],
+        "write_date": f"{day} 08:00:00",
+    }
+
+
+def _store_local(db_path, *rows):
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.executemany(
+            f"INSERT INTO {TABLE} (account_id, odoo_record_id, record_date, unit_amount, status) VALUES (1, ?, ?, 1.0, ?)",
+            rows,
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _local_ids(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return {row[0] for row in conn.execute(f"SELECT odoo_record_id FROM {TABLE}")}
+    finally:
+        conn.close()
+
+
+def test_rows_outside_the_window_are_kept_while_the_server_has_them(app_db):
+    client = FakeClient([_line(10, TODAY), _line(11, "2000-01-03")])
+    _store_local(app_db, (10, TODAY, ""), (11, "2000-01-03", ""), (12, "2000-01-04", ""))
+
+    sync_model(client, MODEL, TABLE, 1, app_db)
+
+    assert _local_ids(app_db) == {10, 11}
+    window_search, confirm_search = client.models.searches
+    assert window_search[-1][:2] == ["date", ">="]
+    assert confirm_search == [("id", "in", [11, 12])]
+
+
+def test_scope_removals_are_not_logged_as_server_deletes(app_db, monkeypatch, caplog):
+    monkeypatch.setattr(sync_from_odoo, "resolve_sync_domain", lambda *args, **kwargs: None)
+    client = FakeClient([_line(10, TODAY), _line(11, TODAY)])
+    _store_local(app_db, (10, TODAY, ""), (11, TODAY, ""))
+
+    with caplog.at_level(logging.INFO, logger="odoo_sync"):
+        sync_model(client, MODEL, TABLE, 1, app_db, domains=[[("id", "in", [10])]])
+
+    assert _local_ids(app_db) == {10}
+    assert "odoo_id=11 removed - outside the synced scope." in caplog.text
+    assert "no longer exists on server" not in caplog.text
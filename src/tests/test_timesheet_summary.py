@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+# MIT License
+#
+# Copyright (c) 2025 CIT-Services
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Tests for the read_group timesheet summary of the history before the sync window."""
+
+import json
+import sqlite3
+from datetime import datetime, timezone
+
+from sync_domains import ScopeContext, resolve_sync_domain
+from timesheet_summary import TIMESHEET_MODEL, get_timesheet_summary, sync_timesheet_summary
+
+NOW = datetime(2026, 3, 31, 12, 0, tzinfo=timezone.utc)
+
+
+class FakeClient:
+    uid = 2
+
+    def __init__(self, groups):
+        self.groups = groups
+        self.domains = []
+
+    def call(self, model, method, args, kwargs=None):
+        assert (model, method) == (TIMESHEET_MODEL, "read_group")
+        self.domains.append(args[0])
+        return self.groups[kwargs["offset"]: kwargs["offset"] + kwargs["limit"]]
+
+
+def _group(week, project, hours):
+    return {
+        "date:week": f"W{week}",
+        "__range": {"date:week": {"from": week, "to": week}},
+        "project_id": [project, "Project"] if project else False,
+        "task_id": False,
+        "user_id": [2, "Me"],
+        "unit_amount": hours,
+        "__count": 3,
+    }
+
+
+def _config(tmp_path, entry):
+    path = tmp_path / "sync_domains.json"
+    path.write_text(json.dumps({TIMESHEET_MODEL: entry} if entry else {}))
+    return str(path)
+
+
+def _resolved_context(client, config_path):
+    context = ScopeContext(client, now=NOW)
+    resolve_sync_domain(client, TIMESHEET_MODEL, {"date": "date"}, context, config_path=config_path)
+    return context
+
+
+def _state(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(
+            "SELECT account_id, granularity, covered_before FROM account_analytic_line_summary_state"
+        ).fetchall()
+    finally:
+        conn.close()
+
+
+def test_summary_covers_the_history_before_the_window(app_db, tmp_path):
+    config = _config(tmp_path, {"window": {"field": "date", "days": 30}})
+    client = FakeClient([_group("2025-12-29", 7, 5.5), _group("2026-01-05", 0, 2.0)])
+    context = _resolved_context(client, config)
+
+    assert sync_timesheet_summary(client, 1, app_db, context, config_path=config) == 2
+    assert client.domains == [[["date", "<", "2026-03-01"]]]
+    assert _state(app_db) == [(1, "week", "2026-03-01")]
+    assert get_timesheet_summary(app_db, 1) == [
+        {"account_id": 1, "project_id": 7, "hours": 5.5, "lines": 3},
+        {"account_id": 1, "project_id": 0, "hours": 2.0, "lines": 3},
+    ]
+
+
+def test_summary_keeps_the_configured_domain(app_db, tmp_path):
+    config = _config(tmp_path, {"domain": [["user_id", "=", "{uid}"]], "window": {"field": "date", "days": 30}})
+    client = FakeClient([])
+    context = _resolved_context(client, config)
+
+    sync_timesheet_summary(client, 1, app_db, context, config_path=config)
+    assert client.domains == [[["user_id", "=", 2], ["date", "<", "2026-03-01"]]]
+
+
+def test_summary_is_cleared_without_a_window(app_db, tmp_path):
+    windowed = _config(tmp_path, {"window": {"field": "date", "days": 30}})
+    client = FakeClient([_group("2025-12-29", 7, 5.5)])
+    sync_timesheet_summary(client, 1, app_db, _resolved_context(client, windowed), config_path=windowed)
+
+    unwindowed = _config(tmp_path, None)
+    assert sync_timesheet_summary(client, 1, app_db, ScopeContext(client), config_path=unwindowed) == 0
+    assert get_timesheet_summary(app_db, 1) == []
+    assert _state(app_db) == []
+
+
+def test_unresolved_window_keeps_the_previous_summary(app_db, tmp_path):
+    config = _config(tmp_path, {"window": {"field": "date", "days": 30}})
+    client = FakeClient([_group("2025-12-29", 7, 5.5)])
+    sync_timesheet_summary(client, 1, app_db, _resolved_context(client, config), config_path=config)
+
+    client.domains.clear()
+    assert sync_timesheet_summary(client, 1, app_db, ScopeContext(client), config_path=config) == 0
+    assert client.domains == []
+    assert len(get_timesheet_summary(app_db, 1)) == 1
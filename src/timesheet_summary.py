@@ -0,0 +1,289 @@
+# -*- coding: utf-8 -*-
+# MIT License
+#
+# Copyright (c) 2025 CIT-Services
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Server-side aggregated timesheet totals.
+
+Raw account.analytic.line rows are only synced for the recent window
+configured in sync_domains.json. History older than that window comes from
+Odoo's read_group instead: one row per (period, project, task, user) with
+the summed hours, stored in account_analytic_line_summary. The first day of
+the window is kept in account_analytic_line_summary_state (covered_before),
+so readers add local lines from that day on to the summary rows and count
+every hour exactly once (see timesheetHoursSource() in models/database.js).
+
+Without a window the local lines hold the full history and the summary of
+the account is cleared.
+
+Missing many2one values are stored as 0 so the unique key works in SQLite.
+"""
+
+import logging
+from datetime import datetime
+
+from common import safe_sql_execute
+from schema_manager import ensure_schema
+from sync_domains import DEFAULT_DOMAINS_PATH, registry
+from sync_metrics import phase
+
+log = logging.getLogger("odoo_sync")
+
+TIMESHEET_MODEL = "account.analytic.line"
+
+GRANULARITIES = ("day", "week")
+
+# Granularities synced by default; the app's totals read the weekly rows
+DEFAULT_GRANULARITIES = ("week",)
+
+# Groups requested per read_group call
+SUMMARY_PAGE_SIZE = 2000
+
+_GROUP_FIELDS = ("project_id", "task_id", "user_id")
+
+
+def _m2o_id(value):
+    if isinstance(value, (list, tuple)) and value:
+        return int(value[0])
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    return 0
+
+
+def _period_start(group, groupby_key):
+    """
+    Return the first day (YYYY-MM-DD) of a read_group date bucket.
+
+    The bucket label ("05 Jan 2025", "W02 2025") depends on the user's
+    language, so the bounds are taken from __range (Odoo 14+) or, on older
+    servers, from the ('date', '>=', ...) leaf of __domain.
+    """
+    bounds = (group.get("__range") or {}).get(groupby_key)
+    if isinstance(bounds, dict) and bounds.get("from"):
+        return str(bounds["from"])[:10]
+    for leaf in group.get("__domain") or []:
+        if isinstance(leaf, (list, tuple)) and len(leaf) == 3 and leaf[0] == "date" and leaf[1] == ">=":
+            return str(leaf[2])[:10]
+    return None
+
+
+def fetch_timesheet_summary(client, granularity="day", domain=None, page_size=SUMMARY_PAGE_SIZE):
+    """
+    Read pre-aggregated hours per (period, project, task, user) from Odoo.
+
+    Args:
+        client (OdooClient): Authenticated client
+        granularity (str): "day" or "week"
+        domain (list): Optional domain on account.analytic.line
+        page_size (int): Groups per read_group call
+
+    Returns:
+        list[tuple]: (period_start, project_id, task_id, user_id, hours, count)
+    """
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"Unsupported granularity {granularity!r}")
+    date_key = f"date:{granularity}"
+    groupby = [date_key, *_GROUP_FIELDS]
+
+    rows = []
+    offset = 0
+    skipped = 0
+    while True:
+        groups = client.call(
+            TIMESHEET_MODEL, "read_group", [domain or [], ["unit_amount:sum"], groupby],
+            {"offset": offset, "limit": page_size, "lazy": False},
+        )
+        for group in groups:
+            start = _period_start(group, date_key)
+            if start is None:
+                skipped += 1
+                continue
+            rows.append((
+                start,
+                _m2o_id(group.get("project_id")),
+                _m2o_id(group.get("task_id")),
+                _m2o_id(group.get("user_id")),
+                float(group.get("unit_amount") or 0.0),
+                int(group.get("__count") or 0),
+            ))
+        if len(groups) < page_size:
+            break
+        offset += page_size
+    if skipped:
+        log.warning(f"[SYNC] Skipped {skipped} timesheet group(s) without a usable date range")
+    return rows
+
+
+def store_timesheet_summary(db_path, account_id, granularity, rows, covered_before):
+    """
+    Replace the stored summary of one account and granularity.
+
+    Rows are upserted with a fresh synced_at stamp and stale ones are deleted
+    afterwards, so readers never see an empty table during a sync. The
+    state row is written last and records the window start the rows end at.
+    """
+    stamp = datetime.utcnow().isoformat(timespec="microseconds")
+    if rows:
+        safe_sql_execute(
+            db_path,
+            "INSERT INTO account_analytic_line_summary "
+            "(account_id, granularity, period_start, project_id, task_id, user_id, unit_amount, line_count, synced_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(account_id, granularity, period_start, project_id, task_id, user_id) DO UPDATE SET "
+            "unit_amount = excluded.unit_amount, line_count = excluded.line_count, synced_at = excluded.synced_at",
+            [(account_id, granularity, *row, stamp) for row in rows],
+            many=True,
+        )
+    safe_sql_execute(
+        db_path,
+        "DELETE FROM account_analytic_line_summary "
+        "WHERE account_id = ? AND granularity = ? AND (synced_at IS NULL OR synced_at != ?)",
+        (account_id, granularity, stamp),
+    )
+    safe_sql_execute(
+        db_path,
+        "INSERT INTO account_analytic_line_summary_state (account_id, granularity, covered_before, synced_at) "
+        "VALUES (?, ?, ?, ?) "
+        "ON CONFLICT(account_id, granularity) DO UPDATE SET "
+        "covered_before = excluded.covered_before, synced_at = excluded.synced_at",
+        (account_id, granularity, covered_before, stamp),
+    )
+
+
+def clear_timesheet_summary(db_path, account_id):
+    """Drop the summary of an account whose local lines hold the full history."""
+    safe_sql_execute(
+        db_path, "DELETE FROM account_analytic_line_summary WHERE account_id = ?", (account_id,)
+    )
+    safe_sql_execute(
+        db_path, "DELETE FROM account_analytic_line_summary_state WHERE account_id = ?", (account_id,)
+    )
+
+
+def sync_timesheet_summary(
+    client, account_id, db_path, scope_context=None,
+    granularities=DEFAULT_GRANULARITIES, config_path=DEFAULT_DOMAINS_PATH,
+):
+    """
+    Refresh account_analytic_line_summary for one account.
+
+    The summary covers the lines before the window that the raw line sync
+    of the same run applied, with the same domain and start date, so both
+    sides meet exactly at covered_before. Failures are logged and leave the
+    previous summary in place; the raw line sync is not affected.
+
+    Args:
+        client (OdooClient): Authenticated client
+        account_id (int): Account the summary belongs to
+        db_path (str): App database
+        scope_context (ScopeContext): Context the raw lines were synced with
+        granularities (tuple): Period sizes to store
+        config_path (str): sync_domains.json path
+
+    Returns:
+        int: Number of summary rows stored
+    """
+    ensure_schema(db_path)
+    scope = registry.get_scopes(config_path).get(TIMESHEET_MODEL)
+    if scope is None or not scope.window_days:
+        clear_timesheet_summary(db_path, account_id)
+        return 0
+
+    windows = scope_context.windows if scope_context is not None else {}
+    if TIMESHEET_MODEL not in windows:
+        log.warning("[SYNC] Timesheet window was not resolved in this run, keeping the previous summary")
+        return 0
+    window = windows[TIMESHEET_MODEL]
+    if window is None:
+        # Window ignored on this server (see ModelScope.resolve): lines are synced in full
+        clear_timesheet_summary(db_path, account_id)
+        return 0
+    base_domain, field, covered_before = window
+    domain = list(base_domain) + [[field, "<", covered_before]]
+
+    total = 0
+    with phase("summary", TIMESHEET_MODEL) as timing:
+        for granularity in granularities:
+            try:
+                rows = fetch_timesheet_summary(client, granularity, domain)
+            except Exception as e:
+                log.warning(f"[SYNC] Timesheet {granularity} summary not available from server: {e}")
+                continue
+            store_timesheet_summary(db_path, account_id, granularity, rows, covered_before)
+            total += len(rows)
+        timing.add_rows(total)
+    log.info(f"[SYNC] Stored {total} timesheet summary row(s) before {covered_before} for account {account_id}")
+    return total
+
+
+def get_timesheet_summary(
+    db_path, account_id, granularity="week", group_by="project_id", date_from=None, date_to=None,
+):
+    """
+    Return summed hours from the local summary table.
+
+    Only history before the sync window is included; the lines inside it
+    are in account_analytic_line_app.
+
+    Args:
+        db_path (str): App database
+        account_id (int): Account, or -1 for all accounts
+        granularity (str): "day" or "week"
+        group_by (str): "project_id", "task_id", "user_id" or "period_start"
+        date_from (str): Optional first period (YYYY-MM-DD), inclusive
+        date_to (str): Optional last period (YYYY-MM-DD), inclusive
+
+    Returns:
+        list[dict]: {account_id, <group_by>, hours, lines}, largest first
+            (oldest first when grouped by period)
+    """
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"Unsupported granularity {granularity!r}")
+    if group_by not in _GROUP_FIELDS + ("period_start",):
+        raise ValueError(f"Unsupported group_by {group_by!r}")
+
+    where = ["granularity = ?"]
+    params = [granularity]
+    if account_id is not None and int(account_id) != -1:
+        where.append("account_id = ?")
+        params.append(int(account_id))
+    if date_from:
+        where.append("period_start >= ?")
+        params.append(date_from)
+    if date_to:
+        where.append("period_start <= ?")
+        params.append(date_to)
+    order = "period_start ASC" if group_by == "period_start" else "hours DESC"
+
+    rows = safe_sql_execute(
+        db_path,
+        f"SELECT account_id, {group_by}, SUM(unit_amount) AS hours, SUM(line_count) "
+        f"FROM account_analytic_line_summary WHERE {' AND '.join(where)} "
+        f"GROUP BY account_id, {group_by} ORDER BY {order}",
+        tuple(params),
+        fetch=True,
+        commit=False,
+    ) or []
+    return [
+        {"account_id": acc, group_by: key, "hours": round(hours or 0.0, 2), "lines": lines}
+        for acc, key, hours, lines in rows
+    ]
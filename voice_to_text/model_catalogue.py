@@ -0,0 +1,145 @@
+"""
+Persistent index of installed and paused voice models.
+
+Listing installed models used to walk every model directory to add up its
+size on each call. The catalogue keeps one entry per model directory in a
+small JSON file, keyed by path and directory mtime, plus the mtime of each
+models root. A call only stats the roots; a root whose mtime changed (a
+model was installed, deleted or a download paused) is listed again, and
+only new or changed model directories are described from scratch.
+"""
+
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+
+logger = logging.getLogger("odoo_sync")
+
+INDEX_VERSION = 1
+
+
+class ModelCatalogue:
+    """
+    Args:
+        index_path (Path): JSON file holding the index
+        roots (list): (directory, source_label) pairs to scan, in order
+        describe (callable): describe(model_dir, source_label) -> dict with
+            the public m_* fields for one model
+    """
+
+    def __init__(self, index_path, roots, describe):
+        self.index_path = Path(index_path)
+        self.roots = [(Path(root), label) for root, label in roots]
+        self.describe = describe
+        self._lock = threading.Lock()
+        self._index = None
+        self._dirty = False
+
+    def _load(self):
+        try:
+            with open(self.index_path, "r") as f:
+                index = json.load(f)
+            if index.get("version") == INDEX_VERSION:
+                return index
+        except (OSError, ValueError):
+            pass
+        return {"version": INDEX_VERSION, "roots": {}, "models": {}, "paused": []}
+
+    def _save(self, index):
+        tmp = self.index_path.with_name(self.index_path.name + ".tmp")
+        try:
+            with open(tmp, "w") as f:
+                json.dump(index, f)
+            os.replace(tmp, self.index_path)
+        except OSError as e:
+            logger.warning(f"[VOICE] Could not save model catalogue: {e}")
+
+    @staticmethod
+    def _is_model_dir(path):
+        # Standard Vosk models are directories containing 'am' and 'graph' subdirectories
+        return (path / "am").is_dir() and (path / "graph").is_dir()
+
+    def _scan_root(self, index, root, label):
+        models = index["models"]
+        seen = set()
+        paused = []
+        for item in root.iterdir():
+            if item.name.endswith(".zip.tmp") and label == "User":
+                paused.append(item.name[: -len(".zip.tmp")])
+                continue
+            try:
+                if not item.is_dir():
+                    continue
+                mtime = item.stat().st_mtime_ns
+            except OSError:
+                continue
+            key = str(item)
+            entry = models.get(key)
+            if entry is not None and entry["mtime_ns"] == mtime and entry["source"] == label:
+                seen.add(key)
+                continue
+            if not self._is_model_dir(item):
+                continue
+            try:
+                info = self.describe(item, label)
+            except Exception as e:
+                logger.error(f"[VOICE] Could not describe model {item}: {e}")
+                continue
+            models[key] = {"mtime_ns": mtime, "source": label, "info": info}
+            seen.add(key)
+
+        for key in [k for k, v in models.items() if v["source"] == label and k not in seen]:
+            del models[key]
+        return paused
+
+    def _refresh(self):
+        if self._index is None:
+            self._index = self._load()
+        index = self._index
+        changed = False
+        for root, label in self.roots:
+            key = str(root)
+            try:
+                mtime = root.stat().st_mtime_ns
+            except OSError:
+                mtime = None
+            if not self._dirty and index["roots"].get(key) == mtime:
+                continue
+            if mtime is None:
+                index["models"] = {k: v for k, v in index["models"].items() if v["source"] != label}
+            else:
+                paused = self._scan_root(index, root, label)
+                if label == "User":
+                    index["paused"] = sorted(paused)
+            index["roots"][key] = mtime
+            changed = True
+        self._dirty = False
+        if changed:
+            self._save(index)
+        return index
+
+    def installed(self):
+        """Returns the m_* dicts of all installed models, sorted by name."""
+        with self._lock:
+            index = self._refresh()
+            models = [dict(entry["info"]) for entry in index["models"].values()]
+        models.sort(key=lambda m: m["m_name"].lower())
+        return models
+
+    def installed_ids(self):
+        """Returns the directory names of installed models."""
+        with self._lock:
+            index = self._refresh()
+            return sorted(Path(key).name for key in index["models"])
+
+    def paused(self):
+        """Returns the ids of models with a partial download."""
+        with self._lock:
+            return list(self._refresh()["paused"])
+
+    def mark_dirty(self):
+        """Rescan all roots on the next call (after an install, delete or pause)."""
+        with self._lock:
+            self._dirty = True
@@ -0,0 +1,594 @@
+"""
+Downloads and installs Vosk models.
+
+Large archives are fetched over several ranged connections into a sparse
+<model>.zip.tmp file; the segment state is kept in <model>.zip.tmp.parts so
+a paused or failed download resumes where each connection stopped. The tail
+of the archive is fetched first: as soon as the zip central directory is
+there, members are extracted straight into the staging directory while the
+rest is still downloading, reading only byte ranges that have arrived.
+
+Servers without Range support (and small archives) use a single stream,
+resumed from the size of the partial file as before.
+
+The archive SHA-256 is checked against model_manifest.json when the model
+has an entry there; it is always recorded in <model>/.install.json.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+import zipfile
+from pathlib import Path
+
+import urllib3
+
+logger = logging.getLogger("odoo_sync")
+
+DEFAULT_CONNECTIONS = 4
+
+# Smaller archives are downloaded over a single connection
+PARALLEL_MIN_SIZE = 16 * 1024 * 1024
+
+# Fetched first so the central directory is available early
+TAIL_SIZE = 256 * 1024
+
+READ_CHUNK = 64 * 1024
+SEGMENT_RETRIES = 3
+
+# Seconds between writes of the .parts resume state
+STATE_SAVE_INTERVAL = 1.0
+
+TIMEOUT = urllib3.Timeout(connect=5.0, read=10.0)
+
+MANIFEST_PATH = Path(__file__).parent / "model_manifest.json"
+INSTALL_INFO = ".install.json"
+
+
+class DownloadInterrupted(Exception):
+    """Raised when the user pauses or cancels; str() matches the backend's markers."""
+
+    def __init__(self, action):
+        self.action = action
+        super().__init__("PAUSED_BY_USER" if action == "pause" else "CANCELLED_BY_USER")
+
+
+class ChecksumMismatch(Exception):
+    pass
+
+
+def load_manifest(path=MANIFEST_PATH):
+    """Returns model id -> {"sha256": ..., "size": ...}; empty if unreadable."""
+    try:
+        with open(path, "r") as f:
+            manifest = json.load(f)
+        return manifest if isinstance(manifest, dict) else {}
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logger.warning(f"[VOICE] Ignoring invalid model manifest {path}: {e}")
+        return {}
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def parts_path(temp_zip):
+    return Path(f"{temp_zip}.parts")
+
+
+def probe(http, url):
+    """
+    Returns (size, supports_ranges, etag) for url using a one-byte ranged GET
+    (some model mirrors do not answer HEAD).
+    """
+    response = http.request(
+        "GET", url, headers={"Range": "bytes=0-0"}, preload_content=False, timeout=TIMEOUT
+    )
+    try:
+        etag = response.headers.get("ETag")
+        if response.status == 206:
+            content_range = response.headers.get("Content-Range", "")
+            total = content_range.rpartition("/")[2]
+            if total.isdigit():
+                return int(total), True, etag
+            return None, False, etag
+        if response.status == 200:
+            length = response.headers.get("Content-Length")
+            return (int(length) if length else None), False, etag
+        raise Exception(f"Server returned status {response.status}")
+    finally:
+        if response.status == 206:
+            response.drain_conn()
+            response.release_conn()
+        else:
+            # Do not read a whole model just to reuse the connection
+            response.close()
+
+
+class SegmentedDownload:
+    """
+    Multi-connection download of one file into a preallocated sparse file.
+
+    Args:
+        http (urllib3.PoolManager): Pool with maxsize >= connections
+        url (str): Archive URL
+        dest (Path): The <model>.zip.tmp file
+        size (int): Total size from probe()
+        etag (str): ETag from probe(), used to detect a changed file on resume
+        connections (int): Parallel ranged requests for the body
+        abort (callable): Returns "pause"/"cancel" to stop, None to continue
+    """
+
+    def __init__(self, http, url, dest, size, etag=None, connections=DEFAULT_CONNECTIONS, abort=None):
+        self.http = http
+        self.url = url
+        self.dest = Path(dest)
+        self.size = size
+        self.etag = etag
+        self.connections = max(1, connections)
+        self.abort = abort or (lambda: None)
+        self.state_path = parts_path(self.dest)
+        self.cond = threading.Condition()
+        self._save_lock = threading.Lock()
+        self.segments = self._load_state() or self._plan()
+        self.error = None
+        self.interrupted = None
+        self._last_save = 0.0
+        self._fd = None
+
+    def _plan(self):
+        tail = min(TAIL_SIZE, self.size)
+        body = self.size - tail
+        segments = []
+        if body > 0:
+            step = -(-body // self.connections)
+            for start in range(0, body, step):
+                segments.append([start, min(start + step, body) - 1, 0])
+        # The tail goes first so the central directory is readable early
+        segments.insert(0, [body, self.size - 1, 0])
+        if self.dest.exists():
+            self.dest.unlink()
+        return segments
+
+    def _load_state(self):
+        try:
+            with open(self.state_path, "r") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not self.dest.exists():
+            return None
+        if (
+            state.get("url") != self.url
+            or state.get("size") != self.size
+            or (self.etag and state.get("etag") and state["etag"] != self.etag)
+        ):
+            logger.info("[VOICE] Archive changed on the server, restarting download")
+            return None
+        return [list(seg) for seg in state.get("segments", [])] or None
+
+    def _save_state(self, force=False):
+        if not force and time.monotonic() - self._last_save < STATE_SAVE_INTERVAL:
+            return
+        with self._save_lock:
+            self._last_save = time.monotonic()
+            with self.cond:
+                state = {"url": self.url, "size": self.size, "etag": self.etag,
+                         "segments": [list(seg) for seg in self.segments]}
+            tmp = Path(f"{self.state_path}.new")
+            with open(tmp, "w") as f:
+                json.dump(state, f)
+            os.replace(tmp, self.state_path)
+
+    @property
+    def downloaded(self):
+        with self.cond:
+            return sum(seg[2] for seg in self.segments)
+
+    def _covered(self, start, end):
+        for seg_start, seg_end, done in self.segments:
+            if seg_end < start or seg_start >= end:
+                continue
+            if seg_start + done < min(end, seg_end + 1):
+                return False
+        return True
+
+    def wait_covered(self, start, end):
+        """Block until bytes [start, end) are on disk."""
+        end = min(end, self.size)
+        with self.cond:
+            while not self._covered(start, end):
+                if self.error is not None:
+                    raise self.error
+                if self.interrupted:
+                    raise DownloadInterrupted(self.interrupted)
+                self.cond.wait(0.5)
+
+    def _fetch(self, segment):
+        attempts = 0
+        while True:
+            start, end, done = segment
+            pos = start + done
+            if pos > end:
+                return
+            try:
+                response = self.http.request(
+                    "GET", self.url, headers={"Range": f"bytes={pos}-{end}"},
+                    preload_content=False, timeout=TIMEOUT,
+                )
+                try:
+                    if response.status != 206:
+                        raise Exception(f"Server returned status {response.status} for a ranged request")
+                    for chunk in response.stream(READ_CHUNK):
+                        action = self.abort()
+                        if action or self.interrupted or self.error is not None:
+                            with self.cond:
+                                self.interrupted = self.interrupted or action
+                                self.cond.notify_all()
+                            return
+                        chunk = chunk[: end + 1 - pos]
+                        os.pwrite(self._fd, chunk, pos)
+                        pos += len(chunk)
+                        with self.cond:
+                            segment[2] += len(chunk)
+                            self.cond.notify_all()
+                        self._save_state()
+                finally:
+                    response.release_conn()
+                if start + segment[2] <= end:
+                    raise Exception("Connection closed before the range was complete")
+                return
+            except Exception as e:
+                attempts += 1
+                if attempts > SEGMENT_RETRIES:
+                    with self.cond:
+                        if self.error is None:
+                            self.error = e
+                        self.cond.notify_all()
+                    return
+                logger.warning(f"[VOICE] Retrying bytes {start + segment[2]}-{end}: {e}")
+                time.sleep(min(2 ** attempts, 8))
+
+    def run(self, progress=None):
+        """Download all missing ranges. Raises on failure, pause or cancel."""
+        self._fd = os.open(self.dest, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if os.fstat(self._fd).st_size != self.size:
+                os.ftruncate(self._fd, self.size)
+            self._save_state(force=True)
+            threads = [
+                threading.Thread(target=self._fetch, args=(segment,), daemon=True)
+                for segment in self.segments
+            ]
+            for thread in threads:
+                thread.start()
+            while any(thread.is_alive() for thread in threads):
+                time.sleep(0.25)
+                if progress:
+                    progress(self.downloaded, self.size)
+            self._save_state(force=True)
+        finally:
+            os.close(self._fd)
+            with self.cond:
+                self.cond.notify_all()
+        if self.error is not None:
+            raise self.error
+        if self.interrupted:
+            raise DownloadInterrupted(self.interrupted)
+        if self.downloaded != self.size:
+            raise Exception("Download incomplete")
+
+    def fail(self, error):
+        """Stop all connections, e.g. because extraction failed."""
+        with self.cond:
+            if self.error is None:
+                self.error = error
+            self.cond.notify_all()
+
+
+class _CoveredReader:
+    """
+    Read-only file object over the partial archive for zipfile: every read
+    waits until the requested bytes have been downloaded.
+    """
+
+    def __init__(self, path, download=None, size=None):
+        self._f = open(path, "rb")
+        self._download = download
+        self._size = size if size is not None else os.path.getsize(path)
+        self._pos = 0
+
+    def seekable(self):
+        return True
+
+    def seek(self, offset, whence=0):
+        if whence == 0:
+            self._pos = offset
+        elif whence == 1:
+            self._pos += offset
+        else:
+            self._pos = self._size + offset
+        return self._pos
+
+    def tell(self):
+        return self._pos
+
+    def read(self, n=-1):
+        if n is None or n < 0:
+            n = self._size - self._pos
+        n = max(0, min(n, self._size - self._pos))
+        if self._download is not None and n:
+            self._download.wait_covered(self._pos, self._pos + n)
+        data = os.pread(self._f.fileno(), n, self._pos)
+        self._pos += len(data)
+        return data
+
+    def close(self):
+        self._f.close()
+
+
+def _model_prefix(names):
+    """Returns the archive folder that holds am/ and graph/ (stripped on extraction)."""
+    candidates = set()
+    for name in names:
+        parts = name.split("/")
+        for i, part in enumerate(parts[:-1]):
+            if part == "am":
+                candidates.add("".join(p + "/" for p in parts[:i]))
+    for prefix in sorted(candidates, key=len):
+        if any(name.startswith(prefix + "graph/") for name in names):
+            return prefix
+    # Vosk models usually have a single folder inside the zip
+    tops = {name.split("/", 1)[0] for name in names if name}
+    if len(tops) == 1 and all("/" in name for name in names):
+        return tops.pop() + "/"
+    return ""
+
+
+def extract_model(fileobj, staging_dir, ensure_space=None, progress=None):
+    """
+    Extract the model folder of an archive into staging_dir, member by member
+    in archive order.
+
+    Args:
+        fileobj: Archive file object (a _CoveredReader while downloading)
+        staging_dir (Path): Empty directory to extract into
+        ensure_space (callable): Called with the uncompressed size once the
+            central directory is read; raises if the disk is too full
+        progress (callable): Called with (bytes_extracted, total_bytes)
+    """
+    staging_dir = Path(staging_dir).resolve()
+    with zipfile.ZipFile(fileobj) as z:
+        infos = z.infolist()
+        prefix = _model_prefix([info.filename for info in infos])
+        total = sum(info.file_size for info in infos)
+        if ensure_space:
+            ensure_space(total)
+        extracted = 0
+        for info in sorted(infos, key=lambda i: i.header_offset):
+            if not info.filename.startswith(prefix):
+                continue
+            rel = info.filename[len(prefix):]
+            if not rel:
+                continue
+            target = (staging_dir / rel).resolve()
+            if staging_dir not in target.parents:
+                raise Exception(f"Unsafe path in model archive: {info.filename}")
+            if info.is_dir():
+                target.mkdir(parents=True, exist_ok=True)
+                continue
+            target.parent.mkdir(parents=True, exist_ok=True)
+            with z.open(info) as src, open(target, "wb") as dst:
+                shutil.copyfileobj(src, dst, READ_CHUNK)
+            extracted += info.file_size
+            if progress:
+                progress(extracted, total)
+
+
+def _download_single(http, url, temp_zip, abort, progress):
+    """Single-stream download, resumed from the size of an existing partial file."""
+    existing_size = temp_zip.stat().st_size if temp_zip.exists() else 0
+
+    headers = {}
+    if existing_size > 0:
+        headers["Range"] = f"bytes={existing_size}-"
+        logger.info(f"[VOICE] Resuming {temp_zip.name} from {existing_size} bytes")
+
+    # With a timeout to handle sudden internet disconnection
+    response = http.request("GET", url, headers=headers, preload_content=False, timeout=TIMEOUT)
+    try:
+        if response.status not in (200, 206, 416):
+            raise Exception(f"Server returned status {response.status}")
+
+        if response.status == 200 and existing_size > 0:
+            # Server ignored Range header, restart from scratch
+            logger.info("[VOICE] Server ignored Range, restarting download")
+            existing_size = 0
+            temp_zip.unlink()
+
+        if response.status == 416:
+            # Already complete
+            return
+
+        content_length = response.headers.get("Content-Length")
+        total_size = (int(content_length) + existing_size) if content_length else None
+
+        downloaded = existing_size
+        mode = "ab" if existing_size > 0 else "wb"
+        with open(temp_zip, mode) as f:
+            for chunk in response.stream(READ_CHUNK):
+                action = abort()
+                if action:
+                    raise DownloadInterrupted(action)
+                f.write(chunk)
+                downloaded += len(chunk)
+                if total_size and progress:
+                    progress(downloaded, total_size)
+    finally:
+        response.release_conn()
+
+
+def install_model(
+    http, model_id, url, models_dir, abort=None, progress=None, message=None,
+    connections=DEFAULT_CONNECTIONS, manifest=None,
+):
+    """
+    Download, extract and verify a model into models_dir/model_id.
+
+    Args:
+        http (urllib3.PoolManager): Pool with maxsize >= connections + 1
+        model_id (str): Model id, also the installed folder name
+        url (str): Archive URL
+        models_dir (Path): Writable models directory
+        abort (callable): Returns "pause"/"cancel" to stop, None to continue
+        progress (callable): Called with an overall percentage (0-100)
+        message (callable): Called with a status text
+        connections (int): Parallel connections for large archives
+        manifest (dict): Overrides model_manifest.json
+
+    Returns:
+        dict: {"sha256", "size", "url"} as written to .install.json
+
+    Raises:
+        DownloadInterrupted: On pause (partial data kept) or cancel
+        ChecksumMismatch: The archive does not match the manifest (partial
+            data removed)
+    """
+    abort = abort or (lambda: None)
+    models_dir = Path(models_dir)
+    target_path = models_dir / model_id
+    temp_zip = models_dir / f"{model_id}.zip.tmp"
+    staging_dir = models_dir / f"{model_id}.extract.tmp"
+    expected = (manifest if manifest is not None else load_manifest()).get(model_id) or {}
+
+    last_pct = [-1]
+
+    def report(pct):
+        pct = int(pct)
+        if progress and pct != last_pct[0]:
+            last_pct[0] = pct
+            progress(pct)
+
+    def say(text):
+        if message:
+            message(text)
+
+    if staging_dir.exists():
+        shutil.rmtree(staging_dir)
+    staging_dir.mkdir(parents=True, exist_ok=True)
+
+    try:
+        size, ranges, etag = probe(http, url)
+        resuming_single = temp_zip.exists() and not parts_path(temp_zip).exists()
+        parallel = bool(ranges and size and size >= PARALLEL_MIN_SIZE and connections > 1 and not resuming_single)
+        say("Resuming..." if temp_zip.exists() else "Downloading...")
+
+        if size:
+            # Space for the rest of the archive; the extracted size is
+            # checked once the central directory is known
+            have = temp_zip.stat().st_size if resuming_single else 0
+            free = shutil.disk_usage(str(models_dir))[2]
+            if free < size - have:
+                raise Exception(
+                    f"Insufficient storage. Have {free / (1024 * 1024):.1f} MB, "
+                    f"need at least {(size - have) / (1024 * 1024):.1f} MB available."
+                )
+
+        if parallel:
+            logger.info(f"[VOICE] Downloading {model_id} over {connections} connections ({size} bytes)")
+            download = SegmentedDownload(http, url, temp_zip, size, etag, connections, abort)
+            state = {"extracted": 0, "total": 0, "error": None}
+
+            def ensure_space(uncompressed):
+                free = shutil.disk_usage(str(models_dir))[2]
+                needed = uncompressed + (size - download.downloaded)
+                if free < needed:
+                    raise Exception(
+                        f"Insufficient storage. Have {free / (1024 * 1024):.1f} MB, "
+                        f"need at least {needed / (1024 * 1024):.1f} MB available."
+                    )
+
+            def on_extract(done, total):
+                state["extracted"], state["total"] = done, total
+
+            def extract():
+                try:
+                    extract_model(reader, staging_dir, ensure_space, on_extract)
+                except DownloadInterrupted:
+                    pass
+                except Exception as e:
+                    state["error"] = e
+                    download.fail(e)
+
+            def fetch():
+                try:
+                    download.run(lambda done, total: report(done * 80 / total))
+                except Exception as e:
+                    state["download_error"] = e
+
+            download.dest.touch()
+            reader = _CoveredReader(temp_zip, download, size)
+            fetcher = threading.Thread(target=fetch, daemon=True)
+            extractor = threading.Thread(target=extract, daemon=True)
+            try:
+                fetcher.start()
+                extractor.start()
+                fetcher.join()
+                if "download_error" in state:
+                    raise state["error"] or state["download_error"]
+                say("Extracting...")
+                while extractor.is_alive():
+                    extractor.join(0.25)
+                    if state["total"]:
+                        report(80 + 15 * state["extracted"] / state["total"])
+                if state["error"] is not None:
+                    raise state["error"]
+            finally:
+                extractor.join(5)
+                reader.close()
+        else:
+            logger.info(f"[VOICE] Downloading {model_id} from {url}")
+            _download_single(http, url, temp_zip, abort, lambda d, t: report(d * 80 / t))
+            say("Extracting...")
+            report(85)
+            reader = _CoveredReader(temp_zip)
+            try:
+                extract_model(reader, staging_dir, None, lambda d, t: report(85 + 10 * d / t))
+            finally:
+                reader.close()
+
+        say("Verifying...")
+        report(95)
+        sha256 = file_sha256(temp_zip)
+        if expected.get("sha256") and expected["sha256"].lower() != sha256:
+            temp_zip.unlink()
+            parts_path(temp_zip).unlink(missing_ok=True)
+            raise ChecksumMismatch(f"Checksum mismatch for {model_id}: the download is corrupt, please retry")
+        if not expected.get("sha256"):
+            logger.info(f"[VOICE] {model_id} has no manifest entry, archive sha256={sha256}")
+
+        info = {"sha256": sha256, "size": temp_zip.stat().st_size, "url": url, "installed_at": time.time()}
+        with open(staging_dir / INSTALL_INFO, "w") as f:
+            json.dump(info, f)
+
+        # Move to final location (atomic rename on the same filesystem)
+        if target_path.exists():
+            shutil.rmtree(target_path)
+        os.replace(staging_dir, target_path)
+        temp_zip.unlink()
+        parts_path(temp_zip).unlink(missing_ok=True)
+        report(100)
+        return info
+    finally:
+        if staging_dir.exists():
+            shutil.rmtree(staging_dir, ignore_errors=True)
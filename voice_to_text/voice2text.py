@@ -5,8 +5,20 @@ import json
 import wave
 import logging
 import shutil
+import threading
+import time
+from array import array
+from collections import deque
 from pathlib import Path
 
+try:
+    import warnings
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        import audioop
+except ImportError:  # removed in Python 3.13
+    audioop = None
+
 # Use the app's logger
 logger = logging.getLogger("odoo_sync")
 
@@ -17,32 +29,198 @@ try:
 except ImportError:
     pass
 
-def recognize_from_mic(verbose=True, stop_event=None, timeout=30, partial_callback=None, status_callback=None, model_path=None):
+SAMPLE_RATE = 16000
+# 4000 bytes = 125ms of 16kHz 16-bit mono
+CHUNK_BYTES = 4000
+CHUNK_SECONDS = CHUNK_BYTES / (SAMPLE_RATE * 2)
+
+# Chunks kept when the consumer falls behind (10 seconds of audio)
+RING_CAPACITY = 80
+
+# Seconds between PartialResult() decodes
+PARTIAL_INTERVAL = 0.3
+
+
+def chunk_rms(data):
+    """Root mean square energy of a chunk of signed 16-bit little-endian PCM."""
+    if audioop is not None:
+        return audioop.rms(data, 2)
+    samples = array("h")
+    samples.frombytes(data[: len(data) - len(data) % 2])
+    if not samples:
+        return 0
+    if sys.byteorder == "big":
+        samples.byteswap()
+    return int((sum(s * s for s in samples) / len(samples)) ** 0.5)
+
+
+class AudioReader(threading.Thread):
+    """
+    Reads PCM from the recorder's stdout into a bounded ring buffer so the
+    recognition loop never blocks on the pipe. When the buffer is full the
+    oldest chunk is dropped.
+    """
+
+    def __init__(self, stream, chunk_bytes=CHUNK_BYTES, capacity=RING_CAPACITY):
+        super().__init__(daemon=True)
+        self.fd = stream.fileno()
+        self.chunk_bytes = chunk_bytes
+        self.buffer = deque(maxlen=capacity)
+        self.cond = threading.Condition()
+        self.eof = False
+        self.dropped = 0
+
+    def run(self):
+        pending = b""
+        try:
+            while True:
+                data = os.read(self.fd, self.chunk_bytes)
+                if not data:
+                    break
+                pending += data
+                while len(pending) >= self.chunk_bytes:
+                    chunk, pending = pending[: self.chunk_bytes], pending[self.chunk_bytes:]
+                    with self.cond:
+                        if len(self.buffer) == self.buffer.maxlen:
+                            self.dropped += 1
+                        self.buffer.append(chunk)
+                        self.cond.notify()
+        except OSError:
+            pass
+        finally:
+            with self.cond:
+                if pending:
+                    self.buffer.append(pending)
+                self.eof = True
+                self.cond.notify()
+
+    def get(self, timeout):
+        """
+        Returns the buffered chunks (possibly an empty list after timeout),
+        or None once the recorder has closed and everything was consumed.
+        """
+        with self.cond:
+            if not self.buffer and not self.eof:
+                self.cond.wait(timeout)
+            if not self.buffer:
+                return None if self.eof else []
+            chunks = list(self.buffer)
+            self.buffer.clear()
+            return chunks
+
+
+class EnergyVAD:
+    """
+    Energy based voice activity detector.
+
+    A chunk is speech when its RMS is above a multiple of the running noise
+    floor. min_rms is only a low safety floor for digital silence, so quiet
+    microphones still open the gate. A few chunks before speech starts
+    (pre-roll) and after it ends (hangover) are passed through as well, so
+    word onsets are not clipped and Kaldi sees enough trailing silence to
+    end the utterance.
+
+    If the gate has not opened after passthrough_seconds, the level of the
+    input cannot be told apart from the background and every chunk is
+    passed through, as before the detector existed.
+    """
+
+    def __init__(self, min_rms=30, noise_factor=2.5, preroll_chunks=3, hangover_chunks=8,
+                 passthrough_seconds=3.0):
+        self.min_rms = min_rms
+        self.noise_factor = noise_factor
+        self.hangover_chunks = hangover_chunks
+        self.noise_floor = None
+        self.preroll = deque(maxlen=preroll_chunks)
+        # Start open, so speech right at the start is not lost while the floor settles
+        self.hangover = hangover_chunks
+        self.in_speech = False
+        self.passthrough_chunks = max(1, int(passthrough_seconds / CHUNK_SECONDS))
+        self.closed_chunks = 0
+        self.passthrough = False
+
+    def process(self, chunk):
+        """Returns the list of chunks to feed to the recognizer (usually 0 or 1)."""
+        if self.passthrough:
+            return [chunk]
+        energy = chunk_rms(chunk)
+        if self.noise_floor is None:
+            # Calibrate on the first chunk instead of guessing a level
+            self.noise_floor = float(energy)
+        threshold = max(self.min_rms, self.noise_floor * self.noise_factor)
+        if energy >= threshold:
+            out = list(self.preroll) + [chunk] if not self.hangover else [chunk]
+            self.preroll.clear()
+            self.hangover = self.hangover_chunks
+            self.in_speech = True
+            self.closed_chunks = -1
+            # Let a constant loud background slowly raise the floor
+            self.noise_floor += 0.002 * (energy - self.noise_floor)
+            return out
+
+        # Track the background level on non-speech chunks only. It follows quieter
+        # chunks quickly, so a floor calibrated on early speech drops at the first pause.
+        weight = 0.5 if energy < self.noise_floor else 0.05
+        self.noise_floor += weight * (energy - self.noise_floor)
+        self.in_speech = False
+        if self.closed_chunks >= 0:
+            self.closed_chunks += 1
+            if self.closed_chunks >= self.passthrough_chunks:
+                logger.info(f"[VOICE] No speech detected above noise floor {self.noise_floor:.0f}, "
+                            "passing all audio to the recognizer")
+                self.passthrough = True
+                out = list(self.preroll) + [chunk]
+                self.preroll.clear()
+                return out
+        if self.hangover:
+            self.hangover -= 1
+            return [chunk]
+        self.preroll.append(chunk)
+        return []
+
+
+def resolve_model_path(model_path=None):
+    """Returns the model directory to use, defaulting to the bundled one."""
+    if model_path:
+        return Path(model_path)
+    return Path(__file__).parent.resolve() / "model"
+
+
+def load_model(model_path=None):
+    """
+    Loads a Vosk model. This is the slow part of a recognition session
+    (seconds for large models), so callers that recognize repeatedly should
+    keep the returned model and pass it to recognize_from_mic().
+    """
+    model_path = resolve_model_path(model_path)
+    if not model_path.exists():
+        raise FileNotFoundError(f"Vosk model not found at {model_path}")
+    logger.info(f"Loading Vosk model from {model_path} for live processing...")
+    return Model(str(model_path))
+
+
+def recognize_from_mic(verbose=True, stop_event=None, timeout=30, partial_callback=None, status_callback=None, model_path=None, model=None):
     """
     Records audio using arecord and recognizes it using Vosk (offline).
     Returns (text, error_message).
     
     If stop_event is provided, it will stop recording when the event is set.
+    If model is provided (see load_model), model_path is ignored and no
+    model is loaded.
     """
     audio_path = None
     try:
-        # Paths
-        base_path = Path(__file__).parent.resolve()
-        
-        if model_path:
-            model_path = Path(model_path)
-        else:
-            model_path = base_path / "model"
-        
-        if not model_path.exists():
-            return None, f"Vosk model not found at {model_path}"
+        if model is None:
+            model_path = resolve_model_path(model_path)
+            if not model_path.exists():
+                return None, f"Vosk model not found at {model_path}"
 
-        if status_callback:
-            status_callback("Preparing...~$")
+            if status_callback:
+                status_callback("Preparing...~$")
 
-        # Load the model and initialize recognizer
-        if verbose: logger.info(f"Loading Vosk model from {model_path} for live processing...")
-        model = Model(str(model_path))
+            # Load the model and initialize recognizer
+            if verbose: logger.info(f"Loading Vosk model from {model_path} for live processing...")
+            model = Model(str(model_path))
         rec = KaldiRecognizer(model, 16000)
         rec.SetWords(True)
 
@@ -70,8 +248,9 @@ def recognize_from_mic(verbose=True, stop_event=None, timeout=30, partial_callba
             else:
                 cmd = [arecord_cmd, "-f", "S16_LE", "-r", "16000", "-c", "1", "-"]
                 
-            import time
             process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+            reader = AudioReader(process.stdout)
+            reader.start()
             
             try:
                 start_time = time.time()
@@ -81,10 +260,14 @@ def recognize_from_mic(verbose=True, stop_event=None, timeout=30, partial_callba
                 
                 results = []
                 last_partial = ""
+                last_sent = ""
+                last_partial_check = 0.0
+                fed_since_check = False
+                vad = EnergyVAD()
                 
-                # Read from stdout in chunks
-                # `read(4000)` might block until 4000 bytes are available, which is fine for live streams.
-                while process.poll() is None:
+                # The reader thread fills the ring buffer; waiting on it for at most one
+                # chunk keeps stop and silence checks responsive even if arecord stalls
+                while True:
                     current_time = time.time()
                     
                     if stop_event and stop_event.is_set():
@@ -99,36 +282,41 @@ def recognize_from_mic(verbose=True, stop_event=None, timeout=30, partial_callba
                         logger.info("[VOICE] Silence timeout reached, stopping auto-record.")
                         break
                     
-                    # We use a non-blocking-ish approach or just read. 
-                    # read 4000 bytes (125ms of 16kHz 16-bit mono)
-                    data = process.stdout.read(4000)
-                    if len(data) == 0:
+                    chunks = reader.get(timeout=CHUNK_SECONDS)
+                    if chunks is None:
                         break
                     
-                    if rec.AcceptWaveform(data):
-                        res = json.loads(rec.Result())
-                        if res.get("text"):
-                            results.append(res["text"])
-                            last_speech_time = time.time() # Just finished a phrase
-                            last_partial = ""
-                            if partial_callback:
-                                combined = " ".join(results).strip()
-                                partial_callback(combined)
-                    else:
+                    for data in chunks:
+                        # Silence is not fed to Kaldi, apart from a short pre-roll
+                        # before speech and a hangover after it (see EnergyVAD)
+                        for voiced in vad.process(data):
+                            fed_since_check = True
+                            if rec.AcceptWaveform(voiced):
+                                res = json.loads(rec.Result())
+                                if res.get("text"):
+                                    results.append(res["text"])
+                                    last_speech_time = time.time() # Just finished a phrase
+                                    last_partial = ""
+                                    fed_since_check = False
+                    
+                    # Partial results are only decoded a few times per second
+                    now = time.time()
+                    if fed_since_check and now - last_partial_check >= PARTIAL_INTERVAL:
+                        last_partial_check = now
+                        fed_since_check = False
                         res = json.loads(rec.PartialResult())
                         current_partial = res.get("partial", "")
-                        if current_partial:
+                        if current_partial and current_partial != last_partial:
                             # User is actively speaking if partial result changes
-                            if current_partial != last_partial:
-                                last_speech_time = time.time()
-                                last_partial = current_partial
-                                
-                            if partial_callback:
-                                combined = " ".join(results + [current_partial]).strip()
-                                partial_callback(combined)
+                            last_speech_time = now
+                            last_partial = current_partial
+                    
+                    if partial_callback:
+                        combined = " ".join(results + ([last_partial] if last_partial else [])).strip()
+                        if combined and combined != last_sent:
+                            last_sent = combined
+                            partial_callback(combined)
             finally:
-                if process.stdout:
-                    process.stdout.close()
                 if process.poll() is None:
                     try:
                         process.terminate()
@@ -140,6 +328,9 @@ def recognize_from_mic(verbose=True, stop_event=None, timeout=30, partial_callba
                             pass
                 else:
                     process.wait()
+                reader.join(timeout=1)
+                if process.stdout:
+                    process.stdout.close()
                 
         except (FileNotFoundError, Exception) as e:
             logger.exception(f"[VOICE] System error running {arecord_cmd}: {e}")
@@ -0,0 +1,361 @@
+# -*- coding: utf-8 -*-
+# MIT License
+#
+# Copyright (c) 2025 CIT-Services
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Persistent voice recognition worker.
+
+Loading a Vosk model takes seconds, so recognition runs in a separate
+process that loads the model once and serves one session after another
+over a pipe (partial text and status messages while listening, then the
+final result). backend.py talks to it through get_voice_worker(). The
+worker exits when it has been idle for IDLE_TIMEOUT seconds. The parent
+also releases it after a session if the model is larger than the memory
+budget or the device is low on free memory.
+"""
+
+import logging
+import multiprocessing
+import os
+import signal
+import threading
+import time
+
+logger = logging.getLogger("odoo_sync")
+
+# Seconds an idle worker keeps its model loaded before exiting
+IDLE_TIMEOUT = 300
+
+# The parent treats a worker as expired this many seconds before the worker
+# itself gives up, so a session is never sent to a process that is exiting
+IDLE_MARGIN = 5
+
+# A loaded model may use at most this share of the device RAM to stay
+# resident between sessions; larger ones are released after each session
+MEMORY_BUDGET_FRACTION = 0.35
+
+# Release the model after a session when the system is this low on memory
+MIN_AVAILABLE_MB = 200
+
+# Seconds to wait for a session to end after "stop" before killing the worker
+STOP_GRACE = 5.0
+
+
+def _meminfo_mb(key):
+    try:
+        with open("/proc/meminfo", "r") as f:
+            for line in f:
+                if line.startswith(key + ":"):
+                    return int(line.split()[1]) // 1024
+    except Exception:
+        pass
+    return None
+
+
+def _process_rss_mb(pid):
+    try:
+        with open(f"/proc/{pid}/status", "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) // 1024
+    except Exception:
+        pass
+    return 0
+
+
+def default_memory_budget_mb():
+    total = _meminfo_mb("MemTotal")
+    if total is None:
+        try:
+            total = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") // (1024 * 1024)
+        except Exception:
+            total = 2048
+    return int(total * MEMORY_BUDGET_FRACTION)
+
+
+def _worker_main(conn, model_path, idle_timeout):
+    """
+    Worker process entry point.
+
+    Loads the model once, then serves ("recognize", timeout) requests until
+    it receives ("shutdown",), the pipe closes, or nothing arrives for
+    idle_timeout seconds.
+    """
+    def sigterm_handler(signum, frame):
+        raise SystemExit(0)
+    signal.signal(signal.SIGTERM, sigterm_handler)
+
+    try:
+        from logger import setup_logger
+        setup_logger()
+    except Exception:
+        pass
+
+    try:
+        from voice_to_text.voice2text import load_model, recognize_from_mic
+        started = time.monotonic()
+        model = load_model(model_path)
+        conn.send(("ready", model_path, time.monotonic() - started))
+    except Exception as e:
+        conn.send(("error", f"Could not load voice model: {e}"))
+        return
+
+    class PipeStopEvent:
+        shutdown = False
+
+        def is_set(self):
+            while conn.poll():
+                msg = conn.recv()
+                if msg[0] == "shutdown":
+                    self.shutdown = True
+                    return True
+                if msg[0] == "stop":
+                    return True
+            return False
+
+    def _partial(txt):
+        conn.send(("partial", txt))
+
+    def _status(txt):
+        conn.send(("status", txt))
+
+    try:
+        while True:
+            if not conn.poll(idle_timeout):
+                logger.info("[VOICE] Voice worker idle, releasing model")
+                return
+            msg = conn.recv()
+            if msg[0] == "shutdown":
+                return
+            if msg[0] != "recognize":
+                # A late "stop" for a session that already ended
+                continue
+            stop_event = PipeStopEvent()
+            try:
+                text, err = recognize_from_mic(
+                    verbose=False, stop_event=stop_event, timeout=msg[1],
+                    partial_callback=_partial, status_callback=_status, model=model,
+                )
+            except Exception as e:
+                text, err = None, f"Subprocess Error: {e}"
+            conn.send(("final", text, err))
+            if stop_event.shutdown:
+                return
+    except (EOFError, BrokenPipeError):
+        return
+
+
+class VoiceWorker:
+    """
+    Parent-side handle of the persistent recognition process.
+
+    The process is spawned on the first session (or by preload()) and keeps
+    the Vosk model loaded, so later sessions start listening immediately.
+    It is replaced when another model is selected and released when idle,
+    over the memory budget, or when the system runs low on memory.
+
+    Args:
+        idle_timeout (int): Seconds to keep an idle model loaded
+        memory_budget_mb (int): Largest resident size to keep between
+            sessions, defaults to MEMORY_BUDGET_FRACTION of the device RAM
+    """
+
+    def __init__(self, idle_timeout=IDLE_TIMEOUT, memory_budget_mb=None):
+        self.idle_timeout = idle_timeout
+        self.memory_budget_mb = memory_budget_mb or default_memory_budget_mb()
+        self._lock = threading.RLock()
+        self._process = None
+        self._conn = None
+        self._model_path = None
+        self._ready = False
+        self._last_used = 0.0
+
+    def _alive(self):
+        if self._process is None or not self._process.is_alive():
+            return False
+        return time.monotonic() - self._last_used < self.idle_timeout - IDLE_MARGIN
+
+    def _spawn(self, model_path):
+        ctx = multiprocessing.get_context("spawn")
+        parent_conn, child_conn = ctx.Pipe()
+        process = ctx.Process(
+            target=_worker_main, args=(child_conn, model_path, self.idle_timeout), daemon=True,
+        )
+        process.start()
+        child_conn.close()
+        self._process, self._conn = process, parent_conn
+        self._model_path = model_path
+        self._ready = False
+        self._last_used = time.monotonic()
+        logger.info(f"[VOICE] Started voice worker (pid {process.pid}) for {model_path}")
+
+    def _ensure(self, model_path):
+        model_path = str(model_path)
+        if self._alive() and self._model_path == model_path:
+            return
+        self.shutdown()
+        self._spawn(model_path)
+
+    def _wait_ready(self, on_message, stop_event=None):
+        """Block until the model is loaded. Returns an error message or None."""
+        while not self._ready:
+            if stop_event is not None and stop_event.is_set():
+                # Keep loading in the background for the next session
+                stop_event.clear()
+                return "Cancelled"
+            if not self._process.is_alive():
+                code = self._process.exitcode
+                self.shutdown()
+                return f"Voice recognition crashed while loading the model (possibly Out of Memory). Exit code: {code}"
+            if not self._conn.poll(0.5):
+                continue
+            try:
+                msg = self._conn.recv()
+            except EOFError:
+                continue
+            if msg[0] == "ready":
+                self._ready = True
+                self._last_used = time.monotonic()
+                logger.info(
+                    f"[VOICE] Model loaded in {msg[2]:.2f}s, worker RSS {_process_rss_mb(self._process.pid)} MB"
+                )
+            elif msg[0] == "error":
+                self.shutdown()
+                return msg[1]
+            elif on_message:
+                on_message(msg)
+        return None
+
+    def preload(self, model_path):
+        """Start the worker and load the model without recording. Returns an error message or None."""
+        with self._lock:
+            self._ensure(model_path)
+            return self._wait_ready(None)
+
+    def recognize(self, model_path, stop_event=None, on_message=None, timeout=30):
+        """
+        Run one dictation session on the warm worker.
+
+        Args:
+            model_path (str): Model directory; the worker is restarted if it
+                holds a different one
+            stop_event (threading.Event): Set to end recording early; it is
+                cleared once forwarded to the worker
+            on_message (callable): Receives ("partial", text) and
+                ("status", text) tuples while the session runs
+            timeout (int): Recording timeout passed to recognize_from_mic
+
+        Returns:
+            tuple: (text, error_message)
+        """
+        with self._lock:
+            self._ensure(model_path)
+            if on_message and not self._ready:
+                on_message(("status", "Preparing...~$"))
+            error = self._wait_ready(on_message, stop_event)
+            if error:
+                return None, error
+
+            conn, process = self._conn, self._process
+            conn.send(("recognize", timeout))
+            stop_sent_time = None
+            result = None
+            while process.is_alive():
+                if stop_event is not None and stop_event.is_set():
+                    conn.send(("stop",))
+                    stop_event.clear()
+                    if stop_sent_time is None:
+                        stop_sent_time = time.monotonic()
+
+                # Watchdog: terminate if the worker ignores the stop signal
+                if stop_sent_time is not None and time.monotonic() - stop_sent_time > STOP_GRACE:
+                    logger.warning("[VOICE] Watchdog triggered: Process failed to stop cleanly. Terminating.")
+                    break
+
+                if not conn.poll(0.5):
+                    continue
+                try:
+                    msg = conn.recv()
+                except EOFError:
+                    break
+                if msg[0] == "final":
+                    result = (msg[1], msg[2])
+                    break
+                if on_message:
+                    on_message(msg)
+
+            if result is None:
+                code = process.exitcode
+                self.shutdown()
+                if code not in (None, 0):
+                    return None, f"Voice recognition crashed unexpectedly (possibly Out of Memory). Exit code: {code}"
+                return None, "Voice recognition stopped unexpectedly"
+
+            self._last_used = time.monotonic()
+            self._release_if_over_budget()
+            return result
+
+    def _release_if_over_budget(self):
+        rss = _process_rss_mb(self._process.pid)
+        available = _meminfo_mb("MemAvailable")
+        if rss > self.memory_budget_mb:
+            logger.info(f"[VOICE] Model uses {rss} MB (budget {self.memory_budget_mb} MB), releasing it")
+            self.shutdown()
+        elif available is not None and available < MIN_AVAILABLE_MB:
+            logger.info(f"[VOICE] Only {available} MB memory available, releasing voice model")
+            self.shutdown()
+
+    def shutdown(self):
+        """Stop the worker process and free the model memory."""
+        with self._lock:
+            process, conn = self._process, self._conn
+            self._process = self._conn = None
+            self._model_path = None
+            self._ready = False
+            if process is None:
+                return
+            try:
+                if process.is_alive():
+                    conn.send(("shutdown",))
+                    process.join(timeout=1)
+            except Exception:
+                pass
+            if process.is_alive():
+                process.terminate()
+                process.join(timeout=1)
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def get_voice_worker():
+    """Return the shared VoiceWorker of this process."""
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = VoiceWorker()
+        return _worker